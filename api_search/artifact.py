@@ -0,0 +1,125 @@
+"""Precomputed artifact with everything the search API needs to answer queries.
+
+An artifact is a directory `<API_SEARCH_ARTIFACT_DIR>/<version>` with
+- `manifest.json`: format, embedding model and number of indicators
+- `indicators.feather`: indicator records
+- `embeddings.npy`: normalised embeddings of the indicators as a float32 matrix
+- `index.hnsw`: approximate nearest neighbour index of the embeddings (only if hnswlib is installed)
+
+Artifacts are built with `etl api-search-build`. The API memory-maps the latest one on startup instead of fetching
+indicators from MySQL and encoding them, and switches to a newer one when it appears.
+"""
+
+import functools
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+
+import click
+import numpy as np
+import pandas as pd
+from pyarrow import feather
+from structlog import get_logger
+
+from apps.wizard.app_pages.indicator_search.data import Indicator, _get_data_indicators_from_db
+from apps.wizard.utils.embeddings import EmbeddingsModel, get_model, hnswlib, load_ann_index
+from etl import config
+
+log = get_logger()
+
+# Bump when the layout of artifacts changes, older artifacts are then ignored
+FORMAT_VERSION = 1
+
+# Number of artifacts kept when building a new one, so that replicas still serving an older one keep working
+KEEP_VERSIONS = 3
+
+INDICATOR_FIELDS = ["variableId", "name", "description", "n_charts", "catalogPath", "dataset", "popularity"]
+
+
+def latest_version(artifact_dir: Path = config.API_SEARCH_ARTIFACT_DIR) -> Path | None:
+    """Return the directory of the latest complete artifact, if any."""
+    versions = [
+        path
+        for path in artifact_dir.glob("*/manifest.json")
+        if not path.parent.name.startswith(".") and json.loads(path.read_text()).get("format") == FORMAT_VERSION
+    ]
+    if not versions:
+        return None
+    return max(versions, key=lambda path: path.parent.name).parent
+
+
+def build_artifact(artifact_dir: Path = config.API_SEARCH_ARTIFACT_DIR) -> Path:
+    """Fetch indicators from MySQL, encode them and save a new artifact. Return its directory."""
+    indicators = _get_data_indicators_from_db()
+    embeddings_model = EmbeddingsModel(get_model()).fit(indicators)
+
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    path = artifact_dir / version
+    # Write to a hidden directory first, so that the API never sees an incomplete artifact
+    tmp_path = artifact_dir / f".{version}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    tmp_path.mkdir(parents=True)
+
+    df = pd.DataFrame([{field: getattr(ind, field) for field in INDICATOR_FIELDS} for ind in indicators])
+    df.to_feather(tmp_path / "indicators.feather", compression="uncompressed")
+    np.save(tmp_path / "embeddings.npy", embeddings_model.matrix)
+    if embeddings_model.ann_index is not None:
+        embeddings_model.ann_index.save_index((tmp_path / "index.hnsw").as_posix())
+
+    manifest = {
+        "format": FORMAT_VERSION,
+        "model_name": embeddings_model.model_name,
+        "n_indicators": len(indicators),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    # Manifest is written last, it marks the artifact as complete
+    (tmp_path / "manifest.json").write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp_path, path)
+
+    # Remove old artifacts
+    old_versions = sorted(p for p in artifact_dir.iterdir() if p.is_dir() and not p.name.startswith("."))
+    for old_path in old_versions[:-KEEP_VERSIONS]:
+        shutil.rmtree(old_path, ignore_errors=True)
+
+    return path
+
+
+# Models used to encode queries, loaded once and shared by all artifacts built with them
+_get_model = functools.cache(get_model)
+
+
+def load_artifact(path: Path) -> EmbeddingsModel[Indicator]:
+    """Load artifact from its directory without reading embeddings into memory."""
+    manifest = json.loads((path / "manifest.json").read_text())
+    model = _get_model(manifest["model_name"])
+
+    records = feather.read_table(path / "indicators.feather", memory_map=True).to_pylist()
+    indicators = [Indicator(**record) for record in records]
+    matrix = np.load(path / "embeddings.npy", mmap_mode="r")
+    assert len(indicators) == len(matrix) == manifest["n_indicators"], f"Artifact {path} is corrupted"
+
+    index = None
+    if hnswlib is not None and (path / "index.hnsw").exists():
+        index = load_ann_index(path / "index.hnsw", n_docs=len(matrix), dim=matrix.shape[1])
+
+    return EmbeddingsModel.from_matrix(model, indicators, matrix, index=index)
+
+
+@click.command("api-search-build")
+@click.option(
+    "--artifact-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Directory of artifacts.",
+    default=config.API_SEARCH_ARTIFACT_DIR,
+)
+def cli(artifact_dir: Path) -> None:
+    """Build artifact of the indicator search API.
+
+    Fetches indicators from MySQL and encodes them (reusing cached embeddings of unchanged indicators). Running
+    instances of the API switch to the new artifact within API_SEARCH_RELOAD_INTERVAL seconds, and new ones start
+    serving it within seconds.
+    """
+    path = build_artifact(artifact_dir)
+    log.info("api_search.artifact.built", path=str(path))
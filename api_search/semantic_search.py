@@ -1,35 +1,62 @@
 """Semantic search functionality for OWID indicators - API version."""
 
 import threading
+import time
+from pathlib import Path
 from typing import Any
 
 import sentry_sdk
+import structlog
 
+from api_search.artifact import latest_version, load_artifact
 from apps.wizard.app_pages.indicator_search.data import Indicator, _get_data_indicators_from_db
 from apps.wizard.utils.embeddings import EmbeddingsModel, get_model
+from etl import config
 from owid_mcp.data_utils import build_catalog_info
 
+log = structlog.get_logger()
+
 # Global variables to store preloaded data and initialization state
 _indicators: list[Indicator] | None = None
 _embeddings_model: EmbeddingsModel[Indicator] | None = None
+_artifact_path: Path | None = None
 _initialization_complete: bool = False
 _initialization_error: str | None = None
 
 
+def _load_artifact(path: Path) -> None:
+    """Switch to the artifact in the given directory."""
+    global _indicators, _embeddings_model, _artifact_path, _initialization_error
+
+    embeddings_model = load_artifact(path)
+
+    # Requests being served keep using the previous model
+    _embeddings_model = embeddings_model
+    _indicators = embeddings_model.docs
+    _artifact_path = path
+    _initialization_error = None
+    log.info("api_search.artifact.loaded", path=str(path), n_indicators=len(embeddings_model.docs))
+
+
 def _initialize_semantic_search():
     """Initialize indicators and embeddings model. Runs in background thread."""
     global _indicators, _embeddings_model, _initialization_complete, _initialization_error
 
     try:
-        # Fetch all data indicators.
-        # NOTE: we could avoid fetching indicators from DB (and hence not needing credentials on server)
-        #  by fetching them from Datasette with ".csv?_stream=on"
-        _indicators = _get_data_indicators_from_db()
-
-        # Get embedding model.
-        model = get_model()
-        _embeddings_model = EmbeddingsModel(model)
-        _embeddings_model.fit(_indicators)
+        path = latest_version()
+        if path is not None:
+            # Precomputed artifact from `etl api-search-build` loads within seconds
+            _load_artifact(path)
+        else:
+            # Fetch all data indicators.
+            # NOTE: we could avoid fetching indicators from DB (and hence not needing credentials on server)
+            #  by fetching them from Datasette with ".csv?_stream=on"
+            _indicators = _get_data_indicators_from_db()
+
+            # Get embedding model.
+            model = get_model()
+            _embeddings_model = EmbeddingsModel(model)
+            _embeddings_model.fit(_indicators)
 
         _initialization_complete = True
     except Exception as e:
@@ -38,11 +65,32 @@ def _initialize_semantic_search():
         _initialization_complete = True
 
 
+def _reload_latest_artifact() -> None:
+    """Switch to the latest artifact if it is newer than the current one."""
+    path = latest_version()
+    if path is not None and (_artifact_path is None or path.name > _artifact_path.name):
+        _load_artifact(path)
+
+
+def _reload_artifacts():
+    """Switch to newer artifacts as they appear. Runs in background thread."""
+    while True:
+        time.sleep(config.API_SEARCH_RELOAD_INTERVAL)
+        try:
+            _reload_latest_artifact()
+        except Exception as e:
+            # Keep serving the current artifact
+            sentry_sdk.capture_exception(e)
+
+
 def initialize_semantic_search_async():
     """Start semantic search initialization in background thread."""
     thread = threading.Thread(target=_initialize_semantic_search, daemon=True)
     thread.start()
 
+    if config.API_SEARCH_RELOAD_INTERVAL > 0:
+        threading.Thread(target=_reload_artifacts, daemon=True).start()
+
 
 def search_indicators(query: str, limit: int = 10) -> list[dict[str, Any]]:
     """Search indicators using the preloaded model."""
@@ -56,11 +104,11 @@ def search_indicators(query: str, limit: int = 10) -> list[dict[str, Any]]:
         raise RuntimeError("Semantic search model not initialized")
 
     # Perform semantic search
-    sorted_indicators = _embeddings_model.get_sorted_documents_by_similarity(query)
+    top_indicators = _embeddings_model.search(query, k=limit)
 
     # Format results
     results = []
-    for indicator in sorted_indicators[:limit]:
+    for indicator, score in top_indicators:
         metadata: dict[str, Any] = {"chart_count": indicator.n_charts}
 
         if indicator.catalogPath and indicator.catalogPath != "NULL":
@@ -79,7 +127,7 @@ def search_indicators(query: str, limit: int = 10) -> list[dict[str, Any]]:
                 "title": indicator.name,
                 "indicator_id": indicator.variableId,
                 "snippet": (indicator.description or "")[:160],
-                "score": float(indicator.similarity or 0.0),
+                "score": score,
                 "metadata": metadata,
                 # Additional fields for wizard app
                 "catalog_path": indicator.catalogPath,
@@ -112,6 +160,7 @@ def get_model_info() -> dict[str, Any]:
     return {
         "indicators_loaded": len(_indicators) if _indicators else 0,
         "model_loaded": _embeddings_model is not None,
+        "artifact": _artifact_path.name if _artifact_path else None,
         "initialization_complete": _initialization_complete,
         "initialization_error": _initialization_error,
         "ready": is_ready(),
@@ -1,8 +1,10 @@
+import os
+from multiprocessing import Pool
+
+import numpy as np
 import pandas as pd
 import structlog
 from sklearn.ensemble import IsolationForest
-from sklearn.impute import SimpleImputer
-from sklearn.preprocessing import StandardScaler
 from sklearn.svm import OneClassSVM
 from tqdm.auto import tqdm
 
@@ -13,6 +15,59 @@ log = structlog.get_logger()
 # Name of index columns for dataframe.
 INDEX_COLUMNS = ["entity_name", "year"]
 
+# Number of processes for fitting models, set ANOMALIST_N_JOBS to use more than one
+ANOMALIST_N_JOBS = int(os.environ.get("ANOMALIST_N_JOBS", 1))
+
+
+def get_pool_chunksize(n_tasks: int, n_jobs: int) -> int:
+    """Number of tasks sent to a worker at once, so that each worker gets a few chunks (to balance the load)
+    while keeping the overhead of sending them small."""
+    return max(1, n_tasks // (n_jobs * 4))
+
+
+def get_series_by_length(df: pd.DataFrame, variable_ids: list[int]) -> dict[int, tuple[np.ndarray, np.ndarray]]:
+    """Group the time series of every entity and variable by their length.
+
+    For each length L, return a tuple of
+        - positional indices of the rows of each series in `df`, with shape (n_series, L),
+        - positional indices of the column in `variable_ids` of each series, with shape (n_series,).
+
+    Rows of each series are in the same order as in `df`. Grouping by length lets detectors process series of
+    the same length as 2D arrays.
+    """
+    codes, _ = pd.factorize(df["entity_name"])
+    # Rows of each entity, contiguous and in their original order.
+    order = np.argsort(codes, kind="stable")
+    lengths = np.bincount(codes)
+    entity_rows = np.split(order, np.cumsum(lengths)[:-1])
+
+    series = {}
+    for length in np.unique(lengths):
+        rows = np.stack([r for r in entity_rows if len(r) == length])
+        # One series per entity and variable.
+        series[int(length)] = (
+            np.repeat(rows, len(variable_ids), axis=0),
+            np.tile(np.arange(len(variable_ids)), len(rows)),
+        )
+    return series
+
+
+def standard_scale_rows(X: np.ndarray) -> np.ndarray:
+    """Impute missing values of each row of X with its mean, and scale the row to zero mean and unit variance.
+
+    This is equivalent to applying `SimpleImputer(strategy="mean")` and `StandardScaler` to each row separately.
+    """
+    X = np.where(np.isnan(X), np.nanmean(X, axis=1, keepdims=True), X)
+    n = X.shape[1]
+    mean = X.sum(axis=1, keepdims=True) / n
+    centered = X - mean
+    # Variance with the same correction of rounding errors as StandardScaler.
+    var = ((centered**2).sum(axis=1, keepdims=True) - centered.sum(axis=1, keepdims=True) ** 2 / n) / n
+    # Constant rows are only centered, like in StandardScaler.
+    eps = np.finfo(np.float64).eps
+    is_constant = var <= n * eps * var + (n * mean * eps) ** 2
+    return centered / np.where(is_constant, 1.0, np.sqrt(var))
+
 
 def estimate_bard_epsilon(series: pd.Series) -> float:
     # Ignore missing values.
@@ -187,79 +242,91 @@ class AnomalyTimeChange(AnomalyDetector):
         return df_scale
 
 
-class AnomalyIsolationForest(AnomalyDetector):
-    """Anomaly detection using Isolation Forest, applied separately to each country-variable time series."""
+class AnomalyModelDetector(AnomalyDetector):
+    """Anomaly detection with a model fitted separately to each entity-variable time series.
 
-    anomaly_type = "isolation_forest"
+    Series are standardized in batches of series of the same length, and models are fitted in a pool of
+    processes. Subclasses define the model with `fit_score`.
+    """
+
+    def __init__(self, n_jobs: int = ANOMALIST_N_JOBS):
+        self.n_jobs = n_jobs
+
+    @staticmethod
+    def fit_score(series_scaled: np.ndarray) -> np.ndarray:
+        """Fit a model to a single standardized series with shape (L, 1) and return its anomaly scores."""
+        raise NotImplementedError
+
+    @classmethod
+    def _fit_score_batch(cls, X: np.ndarray) -> np.ndarray:
+        return np.stack([cls.fit_score(x.reshape(-1, 1)) for x in X])
 
     def get_score_df(self, df: pd.DataFrame, variable_ids: list[int], variable_mapping: dict[int, int]) -> pd.DataFrame:
         # Initialize a dataframe of zeros.
         df_anomalies = self.get_zeros_df(df, variable_ids)
 
-        # Initialize an imputer to handle missing values.
-        imputer = SimpleImputer(strategy="mean")
+        values = df[variable_ids].to_numpy(dtype=float)
+        scores = np.zeros_like(values)
 
-        for variable_id in tqdm(variable_ids):
-            for country, group in df.groupby("entity_name", observed=True):
-                # Get the time series for the current country and variable.
-                series = group[[variable_id]].copy()
+        # Split series into batches of the same length.
+        series_by_length = get_series_by_length(df, variable_ids)
+        n_series = sum(len(rows) for rows, _ in series_by_length.values())
+        batch_size = get_pool_chunksize(n_series, self.n_jobs)
+        batches = []
+        for rows, columns in series_by_length.values():
+            X = values[rows, columns[:, None]]
 
-                # Skip if the series is all zeros or nans.
-                if ((series == 0).all().values) or (series.dropna().shape[0] == 0):
-                    continue
+            # Skip series that are all zeros or nans.
+            keep = ~(X == 0).all(axis=1) & ~np.isnan(X).all(axis=1)
+            rows, columns, X = rows[keep], columns[keep], X[keep]
 
-                # Impute missing values for this country's time series.
-                series_imputed = imputer.fit_transform(series)
+            X_scaled = standard_scale_rows(X)
+            for start in range(0, len(X), batch_size):
+                batch = slice(start, start + batch_size)
+                batches.append((rows[batch], columns[batch], X_scaled[batch]))
 
-                # Scale the data.
-                scaler = StandardScaler()
-                series_scaled = scaler.fit_transform(series_imputed)
+        # Fit models in parallel.
+        X_batches = [X for _, _, X in batches]
+        if self.n_jobs == 1 or len(batches) <= 1:
+            results = [self._fit_score_batch(X) for X in tqdm(X_batches)]
+        else:
+            with Pool(min(self.n_jobs, len(batches))) as pool:
+                results = list(tqdm(pool.imap(self._fit_score_batch, X_batches), total=len(batches)))
 
-                # Initialize the Isolation Forest model.
-                isolation_forest = IsolationForest(contamination=0.05, random_state=1)  # ty: ignore
+        # Write scores by position.
+        for (rows, columns, _), batch_scores in zip(batches, results):
+            scores[rows, columns[:, None]] = batch_scores
 
-                # Fit the model and calculate anomaly scores.
-                isolation_forest.fit(series_scaled)
-                scores = isolation_forest.decision_function(series_scaled)
-                df_anomalies.loc[df["entity_name"] == country, variable_id] = scores
+        df_anomalies[variable_ids] = scores
 
         return df_anomalies
 
 
-class AnomalyOneClassSVM(AnomalyDetector):
-    """Anomaly detection using One-Class SVM, applied separately to each country-variable time series."""
-
-    anomaly_type = "one_class_svm"
-
-    def get_score_df(self, df: pd.DataFrame, variable_ids: list[int], variable_mapping: dict[int, int]) -> pd.DataFrame:
-        # Initialize a dataframe of zeros.
-        df_anomalies = self.get_zeros_df(df, variable_ids)
+class AnomalyIsolationForest(AnomalyModelDetector):
+    """Anomaly detection using Isolation Forest, applied separately to each country-variable time series."""
 
-        # Initialize an imputer to handle missing values.
-        imputer = SimpleImputer(strategy="mean")
+    anomaly_type = "isolation_forest"
 
-        for variable_id in tqdm(variable_ids):
-            for country, group in df.groupby("entity_name", observed=True):
-                # Get the time series for the current country and variable.
-                series = group[[variable_id]].copy()
+    @staticmethod
+    def fit_score(series_scaled: np.ndarray) -> np.ndarray:
+        # Initialize the Isolation Forest model.
+        isolation_forest = IsolationForest(contamination=0.05, random_state=1)  # ty: ignore
 
-                # Skip if the series is all zeros or nans.
-                if ((series == 0).all().values) or (series.dropna().shape[0] == 0):
-                    continue
+        # Fit the model and calculate anomaly scores.
+        isolation_forest.fit(series_scaled)
+        return isolation_forest.decision_function(series_scaled)
 
-                # Impute missing values for this country's time series.
-                series_imputed = imputer.fit_transform(series)
 
-                # Scale the data for better performance.
-                scaler = StandardScaler()
-                series_scaled = scaler.fit_transform(series_imputed)
+class AnomalyOneClassSVM(AnomalyModelDetector):
+    """Anomaly detection using One-Class SVM, applied separately to each country-variable time series."""
 
-                # Initialize the One-Class SVM model for this country's time series.
-                svm = OneClassSVM(kernel="rbf", gamma="scale", nu=0.05)
+    anomaly_type = "one_class_svm"
 
-                # Fit the model and calculate anomaly scores.
-                svm.fit(series_scaled)
-                scores = svm.decision_function(series_scaled)
-                df_anomalies.loc[df["entity_name"] == country, variable_id] = scores
+    @staticmethod
+    def fit_score(series_scaled: np.ndarray) -> np.ndarray:
+        # Initialize the One-Class SVM model for this country's time series.
+        svm = OneClassSVM(kernel="rbf", gamma="scale", nu=0.05)
 
-        return df_anomalies
+        # Fit the model and calculate anomaly scores.
+        svm.fit(series_scaled)
+        return svm.decision_function(series_scaled)
@@ -3,6 +3,7 @@ import random
 import time
 import warnings
 from multiprocessing import Pool
+from typing import cast
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -16,7 +17,7 @@ from sklearn.gaussian_process.kernels import RBF, WhiteKernel
 from statsmodels.stats.multitest import multipletests
 from tqdm.auto import tqdm
 
-from apps.anomalist.detectors import AnomalyDetector
+from apps.anomalist.detectors import ANOMALIST_N_JOBS, AnomalyDetector, get_pool_chunksize
 from etl.grapher import model as gm
 from etl.paths import CACHE_DIR
 
@@ -25,10 +26,8 @@ log = structlog.get_logger()
 
 memory = Memory(CACHE_DIR, verbose=0)
 
-# Maximum time for processing in seconds
+# Maximum time for processing in seconds, set to 0 to process all series
 ANOMALIST_MAX_TIME = int(os.environ.get("ANOMALIST_MAX_TIME", 10))
-# Number of jobs for parallel processing
-ANOMALIST_N_JOBS = int(os.environ.get("ANOMALIST_N_JOBS", 1))
 
 
 @memory.cache
@@ -72,6 +71,14 @@ def _processing_queue(items: list[tuple[str, int]]) -> list[tuple]:
     return np.array(items, dtype=object)[items_index]  # ty: ignore
 
 
+def _fit_predict_abs_z(args: tuple[np.ndarray, np.ndarray, float | None]) -> np.ndarray | None:
+    """Return absolute Z-scores of a series (or None if the deadline has passed), to be run in a pool."""
+    X, y, deadline = args
+    if deadline is not None and time.time() > deadline:
+        return None
+    return np.abs(AnomalyGaussianProcessOutlier().fit_predict_z(X, y))
+
+
 class AnomalyGaussianProcessOutlier(AnomalyDetector):
     anomaly_type = "gp_outlier"
 
@@ -98,54 +105,59 @@ class AnomalyGaussianProcessOutlier(AnomalyDetector):
             log.warning("All variables are NaN, skipping processing")
             return pd.DataFrame()
 
+        # Positions of the series of each (entity_name, variable_id) pair in the sorted long dataframe.
+        codes = cast(pd.MultiIndex, df_wide.index).codes
+        is_start = np.r_[True, (np.diff(codes[0]) != 0) | (np.diff(codes[1]) != 0)]
+        starts = np.flatnonzero(is_start)
+        ends = np.r_[starts[1:], len(df_wide)]
+        bounds = dict(zip(df_wide.index[starts], zip(starts, ends)))
+        years = df_wide["year"].to_numpy()
+        values = df_wide["value"].to_numpy(dtype=float)
+
         # Create a processing queue with (entity_name, variable_id) pairs
         # TODO: we could make probabilities proportional to "relevance" score in anomalist
         items = _processing_queue(
-            items=list(df_wide.index.unique()),
+            items=list(bounds),
         )
 
-        start_time = time.time()
-
-        results = []
-
-        # Iterate through each (entity_name, variable_id) pair in the processing queue
-        for entity_name, variable_id in tqdm(items):
-            # Stop processing if the maximum time is reached
-            if self.max_time is not None and (time.time() - start_time) > self.max_time:
-                log.info("Max processing time reached, stopping further processing.")
-                break
-
-            # Get the data for the current entity and variable
-            group = df_wide.loc[(entity_name, variable_id)]
+        # Prepare the input features (X) and target values (y) for Gaussian Process of each series
+        tasks = []
+        for entity_name, variable_id in items:
+            start, end = bounds[(entity_name, variable_id)]
 
             # Skip if the series has only three or fewer data points
-            if isinstance(group, pd.Series) or len(group) <= 3:
+            if end - start <= 3:
                 continue
 
-            # Prepare the input features (X) and target values (y) for Gaussian Process
-            X, y = self.get_Xy(pd.Series(group["value"].values, index=group["year"]))
+            X, y = years[start:end].reshape(-1, 1), values[start:end]
 
             # Skip if the target values have zero standard deviation (i.e., all values are identical)
             if y.std() == 0:
                 continue
 
-            if self.n_jobs == 1:
-                # Fit the Gaussian Process model and make predictions
-                z = self.fit_predict_z(X, y)
-                z = pd.DataFrame({"z": np.abs(z), "year": group["year"].values}, index=group.index)
-                results.append(z)
-            else:
-                # Add it to a list for parallel processing
-                results.append((self, X, y, group, start_time))
-
-        # Process results in parallel
-        # NOTE: There's a lot of overhead in parallelizing this, so the gains are minimal on my laptop. It could be
-        #  better on a staging server.
-        if self.n_jobs != 1:
-            with Pool(self.n_jobs) as pool:
-                # Split the workload evenly across the number of jobs
-                chunksize = len(items) // self.n_jobs + 1
-                results = pool.starmap(self._fit_parallel, results, chunksize=chunksize)
+            tasks.append((start, end, X, y))
+
+        start_time = time.time()
+        deadline = start_time + self.max_time if self.max_time else None
+
+        # Fit the Gaussian Process models and make predictions, in parallel if possible. Tasks are sent to
+        # workers in chunks, and are processed in the order of the queue until the deadline.
+        args = [(X, y, deadline) for _, _, X, y in tasks]
+        if self.n_jobs == 1 or len(tasks) <= 1:
+            zs = [_fit_predict_abs_z(a) for a in tqdm(args)]
+        else:
+            with Pool(min(self.n_jobs, len(tasks))) as pool:
+                chunksize = get_pool_chunksize(len(tasks), self.n_jobs)
+                zs = list(tqdm(pool.imap(_fit_predict_abs_z, args, chunksize=chunksize), total=len(tasks)))
+
+        results = []
+        for (start, end, _, _), z in zip(tasks, zs):
+            if z is not None:
+                results.append(pd.DataFrame({"z": z, "year": years[start:end]}, index=df_wide.index[start:end]))
+        if len(results) < len(tasks):
+            log.info(
+                "Max processing time reached, stopping further processing.", processed=len(results), total=len(tasks)
+            )
 
         log.info("Finished processing", elapsed=round(time.time() - start_time, 2))
 
@@ -174,15 +186,6 @@ class AnomalyGaussianProcessOutlier(AnomalyDetector):
 
         return df_score_long.drop(columns=["p_value", "adj_p_value", "z"])
 
-    @staticmethod
-    def _fit_parallel(obj: "AnomalyGaussianProcessOutlier", X, y, group, start_time):
-        # Stop early
-        if obj.max_time and (time.time() - start_time) > obj.max_time:
-            return pd.DataFrame()
-        z = obj.fit_predict_z(X, y)
-        z = pd.DataFrame({"z": np.abs(z), "year": group["year"].values}, index=group.index)
-        return z
-
     def get_Xy(self, series: pd.Series) -> tuple[np.ndarray, np.ndarray]:
         X = series.index.values.reshape(-1, 1)
         y = series.values
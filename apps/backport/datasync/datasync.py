@@ -23,7 +23,7 @@ def upload_gzip_dict(d: dict[str, Any], s3_path: str, private: bool = False) ->
 
 def upload_gzip_string(s: str, s3_path: str, private: bool = False) -> None:
     """Upload compressed dictionary to S3 and return its URL."""
-    body_gzip = gzip.compress(s.encode())
+    body_gzip = gzip.compress(s.encode(), compresslevel=config.GRAPHER_GZIP_LEVEL)
 
     bucket, key = s3_utils.s3_bucket_key(s3_path)
 
@@ -141,6 +141,7 @@ GROUPS = (
             "name": "Data",
             "commands": {
                 "snapshot": "etl.snapshot_command.snapshot_cli",
+                "snapshot-pull": "etl.snapshot_command.snapshot_pull_cli",
                 "harmonize": "etl.harmonize.harmonize",
                 "diff": "etl.datadiff.cli",
                 "graphviz": "etl.to_graphviz.to_graphviz",
@@ -199,6 +200,7 @@ GROUPS = (
             "name": "Others",
             "commands": {
                 "indicator-upgrade": "apps.indicator_upgrade.cli.cli",
+                "api-search-build": "api_search.artifact.cli",
             },
         },
     ]
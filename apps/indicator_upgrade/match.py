@@ -1,5 +1,6 @@
 import json
 import os
+from collections import defaultdict
 from typing import Any, cast
 
 import numpy as np
@@ -10,6 +11,7 @@ from structlog import get_logger
 
 from apps.wizard.utils.db import WizardDB
 from etl.db import get_connection, get_engine
+from etl.fuzzy import FuzzyIndex, top_k
 from etl.grapher.io import get_variables_in_dataset
 
 # If True, identical variables will be matched automatically (by string comparison).
@@ -558,7 +560,7 @@ def find_mapping_suggestions(
     - "new": pandas.DataFrame with new variable names, IDs, sorted by similarity to old variable name (according to matching_function).
 
     It uses the similiarity function `similarity_name` to estimate the score between `missing_old` and `missing_new`. Note that regardless of the score,
-    if `missing_old` and `missing_new` have the same name, this will appear first with score 9999. (see _get_score internal function).
+    if `missing_old` and `missing_new` have the same name, this will appear first with score 9999. New variables with the same score keep their order in `missing_new`.
 
     Parameters
     ----------
@@ -574,113 +576,28 @@ def find_mapping_suggestions(
     list
         List of suggestions for mapping old variables to new variables.
     """
-    # get similarity function
-    matching_function = get_similarity_function(similarity_name)
+    # Score all pairs of old and new names at once.
+    index = FuzzyIndex(missing_new["name_new"], scorer=get_similarity_function(similarity_name))
+    old_names = missing_old["name_old"].tolist()
+    scores = index.scores(old_names)
+    # Ensure that the score is maximum if the names of old and new variables are identical.
+    positions_new = defaultdict(list)
+    for j, new_name in enumerate(index.choices):
+        positions_new[new_name].append(j)
+    for i, old_name in enumerate(old_names):
+        scores[i, positions_new.get(old_name, [])] = 9999
+    # Sort new variables from most to least similar to each old variable.
+    positions, scores = top_k(scores, len(index))
 
-    def _get_score(old_name, new_name) -> float:
-        """Get similarity score for a row.
-
-        Uses matching_function, but on top of that ensures that score is maximum if names of old and new variables are identical.
-        """
-        if old_name == new_name:
-            return 9999
-        return matching_function(old_name, new_name)
-
-    # Iterate over old variables, and find the right match among new variables.
     suggestions = []
-    for _, row in missing_old.iterrows():
-        # Old variable name
-        old_name = row["name_old"]
-
-        # Sort new variables from most to least similar to current variable.
-        missing_new["similarity"] = [_get_score(old_name, new_name) for new_name in missing_new["name_new"]]
-        missing_new = missing_new.sort_values("similarity", ascending=False)
-        missing_new["similarity"] = missing_new["similarity"].apply(lambda x: min(x, 100))
-
+    for i, (_, row) in enumerate(missing_old.iterrows()):
+        new = missing_new.iloc[positions[i]].copy()
+        new["similarity"] = np.minimum(scores[i], 100)
         # Add results to suggestions list.
         suggestions.append(
             {
                 "old": row.to_dict(),
-                "new": missing_new.copy(),
-            }
-        )
-    return suggestions
-
-
-def find_mapping_suggestions_optim(
-    missing_old: pd.DataFrame,
-    missing_new: pd.DataFrame,
-    similarity_name: str = "partial_ratio",
-) -> list[dict[str, Any]]:
-    """Find suggestions for mapping old variables to new variables.
-
-    Creates a list with new variable suggestions for each old variable. The list is therefore the same
-    size as len(old_indicators). Each item is a dictionary with two keys:
-
-    - "old": Dictionary with old variable name and ID.
-    - "new": pandas.DataFrame with new variable names, IDs, sorted by similarity to old variable name (according to matching_function).
-
-    It uses the similiarity function `similarity_name` to estimate the score between `missing_old` and `missing_new`. Note that regardless of the score,
-    if `missing_old` and `missing_new` have the same name, this will appear first with score 9999. (see _get_score internal function).
-
-    Parameters
-    ----------
-    missing_old : pandas.DataFrame
-        Dataframe with old variables.
-    missing_new : pandas.DataFrame
-        Dataframe with new variables.
-    similarity_name : function, optional
-        Similarity function name. The default is 'partial_ratio'. Must be in `SIMILARITY_NAMES`.
-
-    Returns
-    -------
-    list
-        List of suggestions for mapping old variables to new variables.
-    """
-    # get similarity function
-    matching_function = get_similarity_function(similarity_name)
-
-    def _get_score(old_name, new_name) -> float:
-        """Get similarity score for a row.
-
-        Uses matching_function, but on top of that ensures that score is maximum if names of old and new variables are identical.
-        """
-        if old_name == new_name:
-            return 9999
-        return matching_function(old_name, new_name)
-
-    # Vectorized approach to compute similarities (this needs adjustment based on matching_function capabilities)
-    def compute_similarities_vectorized(old_names, new_names):
-        # This function needs to be adapted to your specific similarity function
-        # For example, using a vectorized string comparison if possible
-        # Placeholder for actual implementation
-        similarity_matrix = np.zeros((len(old_names), len(new_names)))
-        for i, old_name in enumerate(old_names):
-            for j, new_name in enumerate(new_names):
-                similarity_matrix[i, j] = _get_score(old_name, new_name) if old_name != new_name else 9999
-        return similarity_matrix
-
-    # Pre-compute the similarity scores for all combinations
-    old_names = missing_old["name_old"].to_numpy()
-    new_names = missing_new["name_new"].to_numpy()
-    similarity_scores = compute_similarities_vectorized(old_names, new_names)
-
-    # Iterate over old variables to sort new variables based on pre-computed similarities
-    suggestions = []
-    for idx, old_row in missing_old.iterrows():
-        # Retrieve the similarity scores for the current old_name
-        scores = similarity_scores[idx]  # ty: ignore
-
-        # Sort missing_new based on these scores
-        sorted_indices = np.argsort(-scores)  # Negative for descending sort
-        sorted_missing_new = missing_new.iloc[sorted_indices].copy()
-        sorted_missing_new["similarity"] = np.minimum(scores[sorted_indices], 100)
-
-        # Add results to suggestions list
-        suggestions.append(
-            {
-                "old": old_row.to_dict(),
-                "new": sorted_missing_new,
+                "new": new,
             }
         )
     return suggestions
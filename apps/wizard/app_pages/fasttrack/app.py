@@ -392,7 +392,7 @@ else:
                             grapher=True,
                             private=not fast_import.dataset.metadata.is_public,
                             workers=1,
-                            # NOTE: force is necessary because we are caching checksums with files.CACHE_CHECKSUM_FILE
+                            # NOTE: force is necessary because we are caching checksums with files.CHECKSUM_CACHE
                             # we could have cleared the cache, but this is cleaner
                             force=True,
                         )
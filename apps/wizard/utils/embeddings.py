@@ -1,3 +1,4 @@
+import hashlib
 import os
 import pickle
 import time
@@ -6,6 +7,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Generic, TypeVar
 
+import numpy as np
 import torch
 from sentence_transformers import SentenceTransformer, util
 from structlog import get_logger
@@ -18,6 +20,15 @@ log = get_logger()
 
 DEFAULT_MODEL_NAME = "all-MiniLM-L6-v2"
 
+# Use an approximate nearest neighbour index (HNSW) in `EmbeddingsModel.search` for at least this many documents,
+# if hnswlib is installed. Smaller collections are searched exactly, which takes a few milliseconds.
+ANN_MIN_DOCS = int(os.environ.get("EMBEDDINGS_ANN_MIN_DOCS", "50000"))
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
 
 def set_device() -> str:
     default_device = "cuda" if torch.cuda.is_available() else "mps" if torch.backends.mps.is_available() else "cpu"
@@ -64,10 +75,39 @@ class Doc:
 TDoc = TypeVar("TDoc", bound="Doc")
 
 
+def _normalize_rows(x: np.ndarray) -> np.ndarray:
+    """Return rows scaled to unit length, so that their dot product is the cosine similarity."""
+    x = np.asarray(x, dtype=np.float32)
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+
+def build_ann_index(matrix: np.ndarray) -> "hnswlib.Index":
+    """Build HNSW index of normalised embeddings (rows of the matrix), requires hnswlib."""
+    assert hnswlib is not None, "hnswlib is not installed"
+    log.info("get_embeddings.build_index", n_docs=len(matrix))
+    index = hnswlib.Index(space="ip", dim=matrix.shape[1])
+    index.init_index(max_elements=len(matrix), ef_construction=200, M=16)
+    index.add_items(matrix, np.arange(len(matrix)))
+    return index
+
+
+def load_ann_index(path: Path, n_docs: int, dim: int) -> "hnswlib.Index":
+    """Load HNSW index saved with `save_index`, requires hnswlib."""
+    assert hnswlib is not None, "hnswlib is not installed"
+    index = hnswlib.Index(space="ip", dim=dim)
+    index.load_index(path.as_posix(), max_elements=n_docs)
+    return index
+
+
 class EmbeddingsModel(Generic[TDoc]):
     # documents and their embeddings
     docs: list[TDoc]
     embeddings: torch.Tensor
+    # normalised embeddings of documents as float32 matrix, used by `search`
+    _matrix: np.ndarray
+    # approximate nearest neighbour index of `_matrix` (if hnswlib is installed and there are enough documents)
+    _index: "hnswlib.Index | None" = None
 
     def __init__(self, model: SentenceTransformer, model_name: str | None = None) -> None:
         # Derive name from the model so it cannot drift from the embeddings file.
@@ -75,6 +115,32 @@ class EmbeddingsModel(Generic[TDoc]):
         self.model = model
         self.model_name = model_name or model.tokenizer.name_or_path.split("/")[-1]
 
+    @classmethod
+    def from_matrix(
+        cls,
+        model: SentenceTransformer,
+        docs: list[TDoc],
+        matrix: np.ndarray,
+        index: "hnswlib.Index | None" = None,
+    ) -> "EmbeddingsModel[TDoc]":
+        """Create model from precomputed normalised embeddings of the documents (e.g. a memory-mapped array),
+        without encoding them. Only `search` is supported by such model."""
+        self = cls(model)
+        self.docs = docs
+        self._matrix = matrix
+        self._index = index
+        return self
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Normalised embeddings of documents as float32 matrix with a row per document, as used by `search`."""
+        return self._matrix
+
+    @property
+    def ann_index(self) -> "hnswlib.Index | None":
+        """Approximate nearest neighbour index of `matrix`, or None if documents are searched exactly."""
+        return self._index
+
     @property
     def cache_file_keys(self) -> Path:
         return CACHE_DIR / f"embeddings_{self.model_name}.keys.pkl"
@@ -83,6 +149,11 @@ class EmbeddingsModel(Generic[TDoc]):
     def cache_file_tensor(self) -> Path:
         return CACHE_DIR / f"embeddings_{self.model_name}.pt"
 
+    def cache_file_index(self, texts: list[str]) -> Path:
+        # Index is only valid for the exact list of documents it was built from
+        digest = hashlib.md5("\0".join(texts).encode()).hexdigest()[:16]
+        return CACHE_DIR / f"embeddings_{self.model_name}.{digest}.hnsw"
+
     def _load(self) -> tuple[list[str], torch.Tensor]:
         """Load embeddings and keys from cache files."""
         if not self.cache_file_keys.exists():
@@ -185,11 +256,55 @@ class EmbeddingsModel(Generic[TDoc]):
 
         self.docs = docs
         self.embeddings = req_embeddings
+        self._matrix = _normalize_rows(req_embeddings.cpu().numpy())
+        self._index = None
+        if hnswlib is not None and len(docs) >= ANN_MIN_DOCS:
+            self._index = self._load_or_build_index(texts)
 
         log.info("get_embeddings.end", t=time.time() - t)
 
         return self
 
+    def _load_or_build_index(self, texts: list[str]) -> "hnswlib.Index":
+        """Load HNSW index of the documents from cache, or build and save it."""
+        path = self.cache_file_index(texts)
+        if path.exists():
+            index = load_ann_index(path, n_docs=len(texts), dim=self._matrix.shape[1])
+        else:
+            index = build_ann_index(self._matrix)
+            # Remove indexes of previous versions of documents
+            for old_path in CACHE_DIR.glob(f"embeddings_{self.model_name}.*.hnsw"):
+                old_path.unlink(missing_ok=True)
+            index.save_index(path.as_posix())
+        return index
+
+    def search(self, input_string: str, k: int = 10) -> list[tuple[TDoc, float]]:
+        """Return the k documents most similar to the input string with their similarity, from most to least similar.
+
+        Similarity is the same as in `calculate_similarity`. Unlike `get_sorted_documents_by_similarity`, documents
+        are not modified, so it's safe to call concurrently.
+        """
+        k = min(k, len(self.docs))
+        if k <= 0:
+            return []
+
+        query = _normalize_rows(self.model.encode(input_string, convert_to_numpy=True, device=DEVICE))
+
+        if self._index is not None:
+            # Results are approximate, but search time barely grows with the number of documents
+            self._index.set_ef(max(100, k))
+            labels, distances = self._index.knn_query(query, k=k)
+            indices = labels[0]
+            cos = 1 - distances[0]
+        else:
+            cos_all = self._matrix @ query
+            # Only sort the top k documents
+            indices = np.argpartition(-cos_all, k - 1)[:k]
+            indices = indices[np.argsort(-cos_all[indices], kind="stable")]
+            cos = cos_all[indices]
+
+        return [(self.docs[i], float((c + 1) / 2)) for i, c in zip(indices, cos)]
+
     def calculate_similarity(self, input_string: str) -> list[float]:
         embeddings = self.embeddings
 
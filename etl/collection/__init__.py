@@ -8,6 +8,7 @@ from etl.collection.core.collection_set import CollectionSet
 from etl.collection.core.combine import combine_collections, combine_config_dimensions
 from etl.collection.core.create import create_collection
 from etl.collection.core.expand import expand_config
+from etl.collection.core.save import save_collections
 from etl.collection.model.core import Collection
 
 __all__ = [
@@ -15,6 +16,7 @@ __all__ = [
     "create_collection",
     "expand_config",
     "combine_config_dimensions",
+    "save_collections",
     "CollectionSet",
     "Collection",
 ]
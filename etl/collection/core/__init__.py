@@ -7,6 +7,7 @@ from etl.collection.core.collection_set import CollectionSet
 from etl.collection.core.combine import combine_collections, combine_config_dimensions
 from etl.collection.core.create import create_collection
 from etl.collection.core.expand import expand_config
+from etl.collection.core.save import save_collections
 
 __all__ = [
     "combine_collections",
@@ -14,4 +15,5 @@ __all__ = [
     "CollectionSet",
     "expand_config",
     "combine_config_dimensions",
+    "save_collections",
 ]
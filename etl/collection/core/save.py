@@ -0,0 +1,27 @@
+"""Save several collections at once."""
+
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from etl import config
+from etl.collection.model.core import Collection
+from etl.config import OWIDEnv
+
+
+def save_collections(
+    collections: Iterable[Collection],
+    owid_env: OWIDEnv | None = None,
+    workers: int = config.COLLECTION_SAVE_WORKERS,
+    **kwargs: Any,
+) -> None:
+    """Save collections concurrently, so that their uploads to the Admin API overlap.
+
+    Equivalent to calling `save` on every collection. Keyword arguments (e.g. `tolerate_extra_indicators`) are passed to
+    `Collection.save`. Collections that didn't change since their last upload are not uploaded again. If saving some
+    collection fails, the rest are still saved and the first error is raised at the end.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(c.save, owid_env, **kwargs) for c in collections]
+        for future in futures:
+            future.result()
@@ -105,7 +105,8 @@ class Explorer(Collection):
             indicators_slug = INDICATORS_SLUG
         self.sort_choices({"indicator": order})
 
-    def upsert_to_db(self, owid_env: OWIDEnv):
+    def upsert_to_db(self, owid_env: OWIDEnv, indicator_ids: dict[str, int] | None = None):
+        # NOTE: `indicator_ids` is not used, legacy explorers reference indicators by their catalog paths.
         # TODO: Below code should be replaced at some point with DB-interaction code.
         # Extract Explorer view rows. NOTE: This is for compatibility with current Explorer config structure.
         df_grapher, df_columns = extract_explorers_tables(self)
@@ -19,6 +19,7 @@ from sqlalchemy.orm import Session
 from structlog import get_logger
 
 from apps.chart_sync.admin_api import AdminAPI
+from etl.collection.utils import config_checksum, get_config_updated_at, is_already_uploaded, record_upload
 from etl.config import OWID_ENV, OWIDEnv
 from etl.grapher import model as gm
 from etl.grapher.io import get_variables_data
@@ -212,9 +213,20 @@ class ExplorerLegacy:
         log.info(f"Exporting explorer to {self.local_tsv_path}")
         self.local_tsv_path.write_text(self.content)
 
+        # Skip upload if the explorer didn't change since the last upload to this environment
+        checksum = config_checksum(self.content)
+        checksum_path = self.local_tsv_path.with_suffix(".uploaded.json")
+        updated_at = get_config_updated_at(owid_env, "explorers", "slug", self.name)
+        if is_already_uploaded(checksum_path, owid_env, checksum, updated_at):
+            log.info(f"Explorer {self.name} is unchanged, skipping upload")
+            return
+
         # Upsert config via Admin API
         admin_api = AdminAPI(owid_env)
         admin_api.put_explorer_config(self.name, self.content)
+        record_upload(
+            checksum_path, owid_env, checksum, get_config_updated_at(owid_env, "explorers", "slug", self.name)
+        )
 
     @property
     def local_tsv_path(self) -> Path:
@@ -31,10 +31,14 @@ from etl.collection.model.schema_types import (
 )
 from etl.collection.model.view import CommonView, View, ViewIndicators
 from etl.collection.utils import (
+    config_checksum,
     fill_placeholders,
     get_complete_dimensions_filter,
+    get_config_updated_at,
     get_tables_by_name_mapping,
-    map_indicator_path_to_id,
+    is_already_uploaded,
+    map_indicator_paths_to_ids,
+    record_upload,
     resolve_grapher_schema,
     unique_records,
     validate_indicators_in_db,
@@ -219,6 +223,11 @@ class Collection(MDIMBase):
         collection_dir = "explorers" if self._collection_type == "explorer" else self._collection_type
         return EXPORT_DIR / collection_dir / (self.catalog_path.replace("#", "/") + ".config.json")
 
+    @property
+    def upload_checksum_path(self) -> Path:
+        # Checksums of configs uploaded to each environment, next to the exported config
+        return self.local_config_path.with_name(self.local_config_path.name.replace(".config.json", ".uploaded.json"))
+
     @property
     def short_name(self):
         _, name = self.catalog_path.split("#")
@@ -239,6 +248,15 @@ class Collection(MDIMBase):
         prune_choices: bool = True,
         prune_dimensions: bool = True,
     ):
+        """Validate the collection, export its config locally and upload it to the environment.
+
+        The upload is skipped if the config is unchanged since the last upload to the environment. That is recorded
+        in `<name>.uploaded.json` next to the exported config, together with the `updatedAt` of the config on the
+        server. The record is validated against the server's database before skipping, so configs edited or deleted
+        in the admin, or lost when a staging server is rebuilt, are uploaded again. A stale record can only skip an
+        upload if the server's row is replaced with the exact same `updatedAt` (e.g. restored from a dump taken right
+        after the upload); use `--force-upload` (or FORCE_UPLOAD=1) to upload anyway.
+        """
         # Ensure we have an environment set
         if owid_env is None:
             owid_env = OWID_ENV
@@ -274,7 +292,7 @@ class Collection(MDIMBase):
         self.validate_indicators_are_from_dependencies(indicators)
 
         # Check that all indicators in collection exist
-        validate_indicators_in_db(indicators, owid_env.engine)
+        indicator_ids = validate_indicators_in_db(indicators, owid_env.engine)
 
         # Ensure at least one topic tag is set (needed for search)
         # Disabled as it is not really necessary? This fails on CI/CD for explorers
@@ -309,12 +327,12 @@ class Collection(MDIMBase):
         self.save_config_local()
 
         # Upsert to DB
-        self.upsert_to_db(owid_env)
+        self.upsert_to_db(owid_env, indicator_ids=indicator_ids)
 
-    def upsert_to_db(self, owid_env: OWIDEnv):
+    def upsert_to_db(self, owid_env: OWIDEnv, indicator_ids: dict[str, int] | None = None):
         # Replace especial fields URIs with IDs (e.g. sortColumnSlug).
         # TODO: I think we could move this to the Grapher side.
-        config = replace_catalog_paths_with_ids(self.to_dict())
+        config = replace_catalog_paths_with_ids(self.to_dict(), indicator_ids=indicator_ids, owid_env=owid_env)
 
         # description_key is a markdown string; a YAML list is authoring sugar
         # and gets converted before the config is stored.
@@ -329,9 +347,17 @@ class Collection(MDIMBase):
         # Convert config from snake_case to camelCase
         config = camelize(config, exclude_keys={"dimensions"})
 
-        # Upsert config via Admin API
-        admin_api = AdminAPI(owid_env)
-        admin_api.put_mdim_config(self.catalog_path, config)
+        # Skip upload if the config didn't change since the last upload to this environment
+        checksum = config_checksum(config)
+        updated_at = get_config_updated_at(owid_env, "multi_dim_data_pages", "catalogPath", self.catalog_path)
+        if is_already_uploaded(self.upload_checksum_path, owid_env, checksum, updated_at):
+            log.info(f"Collection {self.catalog_path} is unchanged, skipping upload")
+        else:
+            # Upsert config via Admin API
+            admin_api = AdminAPI(owid_env)
+            admin_api.put_mdim_config(self.catalog_path, config)
+            updated_at = get_config_updated_at(owid_env, "multi_dim_data_pages", "catalogPath", self.catalog_path)
+            record_upload(self.upload_checksum_path, owid_env, checksum, updated_at)
 
         # Link to preview
         log.info(f"PREVIEW: {owid_env.collection_preview(self.catalog_path)}")
@@ -1382,7 +1408,9 @@ def check_duplicate_views(views: list[View]):
         seen_dims.add(dims)
 
 
-def replace_catalog_paths_with_ids(config):
+def replace_catalog_paths_with_ids(
+    config, indicator_ids: dict[str, int] | None = None, owid_env: OWIDEnv | None = None
+):
     """Replace special metadata fields with their corresponding IDs in the database.
 
     In ETL, we allow certain fields in the config file to reference indicators by their catalog path. However, this is not yet supported in the Grapher API, so we need to replace these fields with the corresponding indicator IDs.
@@ -1398,10 +1426,10 @@ def replace_catalog_paths_with_ids(config):
     - views[].config.sizeVariableId   (integer variableId)
 
     Slug fields stay strings; the *VariableId fields are coerced to int so the
-    Grapher admin API doesn't reject them. ``map_indicator_path_to_id`` accepts
-    either a pure-digit value (passes through) or a catalog path — short
-    (``table#col``) or full (``grapher/ns/version/table/file#col``) — and
-    resolves the latter via a DB lookup.
+    Grapher admin API doesn't reject them. Values can be either a pure-digit value
+    (passes through) or a full catalog path (``grapher/ns/version/table/file#col``).
+    Catalog paths not in ``indicator_ids`` (e.g. the mapping returned by
+    ``validate_indicators_in_db``) are resolved together in a single DB query.
 
     These fields above are treated like fields in `dimensions`, and also accessed from:
     - `expand_catalog_paths`: To expand the indicator URI to be in its complete form.
@@ -1412,21 +1440,31 @@ def replace_catalog_paths_with_ids(config):
     """
     VAR_ID_FIELDS = ("colorVariableId", "xVariableId", "sizeVariableId")
 
-    if "views" in config:
-        views = config["views"]
-        for view in views:
-            if "config" not in view:
-                continue
-            vcfg = view["config"]
-            # Slug fields — keep as string
-            if "sortColumnSlug" in vcfg:
-                vcfg["sortColumnSlug"] = str(map_indicator_path_to_id(vcfg["sortColumnSlug"]))
-            if "map" in vcfg and "columnSlug" in vcfg["map"]:
-                vcfg["map"]["columnSlug"] = str(map_indicator_path_to_id(vcfg["map"]["columnSlug"]))
-            # VariableId fields — coerce to int
-            for fname in VAR_ID_FIELDS:
-                if fname in vcfg:
-                    vcfg[fname] = int(map_indicator_path_to_id(vcfg[fname]))
+    view_configs = [view["config"] for view in config.get("views", []) if "config" in view]
+
+    # Collect all referenced indicators and resolve the unknown ones at once
+    paths = set()
+    for vcfg in view_configs:
+        if "sortColumnSlug" in vcfg:
+            paths.add(str(vcfg["sortColumnSlug"]))
+        if "map" in vcfg and "columnSlug" in vcfg["map"]:
+            paths.add(str(vcfg["map"]["columnSlug"]))
+        for fname in VAR_ID_FIELDS:
+            if fname in vcfg:
+                paths.add(str(vcfg[fname]))
+    indicator_ids = dict(indicator_ids or {})
+    indicator_ids.update(map_indicator_paths_to_ids(paths - indicator_ids.keys(), owid_env=owid_env))
+
+    for vcfg in view_configs:
+        # Slug fields — keep as string
+        if "sortColumnSlug" in vcfg:
+            vcfg["sortColumnSlug"] = str(indicator_ids[str(vcfg["sortColumnSlug"])])
+        if "map" in vcfg and "columnSlug" in vcfg["map"]:
+            vcfg["map"]["columnSlug"] = str(indicator_ids[str(vcfg["map"]["columnSlug"])])
+        # VariableId fields — coerce to int
+        for fname in VAR_ID_FIELDS:
+            if fname in vcfg:
+                vcfg[fname] = indicator_ids[str(vcfg[fname])]
 
     return config
 
@@ -3,18 +3,21 @@
 NOTE: Should not import from any other submodule in etl.collection.
 """
 
+import hashlib
+import json
 import re
 from collections import defaultdict
+from collections.abc import Iterable
 from copy import deepcopy
 from itertools import product
+from pathlib import Path
 from string import Formatter
 from typing import Any
 
 from deprecated import deprecated
 from owid.catalog import Dataset
-from sqlalchemy.orm import Session
 
-import etl.grapher.model as gm
+from etl import config
 from etl.collection.exceptions import ParamKeyError
 from etl.config import DEFAULT_GRAPHER_SCHEMA, OWID_ENV, OWIDEnv
 from etl.db import read_sql
@@ -80,20 +83,81 @@ def records_to_dictionary(records, key: str):
 
 
 # common, model.core
-def map_indicator_path_to_id(catalog_path: str, owid_env: OWIDEnv | None = None) -> str | int:
-    # Check if given path is actually an ID
-    if str(catalog_path).isdigit():
-        return catalog_path
-
-    # Get ID, assuming given path is a catalog path
-    if owid_env is None:
-        engine = OWID_ENV.engine
-    else:
-        engine = owid_env.engine
-    with Session(engine) as session:
-        db_indicator = gm.Variable.from_id_or_path(session, catalog_path)
-        assert db_indicator.id is not None
-        return db_indicator.id
+def map_indicator_paths_to_ids(catalog_paths: Iterable[str | int], owid_env: OWIDEnv | None = None) -> dict[str, int]:
+    """Map catalog paths of indicators to their IDs, resolving all of them in a single query.
+
+    Values that are already IDs (integers or digit strings) map to themselves. Keys of the returned dictionary are
+    the given values as strings.
+    """
+    indicator_ids = {}
+    indicators = set()
+    for catalog_path in catalog_paths:
+        # Check if given path is actually an ID
+        if str(catalog_path).isdigit():
+            indicator_ids[str(catalog_path)] = int(catalog_path)
+        else:
+            indicators.add(catalog_path)
+
+    if indicators:
+        engine = (owid_env or OWID_ENV).engine
+        indicator_ids.update(validate_indicators_in_db(indicators, engine))
+
+    return indicator_ids
+
+
+# model.core, explorer.legacy
+def config_checksum(config: dict[str, Any] | str) -> str:
+    """Checksum of a config in the exact form it is uploaded."""
+    if not isinstance(config, str):
+        config = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.md5(config.encode()).hexdigest()
+
+
+# model.core, explorer.legacy
+def get_config_updated_at(owid_env: OWIDEnv, table: str, key_column: str, key: str) -> str | None:
+    """Last update time of a config stored in the environment's database, or None if it isn't there.
+
+    Used to validate local upload records against the server: it changes whenever the config is edited, deleted or
+    the server is rebuilt.
+    """
+    df = read_sql(
+        f"SELECT updatedAt FROM {table} WHERE {key_column} = %(key)s",
+        owid_env.engine,
+        params={"key": key},
+    )
+    if df.empty:
+        return None
+    return str(df["updatedAt"].iloc[0])
+
+
+# model.core, explorer.legacy
+def is_already_uploaded(checksum_path: Path, owid_env: OWIDEnv, checksum: str, updated_at: str | None) -> bool:
+    """Check if a config with the given checksum was the last one uploaded to the environment.
+
+    Checksums of uploaded configs are stored in `checksum_path` (next to the exported config) by `record_upload`,
+    together with the server's `updatedAt` of the config right after the upload. The record is only trusted if the
+    config on the server (`updated_at`) hasn't changed since, so configs edited or deleted in the admin, or lost in a
+    rebuild of the server, are uploaded again. Set FORCE_UPLOAD=1 to upload configs anyway.
+    """
+    if config.FORCE_UPLOAD or updated_at is None:
+        return False
+    try:
+        uploaded = json.loads(checksum_path.read_text())
+    except (OSError, ValueError):
+        return False
+    return uploaded.get(owid_env.admin_api) == {"checksum": checksum, "updatedAt": updated_at}
+
+
+# model.core, explorer.legacy
+def record_upload(checksum_path: Path, owid_env: OWIDEnv, checksum: str, updated_at: str | None) -> None:
+    """Store the checksum of a config uploaded to the environment, with its `updatedAt` on the server."""
+    try:
+        uploaded = json.loads(checksum_path.read_text())
+    except (OSError, ValueError):
+        uploaded = {}
+    uploaded[owid_env.admin_api] = {"checksum": checksum, "updatedAt": updated_at}
+    checksum_path.parent.mkdir(parents=True, exist_ok=True)
+    checksum_path.write_text(json.dumps(uploaded, indent=2))
 
 
 # .load_table_names_from_dependencies
@@ -132,22 +196,43 @@ def get_tables_by_name_mapping(dependencies: set[str]) -> dict[str, list[str]]:
         if not re.match(r"^(data|data-private)://grapher/", dep):
             continue
 
-        ds = load_dataset_from_step(dep)
-        for table_name in ds.table_names:
-            tb = ds.read(table_name, load_data=False)
-            assert tb.m.dataset is not None, f"Dataset not found for table {table_name}"
-            table_uri = f"{tb.m.dataset.uri}/{table_name}"
-            # Add table -> uri
-            tb_name_to_tb[table_name].append(table_uri)
-            # Add dataset -> uri
-            tb_name_to_tb[f"{ds.m.short_name}/{table_name}"].append(table_uri)
+        for name, table_uri in _get_table_names_of_dataset(dep):
+            tb_name_to_tb[name].append(table_uri)
 
     return tb_name_to_tb
 
 
+# Table names of datasets, keyed by step and invalidated when the dataset or its tables are saved again
+_TABLE_NAMES_CACHE: dict[str, tuple[tuple[int, int], list[tuple[str, str]]]] = {}
+
+
+def _get_table_names_of_dataset(step: str) -> list[tuple[str, str]]:
+    """Return pairs (name, table_uri) of all tables in the dataset of a step, where name is either the table name or
+    `dataset_short_name/table_name`."""
+    ds_path = DATA_DIR / re.sub(r"^(data|data-private)://", "", step)
+    # Adding or removing tables changes the modification time of the directory
+    mtime = (ds_path.stat().st_mtime_ns, (ds_path / "index.json").stat().st_mtime_ns)
+    cached = _TABLE_NAMES_CACHE.get(step)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    ds = load_dataset_from_step(step)
+    names = []
+    for table_name in ds.table_names:
+        # Tables share the metadata of their dataset, so there's no need to read metadata of every table
+        table_uri = f"{ds.m.uri}/{table_name}"
+        # Add table -> uri
+        names.append((table_name, table_uri))
+        # Add dataset -> uri
+        names.append((f"{ds.m.short_name}/{table_name}", table_uri))
+
+    _TABLE_NAMES_CACHE[step] = (mtime, names)
+    return names
+
+
 # model.core
-def validate_indicators_in_db(indicators, engine):
-    """Check that indicators are in DB!"""
+def validate_indicators_in_db(indicators, engine) -> dict[str, int]:
+    """Check that indicators are in DB! Return mapping of their catalog paths to IDs."""
     q = """
     select
         id,
@@ -159,6 +244,7 @@ def validate_indicators_in_db(indicators, engine):
     missing_indicators = set(indicators) - set(df["catalogPath"])
     if missing_indicators:
         raise ValueError(f"Missing indicators in DB: {missing_indicators}")
+    return dict(zip(df["catalogPath"], df["id"].astype(int)))
 
 
 # .get_complete_dimensions_filter
@@ -112,6 +112,12 @@ STEP_FAILURES: list[tuple[str, str]] = []
     help="Parallelize execution of steps.",
     default=1,
 )
+@click.option(
+    "--schedule",
+    type=click.Choice(["channel", "critical-path"]),
+    help="How to prioritize ready steps when running with `--workers`. `channel` starts grapher steps first, `critical-path` uses recorded execution times to start steps with the longest chain of downstream work first.",
+    default="channel",
+)
 @click.option(
     "--use-threads/--no-threads",
     "-t/-nt",
@@ -126,6 +132,11 @@ STEP_FAILURES: list[tuple[str, str]] = []
     help="Force strict or lax validation on DAG steps (e.g. checks for primary keys in data steps).",
     default=None,
 )
+@click.option(
+    "--rehash",
+    is_flag=True,
+    help="Ignore checksums of step files, snapshots and datasets cached from previous runs and compute them again.",
+)
 @click.option(
     "--watch",
     is_flag=True,
@@ -174,8 +185,10 @@ def main_cli(
     exclude: str | None = None,
     dag_path: Path = paths.DEFAULT_DAG_FILE,
     workers: int = 1,
+    schedule: str = "channel",
     use_threads: bool = True,
     strict: bool | None = None,
+    rehash: bool = False,
     watch: bool = False,
     continue_on_failure: bool = False,
     force_upload: bool = False,
@@ -226,6 +239,10 @@ def main_cli(
     if workers > 1:
         config.GRAPHER_INSERT_WORKERS = config.GRAPHER_INSERT_WORKERS // workers
 
+    # Forget checksums cached by previous runs
+    if rehash:
+        files.CHECKSUM_CACHE.clear()
+
     # Set CONTINUE_ON_FAILURE from CLI flag
     if continue_on_failure:
         config.CONTINUE_ON_FAILURE = continue_on_failure
@@ -299,6 +316,7 @@ def main_cli(
         excludes=exclude.split(",") if exclude else None,
         dag_path=dag_path,
         workers=workers,
+        schedule=schedule,
         strict=strict,
     )
 
@@ -442,6 +460,7 @@ def main(
     excludes: list[str] | None = None,
     dag_path: Path = paths.DEFAULT_DAG_FILE,
     workers: int = 1,
+    schedule: str = "channel",
     strict: bool | None = None,
 ) -> None:
     """
@@ -482,6 +501,7 @@ def main(
         private=private,
         only=only,
         workers=workers,
+        schedule=schedule,
         strict=strict,
     )
 
@@ -569,6 +589,7 @@ def run_steps(
     private: bool = False,
     only: bool = False,
     workers: int = 1,
+    schedule: str = "channel",
     strict: bool | None = None,
 ) -> None:
     """
@@ -577,6 +598,10 @@ def run_steps(
 
     By default, data steps do not re-run if they appear to be up-to-date already by
     looking at their checksum.
+
+    With more than one worker, `schedule` decides which ready step starts next: "channel" starts
+    grapher steps first, "critical-path" starts the step with the longest chain of (recorded)
+    downstream execution time first.
     """
     from etl import config
     from etl.steps import select_dirty_steps
@@ -628,6 +653,7 @@ def run_steps(
             continue_on_failure=config.CONTINUE_ON_FAILURE,
             strict_after=config.STRICT_AFTER,
             strict=strict,
+            schedule=schedule,
         )
 
 
@@ -698,7 +724,12 @@ def _steps_sort_key(step: "Step") -> int:
 
 
 def exec_steps_parallel(
-    steps: "list[Step]", workers: int, continue_on_failure: bool, strict_after: bool, strict: bool | None = None
+    steps: "list[Step]",
+    workers: int,
+    continue_on_failure: bool,
+    strict_after: bool,
+    strict: bool | None = None,
+    schedule: str = "channel",
 ) -> None:
     # put grapher steps in front of the queue to process them as soon as possible and lessen
     # the load on MySQL
@@ -720,6 +751,15 @@ def exec_steps_parallel(
             # different attributes
             exec_graph[str(step)] = {str(dep) for dep in step.dependencies if str(dep) in steps_str}
 
+        # Prioritize steps by the recorded time of their longest chain of dependent steps
+        priorities = None
+        if schedule == "critical-path":
+            expected_durations = _expected_durations(exec_graph)
+            priorities = _critical_path_lengths(exec_graph, expected_durations)
+            print(
+                f"--- Scheduling by critical path{_create_expected_time_message(_ideal_makespan(exec_graph, expected_durations, workers), prepend_message=' (expected makespan at least ')}"
+            )
+
         # Prepare a function for execution that includes the necessary arguments
         exec_func = partial(
             _exec_step_job,
@@ -730,16 +770,21 @@ def exec_steps_parallel(
         )
 
         # Execute the graph of tasks in parallel
+        start_time = time.time()
         exec_graph_parallel(
             exec_graph=exec_graph,
             func=exec_func,
             continue_on_failure=continue_on_failure,
             workers=workers,
+            priorities=priorities,
         )
+        makespan = time.time() - start_time
 
         # After all tasks have completed, write the execution times to the file
         _write_execution_times(dict(execution_times))
 
+        _print_makespan_report(exec_graph, dict(execution_times), workers=workers, makespan=makespan)
+
 
 def exec_graph_parallel(
     exec_graph: dict[str, Any],
@@ -747,6 +792,7 @@ def exec_graph_parallel(
     continue_on_failure: bool,
     workers: int,
     use_threads=False,
+    priorities: dict[str, float] | None = None,
     **kwargs,
 ) -> None:
     """
@@ -757,6 +803,9 @@ def exec_graph_parallel(
     :param func: The function to be executed for each task.
     :param workers: The number of workers to use for parallel execution.
     :param use_threads: Flag indicating whether to use threads instead of processes for parallel execution.
+    :param priorities: Optional priority of each task. If given, ready tasks with the highest priority are
+        submitted first, and only as many as there are idle workers, so that a task becoming ready later
+        can still overtake lower-priority tasks that are waiting.
     :param kwargs: Additional keyword arguments to be passed to the function.
     """
     topological_sorter = TopologicalSorter(exec_graph)
@@ -776,9 +825,16 @@ def exec_graph_parallel(
             # add new tasks
             ready_tasks += topological_sorter.get_ready()
 
+            if priorities is None:
+                n_slots = workers
+            else:
+                # highest priority first; tasks without a priority go last (sort is stable)
+                ready_tasks.sort(key=lambda task: -priorities.get(task, 0))
+                n_slots = workers - len(future_to_task)
+
             # Submit tasks that are ready to the executor, but skip those dependent on failed or skipped tasks
             tasks_to_submit = []
-            for task in ready_tasks[:workers]:
+            for task in ready_tasks[:n_slots]:
                 if continue_on_failure:
                     # Check if any dependency of this task has failed or been skipped
                     task_deps = exec_graph.get(task, set())
@@ -795,7 +851,7 @@ def exec_graph_parallel(
                 future_to_task[future] = task
 
             # remove ready tasks
-            ready_tasks = ready_tasks[workers:]
+            ready_tasks = ready_tasks[n_slots:]
 
             # Wait for at least one future to complete
             if future_to_task:
@@ -936,20 +992,85 @@ def _get_step_identifier(step_name: str) -> str:
     return step_name.replace(step_name.split("/")[-2] + "/", "")
 
 
+def _load_execution_times() -> dict[str, float]:
+    # Read execution times of all steps from the hidden json file
+    if not paths.EXECUTION_TIME_FILE.exists():
+        return {}
+    with open(paths.EXECUTION_TIME_FILE) as file:
+        return json.load(file)
+
+
+def _lookup_execution_time(step_name: str, execution_times: dict[str, float]) -> float | None:
+    # If the step has not been timed yet, try to find a previous version of the same step
+    execution_time = execution_times.get(step_name)
+    if not execution_time:
+        step_identifiers = {_get_step_identifier(step): value for step, value in execution_times.items()}
+        execution_time = step_identifiers.get(_get_step_identifier(step_name))
+    return execution_time
+
+
 def _get_execution_time(step_name: str) -> float | None:
     # Read execution time of a given step from the hidden json file
     # If it doesn't exist, try to read another version of the same step, and if no other version exists, return None
-    if not paths.EXECUTION_TIME_FILE.exists():
-        return None
-    else:
-        with open(paths.EXECUTION_TIME_FILE) as file:
-            execution_times = json.load(file)
-        execution_time = execution_times.get(step_name)
-        if not execution_time:
-            # If the step has not been timed yet, try to find a previous version
-            step_identifiers = {_get_step_identifier(step): value for step, value in execution_times.items()}
-            execution_time = step_identifiers.get(_get_step_identifier(step_name))
-        return execution_time
+    return _lookup_execution_time(step_name, _load_execution_times())
+
+
+def _expected_durations(exec_graph: dict[str, Any]) -> dict[str, float]:
+    """Expected duration of every task in the graph, based on recorded execution times.
+
+    Tasks that have never been timed (not even a previous version of them) get the median of the
+    recorded times of the other tasks, so that new steps are neither ignored nor over-prioritized.
+    """
+    execution_times = _load_execution_times()
+    step_identifiers = {_get_step_identifier(step): value for step, value in execution_times.items()}
+
+    durations = {}
+    for task in exec_graph:
+        duration = execution_times.get(task) or step_identifiers.get(_get_step_identifier(task))
+        if duration:
+            durations[task] = duration
+
+    known = sorted(durations.values())
+    default = known[len(known) // 2] if known else 1.0
+    return {task: durations.get(task, default) for task in exec_graph}
+
+
+def _critical_path_lengths(exec_graph: dict[str, Any], durations: dict[str, float]) -> dict[str, float]:
+    """Return the length of the longest path from each task to the end of the graph.
+
+    The length includes the duration of the task itself, so that a task with the longest critical path
+    is the one whose delay would delay the whole run the most.
+    """
+    dependents: dict[str, set[str]] = {task: set() for task in exec_graph}
+    for task, deps in exec_graph.items():
+        for dep in deps:
+            dependents.setdefault(dep, set()).add(task)
+
+    # Visit tasks in reverse topological order, so that all dependents of a task are visited before it
+    lengths: dict[str, float] = {}
+    for task in reversed(list(TopologicalSorter(exec_graph).static_order())):
+        downstream = max((lengths[d] for d in dependents.get(task, ())), default=0.0)
+        lengths[task] = durations.get(task, 0.0) + downstream
+    return lengths
+
+
+def _ideal_makespan(exec_graph: dict[str, Any], durations: dict[str, float], workers: int) -> float:
+    """Lower bound of the wall-clock time of running the graph with the given number of workers."""
+    critical_path = max(_critical_path_lengths(exec_graph, durations).values(), default=0.0)
+    return max(critical_path, sum(durations.get(task, 0.0) for task in exec_graph) / workers)
+
+
+def _print_makespan_report(
+    exec_graph: dict[str, Any], execution_times: dict[str, float], workers: int, makespan: float
+) -> None:
+    """Compare the achieved wall-clock time with the ideal one, given the times the steps actually took."""
+    if not execution_times:
+        return
+    ideal = _ideal_makespan(exec_graph, execution_times, workers)
+    efficiency = ideal / makespan if makespan > 0 else 1.0
+    print(
+        f"--- Makespan: {makespan:.1f}s achieved, {ideal:.1f}s ideal with {workers} workers ({efficiency:.0%} efficiency)"
+    )
 
 
 def enumerate_steps(steps: "list[Step]") -> None:
@@ -1003,7 +1124,7 @@ def _validate_private_steps(steps: "list[Step]") -> None:
 
 
 def _is_private_step(step_name: str) -> bool:
-    return bool(re.findall(r".*?-private://", step_name))
+    return "-private://" in step_name
 
 
 def _grapher_steps(dag: DAG, private: bool) -> DAG:
@@ -256,6 +256,27 @@ INSTANT = env.get("INSTANT", "0") in ("True", "true", "1")
 # if set, always upload grapher data & metadata JSON files even if checksums match
 FORCE_UPLOAD = env.get("FORCE_UPLOAD") in ("True", "true", "1")
 
+# gzip compression level (1-9) of grapher data & metadata JSON files uploaded to R2, lower levels are
+# faster to compress at the cost of slightly larger files
+GRAPHER_GZIP_LEVEL = int(env.get("GRAPHER_GZIP_LEVEL", 9))
+
+# maximum size in GB of snapshot archives extracted by `Snapshot.extracted()` and kept for later runs,
+# least recently used ones are deleted beyond it. Set to 0 to extract archives to a temporary directory
+SNAPSHOT_EXTRACTED_CACHE_GB = float(env.get("SNAPSHOT_EXTRACTED_CACHE_GB", 20))
+
+# number of concurrent range requests used to download a large snapshot file, and number of snapshots
+# downloaded concurrently by `etl snapshot-pull`
+SNAPSHOT_DOWNLOAD_WORKERS = int(env.get("SNAPSHOT_DOWNLOAD_WORKERS", 8))
+SNAPSHOT_PULL_WORKERS = int(env.get("SNAPSHOT_PULL_WORKERS", 8))
+
+# directory with indicator search artifacts built by `etl api-search-build`, and how often (in seconds) the
+# search API checks it for a newer artifact (0 disables hot reload)
+API_SEARCH_ARTIFACT_DIR = Path(env.get("API_SEARCH_ARTIFACT_DIR", CACHE_DIR / "api_search"))
+API_SEARCH_RELOAD_INTERVAL = int(env.get("API_SEARCH_RELOAD_INTERVAL", 60))
+
+# number of collections saved (validated and uploaded to Admin API) concurrently by `save_collections`
+COLLECTION_SAVE_WORKERS = int(env.get("COLLECTION_SAVE_WORKERS", 4))
+
 # if set, export steps will not upload/commit files (e.g. S3, GitHub)
 DRY_RUN = env.get("DRY_RUN", "0") in ("True", "true", "1")
 
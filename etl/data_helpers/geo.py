@@ -58,6 +58,9 @@ INCOME_GROUPS_ENTITY_CODES = {
     "Upper-middle-income countries": "OWID_UMC",
     "High-income countries": "OWID_HIC",
 }
+# Auxiliary columns used to assign data of member countries to their regions when creating region aggregates.
+_REGION_COL = "__region"
+_ROW_COL = "__row"
 
 ########################################################################################################################
 # DEPRECATED: Default parameters when using "auto" mode when imposing a list of countries that must be informed, when
@@ -2383,6 +2386,9 @@ class RegionAggregator:
         # Coverage table.
         self.tb_coverage = None
 
+        # Table of region memberships (created when aggregates are first needed).
+        self._df_membership: pd.DataFrame | None = None
+
         # Fill missing arguments with default values and ensure regions is always a dict.
         if regions is None:
             self.regions: dict[str, Any] = REGIONS
@@ -2551,6 +2557,19 @@ class RegionAggregator:
                 f"Unknown overlaps found in the data: {found_not_accepted}. Consider adding them to 'accepted_overlaps'."
             )
 
+    def _create_table_of_regions_membership(self) -> pd.DataFrame:
+        """Create a table with one row for each region and each of its members.
+
+        This is a sparse version of the country-region membership matrix. It is created only once per aggregator.
+        """
+        if self._df_membership is None:
+            self._df_membership = pd.DataFrame(
+                [(member, region) for region, members in self.regions_members.items() for member in members],
+                columns=[self.country_col, _REGION_COL],
+            )
+
+        return self._df_membership
+
     def _create_table_of_only_region_aggregates(
         self,
         tb: TableOrDataFrame,
@@ -2560,37 +2579,31 @@ class RegionAggregator:
         frac_allowed_nans_per_year: float | None = None,
         min_num_values_per_year: int | None = None,
     ):
-        # Create region aggregates.
-        dfs_with_regions = []
-        for region in regions:
-            # Select data for countries in the region.
-            df_region_data = tb[tb[self.country_col].isin(self.regions_members[region])]
+        # Select the members of the requested regions (one row per region and member country).
+        df_membership = self._create_table_of_regions_membership()
+        df_membership = df_membership[df_membership[_REGION_COL].isin(regions)]
+
+        # Find the rows of the members of each region, where rows of countries that belong to several regions are
+        # repeated once for each of them, so that the aggregates of all regions (both regular and possibly weighted
+        # aggregations) are created in a single grouped pass.
+        df_rows = pd.DataFrame({self.country_col: tb[self.country_col].to_numpy(), _ROW_COL: np.arange(len(tb))}).merge(
+            df_membership, on=self.country_col, how="inner"
+        )
 
-            if df_region_data.empty:
-                continue
+        # If no region aggregates can be created, return an empty Table with the same columns as the original.
+        if df_rows.empty:
+            return pd.DataFrame(columns=tb.columns)
 
-            # Create region aggregates (both regular and possibly weighted aggregations).
-            df_region = groupby_agg(
-                df=df_region_data,
-                groupby_columns=[column for column in self.index_columns if column != self.country_col],
-                aggregations=aggregations,
-                num_allowed_nans=num_allowed_nans_per_year,
-                frac_allowed_nans=frac_allowed_nans_per_year,
-                min_num_values=min_num_values_per_year,
-            ).reset_index()
-
-            # Add a column for region name.
-            df_region[self.country_col] = region
-            dfs_with_regions.append(df_region)
-
-        # Concatenate aggregates of all regions.
-        # If no region aggregates were created, return an empty Table with the same columns as the original.
-        dfs_with_regions_non_empty = [df for df in dfs_with_regions if not df.empty]
-        df_with_regions = (
-            pd.concat(dfs_with_regions_non_empty, ignore_index=True)
-            if dfs_with_regions_non_empty
-            else pd.DataFrame(columns=tb.columns)
-        )
+        df_members = tb.iloc[df_rows[_ROW_COL].to_numpy()].reset_index(drop=True)
+        df_members[self.country_col] = df_rows[_REGION_COL].to_numpy()
+        df_with_regions = groupby_agg(
+            df=df_members,
+            groupby_columns=self.index_columns,
+            aggregations=aggregations,
+            num_allowed_nans=num_allowed_nans_per_year,
+            frac_allowed_nans=frac_allowed_nans_per_year,
+            min_num_values=min_num_values_per_year,
+        ).reset_index()
 
         return df_with_regions
 
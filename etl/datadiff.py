@@ -1208,46 +1208,90 @@ def _is_datetime(dtype: Any) -> bool:
 
 
 def _align_tables(table_a: Table, table_b: Table) -> tuple[Table, Table, pd.Series, pd.Series, pd.Series]:
-    if not table_a.index.is_unique or not table_b.index.is_unique:
-        raise DatasetError("Index must be unique.")
-
-    if len(table_a.index.names) * len(table_a) >= 2 * 10**8:
-        # table_a.align is very memory intensive for large tables as doesn't handle
-        # categorical indexes well. We'd have to convert all categories to codes first,
-        # align them and then convert back to categories.
-        raise DatasetError("Cannot run datadiff for an index of such size.")
+    """Align tables on the sorted union of their indexes.
 
-    table_a = _sort_index(table_a)
-    table_b = _sort_index(table_b)
+    Rows are matched on integer codes of index values rather than with `DataFrame.align`, which is very memory
+    intensive for large tables as it doesn't handle categorical indexes well.
+    """
+    union_index, pos_a, pos_b = _union_index(table_a.index, table_b.index)
+    n = len(union_index)
 
-    # align tables by index
-    table_a["_x"] = 1
-    table_b["_x"] = 1
-    table_a, table_b = table_a.align(table_b, join="outer", copy=False)
+    # rows of a unique index have distinct positions in the union
+    n_a = np.bincount(pos_a, minlength=n)
+    n_b = np.bincount(pos_b, minlength=n)
+    if (n_a > 1).any() or (n_b > 1).any():
+        raise DatasetError("Index must be unique.")
+    in_a = n_a > 0
+    in_b = n_b > 0
 
-    new_index = table_a["_x"].isnull()
-    removed_index = table_b["_x"].isnull()
+    # place rows at their position in the union, missing rows are filled with NaNs
+    table_a = table_a.set_axis(pos_a).reindex(np.arange(n)).set_axis(union_index)
+    table_b = table_b.set_axis(pos_b).reindex(np.arange(n)).set_axis(union_index)
 
+    new_index = pd.Series(~in_a, index=union_index)
+    removed_index = pd.Series(~in_b, index=union_index)
     eq_index = ~(new_index | removed_index)
-    table_a.drop(columns="_x", inplace=True)
-    table_b.drop(columns="_x", inplace=True)
 
     return cast(Table, table_a), cast(Table, table_b), eq_index, new_index, removed_index
 
 
-def _sort_index(df: Table) -> Table:
-    """Sort dataframe by its index and make sure categories are sorted by their
-    names and not codes. Modifies the dataframe in place and also returns it."""
-    new_levels = []
-    for level_name in df.index.names:
-        level = df.index.get_level_values(level_name)
-        if level.dtype == "category":
-            level = level.reorder_categories(sorted(level.categories))  # ty: ignore[unresolved-attribute]
-        new_levels.append(level)
+def _union_index(index_a: pd.Index, index_b: pd.Index) -> tuple[pd.MultiIndex, np.ndarray, np.ndarray]:
+    """Return sorted union of two indexes with the same levels, and positions of their rows in it.
 
-    df.index = pd.MultiIndex.from_arrays(new_levels)
-    df.sort_index(inplace=True)
-    return df
+    Index is sorted like `sort_index`, with categories sorted by their names and not codes and missing values last.
+    """
+    n_a = len(index_a)
+    levels = []
+    level_codes = []
+    key_a = np.zeros(n_a, dtype=np.int64)
+    key_b = np.zeros(len(index_b), dtype=np.int64)
+    n_keys = 1
+    for i in range(index_a.nlevels):
+        level, codes_a, codes_b = _union_level_codes(index_a.get_level_values(i), index_b.get_level_values(i))
+        levels.append(level)
+        level_codes.append((codes_a, codes_b))
+
+        # combine codes of all levels into a single key, missing values (code -1) go last
+        n_codes = len(level) + 1
+        if n_keys * n_codes >= 2**62:
+            # make keys dense again to avoid overflow
+            _, inverse = np.unique(np.concatenate([key_a, key_b]), return_inverse=True)
+            key_a, key_b = inverse[:n_a], inverse[n_a:]
+            n_keys = int(inverse.max()) + 1 if len(inverse) else 1
+        key_a = key_a * n_codes + np.where(codes_a < 0, n_codes - 1, codes_a)
+        key_b = key_b * n_codes + np.where(codes_b < 0, n_codes - 1, codes_b)
+        n_keys *= n_codes
+
+    union_keys, inverse = np.unique(np.concatenate([key_a, key_b]), return_inverse=True)
+    pos_a, pos_b = inverse[:n_a], inverse[n_a:]
+
+    # codes of union rows, taken from table A where the row is in both tables
+    union_codes = []
+    for codes_a, codes_b in level_codes:
+        codes = np.empty(len(union_keys), dtype=np.int64)
+        codes[pos_b] = codes_b
+        codes[pos_a] = codes_a
+        union_codes.append(codes)
+
+    union_index = pd.MultiIndex(levels=levels, codes=union_codes, names=index_a.names, verify_integrity=False)
+    return union_index, pos_a, pos_b
+
+
+def _union_level_codes(values_a: pd.Index, values_b: pd.Index) -> tuple[pd.Index, np.ndarray, np.ndarray]:
+    """Return sorted union of values of an index level, and codes of both levels in it (-1 for missing values)."""
+    if isinstance(values_a, pd.CategoricalIndex) and isinstance(values_b, pd.CategoricalIndex):
+        # recode categories instead of comparing values
+        categories = pd.Index(sorted(set(values_a.categories) | set(values_b.categories)))
+        level = pd.CategoricalIndex(categories, categories=categories)
+        codes = []
+        for values in (values_a, values_b):
+            # the extra -1 at the end maps missing values (code -1) to themselves
+            mapping = np.append(categories.get_indexer(values.categories), -1)
+            codes.append(mapping[values.codes])
+        return level, codes[0], codes[1]
+
+    level = values_a.append(values_b).unique().dropna().sort_values()
+    return level, level.get_indexer(values_a), level.get_indexer(values_b)
 
 
 def _match_dataset(path_to_ds: dict[str, Any], path: str) -> Dataset | None:
@@ -4,10 +4,12 @@
 #  Helpers for downloading and dealing with files.
 #
 
+import concurrent.futures
+import glob
 import hashlib
 import os
 import shutil
-from typing import IO
+from typing import IO, Any
 
 import click
 import requests
@@ -50,14 +52,16 @@ def _stream_to_file(
     file: IO[bytes],
     chunk_size: int = 2**14,
     progress_bar_min_bytes: int = 2**25,
+    md5: Any = None,
 ) -> str:
     """Stream the response to the file, returning the checksum.
     :param progress_bar_min_bytes: Minimum number of bytes to display a progress bar for. Default is 32MB
+    :param md5: Hash object to update, e.g. one that already hashed the beginning of a resumed download
     """
     # Check header to get content length, in bytes
     total_length = int(r.headers.get("content-length", 0))
 
-    md5 = hashlib.md5()
+    md5 = md5 or hashlib.md5()
     bytes_downloaded = 0
 
     streamer = r.iter_content(chunk_size=chunk_size)
@@ -162,6 +166,117 @@ def download(
         log("DOWNLOADED", f"{url} -> {filename}")
 
 
+def download_resumable(
+    url: str,
+    filename: str,
+    workers: int = 8,
+    part_size: int = 2**26,
+    quiet: bool = False,
+    timeout: int = 60,
+) -> str:
+    """Download the file at the URL to the given local filename, returning its md5 checksum.
+
+    Unlike `download`, this is meant for large files on servers that support range requests (like R2). The
+    checksum is computed while downloading, so the file doesn't have to be read again. Files of at least two
+    parts are downloaded with `workers` concurrent range requests of `part_size` bytes. Interrupted downloads
+    leave their partial file (or completed parts) behind, and are resumed from there on the next call.
+    """
+    head = requests.head(url, allow_redirects=True, timeout=timeout)
+    head.raise_for_status()
+    total_length = int(head.headers.get("content-length", 0))
+    accepts_ranges = head.headers.get("accept-ranges") == "bytes" and total_length > 0
+
+    # partial files are named after the URL, so that a download of another version of the file is never
+    # resumed from them
+    partial_filename = f"{filename}.{hashlib.md5(url.encode()).hexdigest()[:8]}.part"
+    for stale in glob.glob(f"{glob.escape(filename)}.*.part*"):
+        if not stale.startswith(partial_filename):
+            os.remove(stale)
+
+    if accepts_ranges and workers > 1 and total_length >= 2 * part_size:
+        md5 = _download_parts(url, partial_filename, total_length, part_size, workers, timeout)
+    else:
+        md5 = _download_resuming(url, partial_filename, total_length if accepts_ranges else 0, timeout)
+
+    os.replace(partial_filename, filename)
+
+    # completed parts are only removed once the file is in place, in case assembling them is interrupted
+    for part_filename in glob.glob(f"{glob.escape(partial_filename)}*"):
+        os.remove(part_filename)
+
+    if not quiet:
+        log("DOWNLOADED", f"{url} -> {filename}")
+
+    return md5
+
+
+def _hash_file(filename: str, md5: Any, out: IO[bytes] | None = None) -> None:
+    """Update the hash with the contents of the file, copying them to `out` if given."""
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(2**20), b""):
+            md5.update(chunk)
+            if out is not None:
+                out.write(chunk)
+
+
+def _download_resuming(url: str, partial_filename: str, total_length: int, timeout: int) -> str:
+    """Download the file with a single request, resuming it from the partial file if the server supports it."""
+    md5 = hashlib.md5()
+    offset = os.path.getsize(partial_filename) if total_length and os.path.exists(partial_filename) else 0
+    if offset > total_length:
+        offset = 0
+    if offset:
+        _hash_file(partial_filename, md5)
+        if offset == total_length:
+            return md5.hexdigest()
+
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+    with requests.get(url, stream=True, headers=headers, timeout=timeout) as r:
+        r.raise_for_status()
+        if offset and r.status_code != 206:
+            # server sent the whole file, start over
+            offset = 0
+            md5 = hashlib.md5()
+        with open(partial_filename, "ab" if offset else "wb") as f:
+            return _stream_to_file(r, f, progress_bar_min_bytes=2**100, md5=md5)
+
+
+def _download_parts(
+    url: str, partial_filename: str, total_length: int, part_size: int, workers: int, timeout: int
+) -> str:
+    """Download the file with concurrent range requests, concatenating the parts in order while hashing them.
+
+    Completed parts are kept until the assembled file replaces the target (they are removed by the caller), so
+    that an interrupted download or assembly only fetches the missing ones.
+    """
+    ranges = [(start, min(start + part_size, total_length)) for start in range(0, total_length, part_size)]
+
+    def fetch_part(i: int) -> str:
+        start, end = ranges[i]
+        part_filename = f"{partial_filename}{i}"
+        if os.path.exists(part_filename) and os.path.getsize(part_filename) == end - start:
+            return part_filename
+        headers = {"Range": f"bytes={start}-{end - 1}"}
+        with requests.get(url, stream=True, headers=headers, timeout=timeout) as r:
+            r.raise_for_status()
+            if r.status_code != 206:
+                raise DownloadCorrupted(f"Server ignored range request for {url}")
+            with open(f"{part_filename}.tmp", "wb") as f:
+                _stream_to_file(r, f, progress_bar_min_bytes=2**100)
+        os.replace(f"{part_filename}.tmp", part_filename)
+        return part_filename
+
+    md5 = hashlib.md5()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        # parts are yielded in order as they complete, so that they are hashed while the rest is downloading
+        part_filenames = executor.map(fetch_part, range(len(ranges)))
+        with open(partial_filename, "wb") as f:
+            for part_filename in part_filenames:
+                _hash_file(part_filename, md5, out=f)
+
+    return md5.hexdigest()
+
+
 class ChecksumDoesNotMatch(Exception):
     pass
 
@@ -2,6 +2,7 @@
 #  NOTE: the only allowed dependencies are etl.config, etl.paths
 #
 
+import concurrent.futures
 import hashlib
 import io
 import json
@@ -10,7 +11,7 @@ import re
 import subprocess
 import time
 from collections import OrderedDict
-from collections.abc import Generator
+from collections.abc import Callable, Generator
 from functools import cache
 from pathlib import Path
 from threading import Lock
@@ -27,7 +28,7 @@ from yaml.dumper import Dumper
 
 from etl.config import TLS_VERIFY
 from etl.http import session as http_session
-from etl.paths import BASE_DIR, SNAPSHOTS_DIR
+from etl.paths import BASE_DIR, CHECKSUM_CACHE_FILE, SNAPSHOTS_DIR
 
 log = structlog.get_logger()
 
@@ -60,7 +61,137 @@ class RuntimeCache:
         self._locks = {}
 
 
-CACHE_CHECKSUM_FILE = RuntimeCache()
+class ChecksumCache:
+    """Checksums of files persisted on disk across ETL runs.
+
+    Entries are keyed by file path and kind of checksum, and are valid for as long as the file's size,
+    mtime and inode stay the same. This lets dirty-step detection skip re-reading thousands of unchanged
+    step files, snapshots and dataset indexes on every run. We need locks because we usually run it in
+    threads.
+    """
+
+    VERSION = 1
+
+    # Entries for files modified this recently are not persisted: another modification within the
+    # resolution of the filesystem's mtime could otherwise go unnoticed in the next run
+    RACY_SECONDS = 2
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._entries: dict[str, list[Any]] | None = None
+        self._modified = False
+        self._lock = Lock()
+
+    def _read_entries(self) -> dict[str, list[Any]]:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            return {}
+        return data.get("entries", {})
+
+    def _load(self) -> dict[str, list[Any]]:
+        if self._entries is None:
+            self._entries = self._read_entries()
+        return self._entries
+
+    def get(self, filename: str | Path, compute: Callable[[str], Any], kind: str = "md5") -> Any:
+        """Return the checksum of the file, computing it with `compute` if the file changed since it was cached."""
+        filename = filename.as_posix() if isinstance(filename, Path) else filename
+        st = os.stat(filename)
+        signature = [st.st_size, st.st_mtime_ns, st.st_ino]
+        key = f"{kind}:{filename}"
+
+        with self._lock:
+            entry = self._load().get(key)
+        if entry is not None and entry[:3] == signature:
+            return entry[3]
+
+        value = compute(filename)
+        with self._lock:
+            self._load()[key] = signature + [value]
+            self._modified = True
+        return value
+
+    def set(self, filename: str | Path, value: Any, kind: str = "md5") -> None:
+        """Record a checksum of the file computed elsewhere, e.g. while downloading it."""
+        filename = filename.as_posix() if isinstance(filename, Path) else filename
+        st = os.stat(filename)
+        with self._lock:
+            self._load()[f"{kind}:{filename}"] = [st.st_size, st.st_mtime_ns, st.st_ino, value]
+            self._modified = True
+
+    def get_many(
+        self,
+        filenames: list[str | Path],
+        compute: Callable[[str], Any],
+        kind: str = "md5",
+        workers: int | None = None,
+    ) -> dict[str, Any]:
+        """Return checksums of many files, computing the ones that changed since they were cached in a process pool.
+
+        `compute` must be picklable (i.e. a module-level function).
+        """
+        values: dict[str, Any] = {}
+        missing: dict[str, list[int]] = {}
+        with self._lock:
+            entries = self._load()
+            for filename in filenames:
+                filename = filename.as_posix() if isinstance(filename, Path) else filename
+                st = os.stat(filename)
+                signature = [st.st_size, st.st_mtime_ns, st.st_ino]
+                entry = entries.get(f"{kind}:{filename}")
+                if entry is not None and entry[:3] == signature:
+                    values[filename] = entry[3]
+                else:
+                    missing[filename] = signature
+
+        if not missing:
+            return values
+
+        if len(missing) == 1 or workers == 1:
+            computed = {filename: compute(filename) for filename in missing}
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                computed = dict(zip(missing, executor.map(compute, missing, chunksize=16)))
+
+        with self._lock:
+            entries = self._load()
+            for filename, value in computed.items():
+                entries[f"{kind}:{filename}"] = missing[filename] + [value]
+            self._modified = True
+
+        values.update(computed)
+        return values
+
+    def save(self) -> None:
+        """Persist new entries, merging them with entries saved by other processes in the meantime."""
+        with self._lock:
+            if not self._modified or self._entries is None or not self.path.parent.exists():
+                return
+
+            racy_after = (time.time() - self.RACY_SECONDS) * 1e9
+            entries = self._read_entries()
+            entries.update({k: v for k, v in self._entries.items() if v[1] < racy_after})
+
+            # write to a temporary file first, so that concurrent ETL runs never read a partial file
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({"version": self.VERSION, "entries": entries}, f)
+            os.replace(tmp_path, self.path)
+            self._modified = False
+
+    def clear(self) -> None:
+        """Forget all cached checksums, both in memory and on disk."""
+        with self._lock:
+            self._entries = {}
+            self._modified = False
+            self.path.unlink(missing_ok=True)
+
+
+CHECKSUM_CACHE = ChecksumCache(CHECKSUM_CACHE_FILE)
 
 
 def checksum_str(s: str) -> str:
@@ -93,30 +224,29 @@ def checksum_file_nocache(filename: str | Path) -> str:
     return _hash.hexdigest()
 
 
-def checksum_file(filename: str | Path) -> str:
-    "Return the md5 hex digest of the file contents."
-    if isinstance(filename, Path):
-        filename = filename.as_posix()
+def _checksum_file_contents(filename: str) -> str:
+    # Special case for regions.yml, we want to ignore the 'aliases' key
+    if os.path.basename(filename) == "regions.yml":
+        with open(filename) as f:
+            s = f.read()
+
+        # Regular expression to match the 'aliases' and its list
+        regex_pattern = r"  aliases:\n(\s+-[^\n]*\n?)*"
+        s = re.sub(regex_pattern, "", s)
 
-    mtime = os.path.getmtime(filename)
-    key = f"{filename}-{mtime}"
+        return checksum_str(s.strip())
+    else:
+        return checksum_file_nocache(filename)
 
-    if filename not in CACHE_CHECKSUM_FILE:
-        # Special case for regions.yml, we want to ignore the 'aliases' key
-        if os.path.basename(filename) == "regions.yml":
-            with open(filename) as f:
-                s = f.read()
 
-            # Regular expression to match the 'aliases' and its list
-            regex_pattern = r"  aliases:\n(\s+-[^\n]*\n?)*"
-            s = re.sub(regex_pattern, "", s)
+def checksum_file(filename: str | Path) -> str:
+    "Return the md5 hex digest of the file contents, cached on disk until the file changes."
+    return CHECKSUM_CACHE.get(filename, _checksum_file_contents)
 
-            checksum = checksum_str(s.strip())
-        else:
-            checksum = checksum_file_nocache(filename)
-        CACHE_CHECKSUM_FILE.add(key, checksum)
 
-    return CACHE_CHECKSUM_FILE[key]
+def checksum_files(filenames: list[str | Path], workers: int | None = None) -> dict[str, str]:
+    """Return the md5 hex digests of many files keyed by their path, hashing files that are not cached in parallel."""
+    return CHECKSUM_CACHE.get_many(filenames, _checksum_file_contents, workers=workers)
 
 
 def checksum_df(df: pd.DataFrame, index=True) -> str:
@@ -0,0 +1,79 @@
+"""Fuzzy matching of strings against a fixed set of choices.
+
+Scores of all pairs of queries and choices are computed in bulk with `rapidfuzz.process.cdist` (across worker threads)
+instead of calling a scorer once per pair in Python, and only the best choices of each query are sorted.
+"""
+
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+
+class FuzzyIndex:
+    """Index of choices to match queries against.
+
+    Choices are normalised with `processor` once, when building the index, so that the index can be reused for many
+    queries. Scores are those of `scorer` (0-100), as in `rapidfuzz.process.extract`.
+    """
+
+    def __init__(
+        self,
+        choices: Iterable[str],
+        scorer: Callable[..., float] = fuzz.WRatio,
+        processor: Callable[[Any], str] | None = None,
+        workers: int = -1,
+    ) -> None:
+        self.choices = list(choices)
+        self.scorer = scorer
+        self.processor = processor
+        self.workers = workers
+        self._processed_choices = self._process(self.choices)
+
+    def __len__(self) -> int:
+        return len(self.choices)
+
+    def _process(self, strings: Iterable[Any]) -> list[Any]:
+        if self.processor is None:
+            return list(strings)
+        return [self.processor(s) for s in strings]
+
+    def scores(self, queries: Sequence[Any]) -> np.ndarray:
+        """Return matrix of scores with a row for each query and a column for each choice."""
+        return process.cdist(
+            self._process(queries),
+            self._processed_choices,
+            scorer=self.scorer,
+            dtype=np.float64,
+            workers=self.workers,
+        )
+
+
+def top_k(scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return positions (columns) of the `k` highest scores of each row, and the scores.
+
+    Both are sorted by descending score, ties by position (like `rapidfuzz.process.extract`). Only the `k` best scores
+    of each row are sorted, so this is much faster than sorting all of them when `k` is small.
+    """
+    n_rows, n_columns = scores.shape
+    k = max(min(k, n_columns), 0)
+    if k == 0:
+        return np.empty((n_rows, 0), dtype=np.intp), np.empty((n_rows, 0), dtype=scores.dtype)
+
+    if k < n_columns:
+        # k-th highest score of each row
+        threshold = -np.partition(-scores, k - 1, axis=1)[:, [k - 1]]
+        above = scores > threshold
+        # scores equal to the threshold fill the remaining places, those at the first positions are kept
+        ties = scores == threshold
+        n_ties = k - above.sum(axis=1, keepdims=True)
+        selected = above | (ties & (np.cumsum(ties, axis=1) <= n_ties))
+        # exactly k columns are selected in each row, in increasing order
+        positions = np.nonzero(selected)[1].reshape(n_rows, k)
+    else:
+        positions = np.broadcast_to(np.arange(n_columns), scores.shape)
+
+    selected_scores = np.take_along_axis(scores, positions, axis=1)
+    order = np.argsort(-selected_scores, axis=1, kind="stable")
+    return np.take_along_axis(positions, order, axis=1), np.take_along_axis(selected_scores, order, axis=1)
@@ -44,8 +44,6 @@ def _yield_wide_table(
     :param trim_long_short_name: If true and there's a short name longer than 255 characters, we trim it to 240 characters
         and add a hash from its short name to the end to make it unique.
     """
-    table = table.copy(deep=False)
-
     # Validation
     if "year" not in table.primary_key:
         raise Exception("Table is missing `year` primary key")
@@ -60,50 +58,44 @@ def _yield_wide_table(
         raise Exception("Columns with missing units: " + ", ".join(cols_with_none_units))
 
     dim_names = [k for k in table.primary_key if k not in ("year", "entityId", "entityCode", "entityName")]
+    columns_meta = {column: table[column].metadata for column in table.columns}
 
     # Keep only entity_id and year in index
-    table = table.reset_index(level=dim_names)
-
+    df = pd.DataFrame(table, copy=False)
     if dim_names:
-        # `dropna=False` makes sure we don't drop NaN values from index
-        grouped = table.groupby(
-            dim_names if len(dim_names) > 1 else dim_names[0], as_index=False, observed=True, dropna=False
-        )
+        dims = df.index.to_frame(index=False)[dim_names]
+        # Sort rows by dimensions once, so that every combination of dimensions is a slice of consecutive rows
+        order, boundaries = _sort_by_dimensions(dims)
+        df = df.take(order) if (np.diff(order) < 0).any() else df.copy(deep=False)
+        df.index = df.index.droplevel(dim_names)
+        dim_values_of_groups = dims.iloc[order[boundaries[:-1]]].itertuples(index=False, name=None)
     else:
         # a situation when there's only year and entity_id in index with no additional dimensions
-        grouped = [([], table)]
+        boundaries = np.array([0, len(df)])
+        dim_values_of_groups = [()]
+    df_notna = df.notna().to_numpy()
 
-    for dim_values, table_to_yield in grouped:
-        if not isinstance(dim_values, tuple):
-            dim_values = (dim_values,)
-
-        # Exclude dimensions
-        table_to_yield = table_to_yield[[c for c in table_to_yield.columns if c not in dim_names]]
+    for start, stop, dim_values in zip(boundaries[:-1], boundaries[1:], dim_values_of_groups):
+        # Rows of this combination of dimensions (without copying them)
+        df_to_yield = df.iloc[start:stop]
 
         # Filter NaN values from dimensions and return dictionary
         dim_dict = _create_dim_dict(dim_names, dim_values)  # ty: ignore
 
         # Now iterate over every column in the original dataset and export the
         # subset of data that we prepared above
-        for column in table_to_yield.columns:
+        for i, column in enumerate(df_to_yield.columns):
+            values = df_to_yield[column]
+            notna = df_notna[start:stop, i]
+
             # If all values are null, skip variable
-            if table_to_yield[column].isnull().all():
+            if not notna.any():
                 if warn_null_variables:
                     log.warning("yield_wide_table.null_variable", column=column, dim_dict=dim_dict)
                 continue
 
-            # Safety check to see if the metadata is still intact
-            assert table_to_yield[column].metadata.unit is not None, (
-                f"Unit for column {column} should not be None here!"
-            )
-
-            # Select only one column and dimensions for performance
-            # Silence - DeprecationWarning: Passing a BlockManager to Table is deprecated and will raise
-            # in a future version. Use public APIs instead.
-            with warnings.ignore_warnings([DeprecationWarning]):
-                mask = table_to_yield[column].notna() if na_action == "drop" else slice(None)
-                # NOTE: this copy is important, otherwise we'd ruin metadata
-                tab = table_to_yield.loc[mask, [column]].copy(deep=False)
+            if na_action == "drop" and not notna.all():
+                values = values[notna]
 
             # Create underscored name of a new column from the combination of column and dimensions
             short_name = _underscore_column_and_dimensions(
@@ -112,17 +104,40 @@ def _yield_wide_table(
                 trim_long_short_name=trim_long_short_name,
             )
 
-            # set new metadata with dimensions
-            tab.metadata.short_name = short_name
-            tab.rename(columns={column: short_name}, inplace=True)
+            # set new metadata with dimensions (nested metadata of the table is shared with the input table)
+            metadata = table.metadata.copy(deep=False)
+            metadata.short_name = short_name
+            tab = Table(values.to_frame(short_name), metadata=metadata)
 
-            tab[short_name].metadata = _metadata_for_dimensions(  # ty: ignore[unresolved-attribute]
-                tab[short_name].metadata, dim_dict, column
-            )
+            # NOTE: this copy is important, otherwise we'd ruin metadata of the input table
+            tab[short_name].metadata = _metadata_for_dimensions(columns_meta[column].copy(), dim_dict, column)
 
             yield tab
 
 
+def _sort_by_dimensions(dims: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Return positions of rows sorted by dimensions and boundaries of groups of rows with the same dimensions.
+
+    Groups are sorted like in `groupby(sort=True, observed=True, dropna=False)`, i.e. by categories of categorical
+    dimensions and with missing values last, and rows of each group keep their order.
+    """
+    codes = []
+    for dim in dims.columns:
+        if isinstance(dims[dim].dtype, pd.CategoricalDtype):
+            dim_codes, n_values = dims[dim].cat.codes.to_numpy(), len(dims[dim].cat.categories)
+        else:
+            dim_codes, uniques = pd.factorize(dims[dim], sort=True)
+            n_values = len(uniques)
+        # Missing values have code -1, sort them last
+        codes.append(np.where(dim_codes == -1, n_values, dim_codes))
+
+    order = np.lexsort(codes[::-1])
+    sorted_codes = np.stack(codes)[:, order]
+    changes = np.flatnonzero((sorted_codes[:, 1:] != sorted_codes[:, :-1]).any(axis=0)) + 1
+    boundaries = np.concatenate([[0], changes, [len(dims)]]) if len(dims) else np.array([0])
+    return order, boundaries
+
+
 def _metadata_for_dimensions(meta: catalog.VariableMeta, dim_dict: dict[str, Any], column: str) -> catalog.VariableMeta:
     """Add dimensions to metadata and expand Jinja in metadata fields."""
     # Add info about dimensions to metadata
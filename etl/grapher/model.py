@@ -1399,22 +1399,32 @@ class Variable(Base):
     def s3_data_path(self, typ: S3_PATH_TYP = "s3") -> str:
         """Path to S3 with data in JSON format for Grapher. Typically
         s3://owid-api/v1/indicators/123.data.json."""
-        if typ == "s3":
-            return f"{config.BAKED_VARIABLES_PATH}/{self.id}.data.json"
-        elif typ == "http":
-            return f"{config.DATA_API_URL}/{self.id}.data.json"
-        else:
-            raise NotImplementedError()
+        return self.s3_data_path_from_id(self.id, typ)
 
     def s3_metadata_path(self, typ: S3_PATH_TYP = "s3") -> str:
         """Path to S3 with metadata in JSON format for Grapher. Typically
         s3://owid-api/v1/indicators/123.metadata.json or
         s3://owid-api-staging/name/v1/indicators/123.metadata.json
         ."""
+        return self.s3_metadata_path_from_id(self.id, typ)
+
+    @staticmethod
+    def s3_data_path_from_id(variable_id: int, typ: S3_PATH_TYP = "s3") -> str:
+        """Same as `s3_data_path`, for a variable that hasn't been loaded from the DB."""
+        if typ == "s3":
+            return f"{config.BAKED_VARIABLES_PATH}/{variable_id}.data.json"
+        elif typ == "http":
+            return f"{config.DATA_API_URL}/{variable_id}.data.json"
+        else:
+            raise NotImplementedError()
+
+    @staticmethod
+    def s3_metadata_path_from_id(variable_id: int, typ: S3_PATH_TYP = "s3") -> str:
+        """Same as `s3_metadata_path`, for a variable that hasn't been loaded from the DB."""
         if typ == "s3":
-            return f"{config.BAKED_VARIABLES_PATH}/{self.id}.metadata.json"
+            return f"{config.BAKED_VARIABLES_PATH}/{variable_id}.metadata.json"
         elif typ == "http":
-            return f"{config.DATA_API_URL}/{self.id}.metadata.json"
+            return f"{config.DATA_API_URL}/{variable_id}.metadata.json"
         else:
             raise NotImplementedError()
 
@@ -13,6 +13,7 @@ import datetime
 import json
 import os
 import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from typing import Any, cast
 
@@ -172,6 +173,18 @@ def load_dataset_variables(dataset_id: int, engine: Engine) -> dict[int | str, A
     )
 
 
+@dataclass
+class VariableUpsertResult:
+    variable_id: int
+    # Data of the variable (in the format of `upsert_table`), needed to build its metadata JSON. Only kept if
+    # `metadata_changed`, so that data of a whole table isn't held in memory until the batch is uploaded.
+    df: pd.DataFrame | None
+    checksum_data: str
+    checksum_metadata: str
+    # True if the metadata JSON of the variable has to be (re)uploaded.
+    metadata_changed: bool
+
+
 def upsert_table(
     engine: Engine,
     admin_api: AdminAPI,
@@ -182,10 +195,14 @@ def upsert_table(
     db_origins: list[gm.Origin],
     dimensions: gm.Dimensions | None = None,
     verbose: bool = True,
-) -> None:
+) -> VariableUpsertResult | None:
     """This function is used to put one ready to go formatted Table (i.e.
     in the format (year, entityId, value)) into mysql. The metadata
     of the variable is used to fill the required fields.
+
+    Data is uploaded to R2 right away. Uploading metadata and saving the new checksums is done for
+    a batch of variables at once with `upload_metadata_and_save_checksums`, using the returned result.
+    Returns None if neither data nor metadata have changed.
     """
 
     # We sometimes get a warning, but it's unclear where it is coming from
@@ -204,6 +221,8 @@ def upsert_table(
     # NOTE: we could make the code more efficient if we didn't convert `value` to string
     # TODO: can we avoid setting & resetting index back and forth?
     df = table.reset_index().rename(columns={column_name: "value"})
+    # Keep the original values, which are faster to serialize than strings
+    values = df["value"]
     df["value"] = df["value"].astype("string")
 
     checksum_data = calculate_checksum_data(df)
@@ -217,11 +236,12 @@ def upsert_table(
     if checksums.get("dataChecksum") == checksum_data and checksums.get("metadataChecksum") == checksum_metadata:
         if verbose:
             log.debug("upsert_table.skipped_no_changes", size=len(df), catalog_path=catalog_path)
-        return
+        return None
 
-    with Session(engine) as session:
-        # Upsert & upload metadata
-        if checksums.get("metadataChecksum") != checksum_metadata:
+    # Upsert metadata
+    metadata_changed = checksums.get("metadataChecksum") != checksum_metadata
+    if metadata_changed:
+        with Session(engine) as session:
             db_variable = upsert_metadata(
                 session=session,
                 df=df,
@@ -233,42 +253,77 @@ def upsert_table(
                 dimensions=dimensions,
                 admin_api=admin_api,
             )
-            upload_metadata(session, db_variable.id, df, db_variable.s3_metadata_path())
-        else:
-            db_variable = gm.Variable.from_catalog_path(session, catalog_path)
+            variable_id = db_variable.id
+    else:
+        # The variable already exists, and its ID was loaded together with its checksums.
+        variable_id = checksums["id"]
+
+    # Upload data
+    if checksums.get("dataChecksum") != checksum_data:
+        upload_data(df, gm.Variable.s3_data_path_from_id(variable_id), values=values)
+
+    if verbose:
+        log.info("upsert_table.uploaded_to_s3", size=len(df), indicator=CatalogPath.from_str(catalog_path).variable)
+
+    return VariableUpsertResult(
+        variable_id=variable_id,
+        df=df if metadata_changed else None,
+        checksum_data=checksum_data,
+        checksum_metadata=checksum_metadata,
+        metadata_changed=metadata_changed,
+    )
 
-        # Upload data
-        if checksums.get("dataChecksum") != checksum_data:
-            upload_data(df, db_variable.s3_data_path())
 
-        # Update checksums
-        db_variable.dataChecksum = checksum_data
-        db_variable.metadataChecksum = checksum_metadata
+def upload_metadata_and_save_checksums(engine: Engine, results: list[VariableUpsertResult], workers: int = 1) -> None:
+    """Upload metadata of a batch of upserted variables to R2 and save their new checksums.
 
-        # Commit new checksums
-        session.add(db_variable)
-        session.commit()
+    Metadata of all variables is loaded from MySQL with a few bulk queries, and checksums are
+    written with a single bulk UPDATE once all uploads have succeeded, so that a failed upload
+    is retried on the next run.
+    """
+    if not results:
+        return
 
-        if verbose:
-            log.info("upsert_table.uploaded_to_s3", size=len(df), indicator=CatalogPath.from_str(catalog_path).variable)
+    with Session(engine) as session:
+        # get metadata from MySQL
+        vars_metadata = dm.variables_metadata(
+            session, {result.variable_id: result.df for result in results if result.df is not None}
+        )
+
+        # upload metadata to R2
+        with ThreadPoolExecutor(max_workers=workers) as thread_pool:
+            futures = [
+                thread_pool.submit(
+                    upload_gzip_string,
+                    json.dumps(var_metadata, default=str),
+                    gm.Variable.s3_metadata_path_from_id(variable_id),
+                )
+                for variable_id, var_metadata in vars_metadata.items()
+            ]
+            [future.result() for future in as_completed(futures)]
+
+        # Update checksums
+        session.execute(
+            update(gm.Variable),
+            [
+                {
+                    "id": result.variable_id,
+                    "dataChecksum": result.checksum_data,
+                    "metadataChecksum": result.checksum_metadata,
+                }
+                for result in results
+            ],
+        )
+        session.commit()
 
 
-def upload_data(df: pd.DataFrame, s3_data_path: str) -> None:
+def upload_data(df: pd.DataFrame, s3_data_path: str, values: pd.Series | None = None) -> None:
     # upload data to R2
-    var_data = dm.variable_data(df)
+    var_data = dm.variable_data(df, values=values)
     var_data_str = json.dumps(var_data, default=str)
     upload_gzip_string(var_data_str, s3_data_path)
 
 
-def upload_metadata(session: Session, variable_id: int, df: pd.DataFrame, s3_metadata_path: str) -> None:
-    # get metadata from MySQL
-    var_metadata = dm.variable_metadata(session, variable_id, df)
-
-    # upload metadata to R2
-    var_metadata_str = json.dumps(var_metadata, default=str)
-    upload_gzip_string(var_metadata_str, s3_metadata_path)
-
-
 def upsert_origins(session: Session, table: Table) -> dict[catalog.Origin, gm.Origin]:
     db_origins = {}
     for col in table.columns:
@@ -326,7 +381,7 @@ def upsert_metadata(
     )
     session.add(db_variable)
 
-    # we need to commit changes because `dm.variable_metadata` pulls all data from MySQL
+    # we need to commit changes because `dm.variables_metadata` pulls all data from MySQL
     # and sends it to R2
     # NOTE: we could optimize this by evading pulling from MySQL and instead constructing JSON files from objects
     #   we have available
@@ -3,6 +3,7 @@
 #  etl
 #
 
+import functools
 import json
 import re
 from collections import defaultdict
@@ -15,10 +16,10 @@ import pandas as pd
 import questionary
 from IPython.display import display
 from owid.catalog import Dataset, Table, Variable
-from rapidfuzz import process
 from rich_click.rich_command import RichCommand
 
 from etl.exceptions import RegionDatasetNotFound
+from etl.fuzzy import FuzzyIndex, top_k
 from etl.helpers import PathFinder
 from etl.paths import LATEST_REGIONS_DATASET_PATH, LATEST_REGIONS_YML
 
@@ -189,22 +190,19 @@ class CountryRegionMapper:
     def __getitem__(self, key: str) -> str:
         return self.aliases[key.lower()]
 
+    @functools.cached_property
+    def _aliases_index(self) -> FuzzyIndex:
+        return FuzzyIndex(self.aliases.keys())
+
     def suggestions(self, region: str, institution: str | None = None, num_suggestions: int = 5) -> list[str]:
-        if institution is None:
-            # get the aliases which score highest on fuzzy matching
-            results = process.extract(region.lower(), self.aliases.keys(), limit=1000)
-        else:
+        queries = [region.lower()]
+        if institution is not None:
             # If an institution is given, try fuzzy matching both the region, and the "Region (Institution)".
-            region_institution = f"{region} ({institution})"
-            # Search for both region and "region (institution)"
-            results_region = process.extract(region.lower(), self.aliases.keys(), limit=500)
-            results_region_institution = process.extract(region_institution.lower(), self.aliases.keys(), limit=500)
-            # Combine results, keeping best score for each match
-            seen = {}
-            for name, score, idx in results_region + results_region_institution:
-                if name not in seen or score > seen[name][1]:
-                    seen[name] = (name, score, idx)
-            results = sorted(seen.values(), key=lambda x: x[1], reverse=True)[:1000]
+            queries.append(f"{region} ({institution})".lower())
+        # get the aliases which score highest on fuzzy matching (keeping best score of each alias over all queries)
+        scores = self._aliases_index.scores(queries).max(axis=0, keepdims=True)
+        positions, scores = top_k(scores, 1000)
+        results = [(self._aliases_index.choices[i], score) for i, score in zip(positions[0], scores[0])]
 
         if not results:
             return []
@@ -212,7 +210,7 @@ class CountryRegionMapper:
         # some of these aliases will actually be for the same country/region,
         # just take the best score for each match
         best: defaultdict[str, int] = defaultdict(int)
-        for match, score, _ in results:
+        for match, score in results:
             key = self.aliases[match]
             best[key] = max(best[key], int(score))
 
@@ -22,6 +22,15 @@ DATA_MEADOW_DIR = DATA_DIR / "meadow"
 DATA_GARDEN_DIR = DATA_DIR / "garden"
 DATA_GRAPHER_DIR = DATA_DIR / "grapher"
 
+# Checksums of step files, snapshots and datasets persisted across ETL runs
+CHECKSUM_CACHE_FILE = DATA_DIR / ".checksum_cache.json"
+
+# Parsed DAG files persisted across ETL runs
+DAG_CACHE_FILE = DATA_DIR / ".dag_cache.pkl"
+
+# Snapshot archives extracted by `Snapshot.extracted()`, one folder per md5 of the archive
+SNAPSHOTS_EXTRACTED_DIR = DATA_DIR / ".snapshots_extracted"
+
 # Export folder
 EXPORT_DIR = BASE_DIR / "export"
 EXPORT_MDIMS_DIR = EXPORT_DIR / "multidim"
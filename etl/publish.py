@@ -3,7 +3,9 @@
 #  etl
 #
 
+import bisect
 import concurrent.futures
+import hashlib
 import re
 import sys
 from collections.abc import Iterable, Iterator
@@ -17,7 +19,7 @@ import rich_click as click
 from botocore.client import ClientError
 from owid.catalog.api.legacy import CHANNEL, LocalCatalog
 from owid.catalog.api.utils import INDEX_FORMATS
-from owid.catalog.core.datasets import FileFormat
+from owid.catalog.core.datasets import Dataset, FileFormat
 from owid.catalog.s3_utils import connect_r2
 
 from etl import config, files
@@ -188,21 +190,39 @@ def sync_datasets(
 
     to_delete = set(existing)
     local = LocalCatalog(catalog)
-    print("Datasets to sync:")
-    for ds in local.iter_datasets(channel):
-        # ignore datasets with no tables
-        if len(ds._data_files) == 0:
-            continue
 
+    # ignore datasets with no tables
+    datasets = [ds for ds in local.iter_datasets(channel) if len(ds._data_files) > 0]
+
+    # hash files of all datasets up front in a process pool, checksums are cached on disk by size and mtime
+    # and reused both for dataset checksums and for comparing individual files with remote objects
+    files.checksum_files([f for ds in datasets for f in files.walk(Path(ds.path))])
+
+    to_sync = []
+    for ds in datasets:
         path = Path(ds.path).relative_to(catalog).as_posix()
         if path in to_delete:
             to_delete.remove(path)
 
         published_checksum = existing.get(path)
-        if published_checksum == ds.checksum():
+        if published_checksum == dataset_checksum(ds):
             continue
 
-        print("-", path, "(private)" if not ds.metadata.is_public else "")
+        to_sync.append((path, ds.metadata.is_public))
+
+    files.CHECKSUM_CACHE.save()
+
+    # list remote objects of the whole channel once instead of listing them for every dataset
+    remote_objects = None
+    remote_objects_private = None
+    if to_sync and not dry_run:
+        remote_objects = S3Listing(walk_s3(s3, bucket, f"{channel}/"))
+        if private_bucket and not all(is_public for _, is_public in to_sync):
+            remote_objects_private = S3Listing(walk_s3(s3, private_bucket, f"{channel}/"))
+
+    print("Datasets to sync:")
+    for path, is_public in to_sync:
+        print("-", path, "(private)" if not is_public else "")
         if not dry_run:
             sync_folder(
                 s3,
@@ -210,8 +230,10 @@ def sync_datasets(
                 catalog,
                 catalog / path,
                 path,
-                public=ds.metadata.is_public,
+                public=is_public,
                 private_bucket=private_bucket,
+                remote_objects=remote_objects,
+                remote_objects_private=remote_objects_private,
             )
 
     if delete_datasets:
@@ -222,6 +244,36 @@ def sync_datasets(
                 delete_dataset(s3, bucket, path)
 
 
+def dataset_checksum(ds: Dataset) -> str:
+    """Checksum of all data and metadata in the dataset, same as `Dataset.checksum`, but using file checksums
+    cached by `files.checksum_file`."""
+    _hash = hashlib.md5()
+    _hash.update(bytes.fromhex(files.checksum_file(ds._index_file)))
+
+    for data_file in ds._data_files:
+        _hash.update(bytes.fromhex(files.checksum_file(data_file)))
+
+        metadata_file = Path(data_file).with_suffix(".meta.json").as_posix()
+        _hash.update(bytes.fromhex(files.checksum_file(metadata_file)))
+
+    return _hash.hexdigest()
+
+
+class S3Listing:
+    """Objects listed from a bucket, with fast lookup of objects under a given prefix."""
+
+    def __init__(self, objects: Iterable[dict[str, Any]]) -> None:
+        self.objects = sorted(objects, key=lambda o: o["Key"])
+        self.keys = [o["Key"] for o in self.objects]
+
+    def with_prefix(self, prefix: str) -> list[dict[str, Any]]:
+        start = bisect.bisect_left(self.keys, prefix)
+        end = start
+        while end < len(self.keys) and self.keys[end].startswith(prefix):
+            end += 1
+        return self.objects[start:end]
+
+
 def is_metadata_file(filename: str) -> bool:
     """Check if a file is a metadata file (should stay in public bucket for discoverability)."""
     return filename.endswith(".meta.json") or filename.endswith("index.json")
@@ -236,6 +288,8 @@ def sync_folder(
     delete: bool = True,
     public: bool = True,
     private_bucket: str | None = None,
+    remote_objects: S3Listing | None = None,
+    remote_objects_private: S3Listing | None = None,
 ) -> None:
     """
     Perform a content-based sync of a local folder with a "folder" on an S3 bucket,
@@ -244,18 +298,25 @@ def sync_folder(
     For private datasets (public=False):
     - Metadata files (.meta.json, index.json) go to the public bucket for discoverability
     - Data files (.feather, .parquet, .csv) go to the private bucket
+
+    Remote objects are listed from the buckets unless they are given in `remote_objects` and
+    `remote_objects_private`.
     """
     # make sure we're not syncing other folders with the same prefix
     if not dest_path.endswith("/"):
         dest_path += "/"
 
     # For private datasets, we need to check both buckets for existing files
-    existing = {o["Key"]: object_md5(s3, bucket, o["Key"], o) for o in walk_s3(s3, bucket, dest_path)}
+    objs = remote_objects.with_prefix(dest_path) if remote_objects else walk_s3(s3, bucket, dest_path)
+    existing = {o["Key"]: object_md5(s3, bucket, o["Key"], o) for o in objs}
     existing_private: dict[str, str | None] = {}
     if private_bucket and not public:
-        existing_private = {
-            o["Key"]: object_md5(s3, private_bucket, o["Key"], o) for o in walk_s3(s3, private_bucket, dest_path)
-        }
+        objs = (
+            remote_objects_private.with_prefix(dest_path)
+            if remote_objects_private
+            else walk_s3(s3, private_bucket, dest_path)
+        )
+        existing_private = {o["Key"]: object_md5(s3, private_bucket, o["Key"], o) for o in objs}
 
     # some datasets like `open_numbers/open_numbers/latest/gapminder__gapminder_world`
     # have huge number of tables, upload them in parallel
@@ -1,11 +1,17 @@
+import concurrent.futures
+import fcntl
+import os
 import re
+import shutil
+import tarfile
 import tempfile
 import time
+import zipfile
 from collections.abc import Callable, Generator, Iterator
-from contextlib import contextmanager
+from contextlib import ExitStack, contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, cast
+from typing import IO, Any, cast
 
 import owid.catalog.core.processing as pr
 import pandas as pd
@@ -29,7 +35,15 @@ from tenacity import Retrying, retry_if_exception_type, stop_after_attempt, wait
 
 from etl import config, download_helpers, paths
 from etl.download_helpers import DownloadCorrupted
-from etl.files import checksum_file, ruamel_dump, ruamel_load, yaml_dump, yaml_load
+from etl.files import (
+    CHECKSUM_CACHE,
+    checksum_file,
+    checksum_file_nocache,
+    ruamel_dump,
+    ruamel_load,
+    yaml_dump,
+    yaml_load,
+)
 
 log = structlog.get_logger()
 
@@ -148,9 +162,15 @@ class SnapshotArchive:
         """
         file_path = self._path / filename
         if not file_path.is_file():
-            available = "\n".join(f"  - {f}" for f in self.files)
-            raise FileNotFoundError(f"File '{filename}' not found in archive.\nAvailable files:\n{available}")
+            self._raise_not_found(filename)
+
+        return self._read_file(file_path, filename, force_extension=force_extension, **kwargs)
 
+    def _raise_not_found(self, filename: str) -> None:
+        available = "\n".join(f"  - {f}" for f in self.files)
+        raise FileNotFoundError(f"File '{filename}' not found in archive.\nAvailable files:\n{available}")
+
+    def _read_file(self, file_path: Path, filename: str, force_extension: str | None = None, **kwargs) -> Table:
         if force_extension is None:
             extension = filename.split(".")[-1]
         else:
@@ -165,6 +185,195 @@ class SnapshotArchive:
         )
 
 
+class SnapshotArchiveLazy(SnapshotArchive):
+    """Snapshot archive whose files are read straight out of a zip or tar file.
+
+    It has the same interface as `SnapshotArchive`, but only the files that are read get decompressed, which is
+    much faster for large archives of which only a few files are needed. Accessing `path` extracts the whole
+    archive.
+
+    Example:
+        ```python
+        with snap.extracted(lazy=True) as archive:
+            tb = archive.read("data/file1.csv")
+        ```
+    """
+
+    def __init__(self, snapshot: "Snapshot", archive_path: Path, extract: Callable[[], Path], stack: ExitStack):
+        self._snapshot = snapshot
+        self._extract = extract
+        self._path_extracted: Path | None = None
+
+        self._zip: zipfile.ZipFile | None = None
+        self._tar: tarfile.TarFile | None = None
+        if zipfile.is_zipfile(archive_path):
+            self._zip = stack.enter_context(zipfile.ZipFile(archive_path))
+            names = [i.filename for i in self._zip.infolist() if not i.is_dir()]
+        else:
+            self._tar = stack.enter_context(tarfile.open(archive_path))
+            names = [m.name for m in self._tar.getmembers() if m.isfile()]
+
+        # map normalised paths (as listed by `SnapshotArchive.files`) to names of members in the archive
+        self._members = {os.path.normpath(name): name for name in names}
+        self._files = sorted(self._members)
+
+    @staticmethod
+    def is_supported(archive_path: Path) -> bool:
+        return zipfile.is_zipfile(archive_path) or tarfile.is_tarfile(archive_path)
+
+    @property
+    def path(self) -> Path:
+        """Root path of extracted archive, the whole archive is extracted on first access."""
+        if self._path_extracted is None:
+            self._path_extracted = self._extract()
+        return self._path_extracted
+
+    @property
+    def files(self) -> list[str]:
+        """List all files in the archive (relative paths, sorted)."""
+        return cast(list[str], self._files)
+
+    def glob(self, pattern: str) -> list[str]:
+        """Find files matching a glob pattern, with the same semantics as `SnapshotArchive.glob`."""
+        regex = re.compile(_glob_to_regex(pattern))
+        return [f for f in self.files if regex.fullmatch(f)]
+
+    def __contains__(self, filename: str) -> bool:
+        return os.path.normpath(filename) in self._members
+
+    def read(self, filename: str, force_extension: str | None = None, **kwargs) -> Table:
+        """Read a file from the archive, decompressing only that file."""
+        if filename not in self:
+            self._raise_not_found(filename)
+
+        member = self._members[os.path.normpath(filename)]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = Path(temp_dir) / Path(member).name
+            if self._zip is not None:
+                source = self._zip.open(member)
+            else:
+                source = cast(IO[bytes], cast(tarfile.TarFile, self._tar).extractfile(member))
+            with source, open(file_path, "wb") as f:
+                shutil.copyfileobj(source, f, length=2**20)
+
+            return self._read_file(file_path, filename, force_extension=force_extension, **kwargs)
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a glob pattern relative to the root of an archive to a regex, where `**` matches any number of
+    folders and `*` does not match `/`."""
+    parts = []
+    for part in pattern.split("/"):
+        if part == "**":
+            parts.append("(?:[^/]+/)*")
+            continue
+        regex = ""
+        i = 0
+        while i < len(part):
+            c = part[i]
+            if c == "*":
+                regex += "[^/]*"
+            elif c == "?":
+                regex += "[^/]"
+            elif c == "[" and "]" in part[i + 1 :]:
+                end = part.index("]", i + 1)
+                regex += "[" + part[i + 1 : end].replace("!", "^", 1) + "]"
+                i = end
+            else:
+                regex += re.escape(c)
+            i += 1
+        parts.append(regex + "/")
+    return "".join(parts)[:-1]
+
+
+@contextmanager
+def _extract_archive_cached(archive_path: Path) -> Iterator[Path]:
+    """Extract an archive to a folder named after its md5 and yield it, reusing the folder if it already exists.
+
+    Folders are kept across runs, and the least recently used ones are deleted once all of them take more than
+    `config.SNAPSHOT_EXTRACTED_CACHE_GB`. Their sizes are stored in `<md5>.size` files next to them, whose mtime
+    tracks when they were last used. While the folder is in use, a shared lock on `<md5>.lock` keeps all processes
+    from deleting it.
+    """
+    md5 = checksum_file(archive_path)
+    root = paths.SNAPSHOTS_EXTRACTED_DIR
+    output_dir = root / md5
+    size_file = root / f"{md5}.size"
+
+    root.mkdir(parents=True, exist_ok=True)
+    lock = cast(IO[str], _lock_file(root / f"{md5}.lock", fcntl.LOCK_SH))
+    with lock:
+        if not output_dir.is_dir():
+            # extract to a temporary folder first, so that interrupted extractions are never reused
+            temp_dir = Path(tempfile.mkdtemp(dir=root, prefix=f".{md5}."))
+            try:
+                decompress_file(archive_path, temp_dir)
+                size_file.write_text(str(sum(p.stat().st_size for p in temp_dir.rglob("*") if p.is_file())))
+                try:
+                    temp_dir.rename(output_dir)
+                except OSError:
+                    # another process extracted the same archive in the meantime
+                    if not output_dir.is_dir():
+                        raise
+            finally:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+
+        size_file.touch()
+        _evict_extracted_archives()
+        yield output_dir
+
+
+def _lock_file(path: Path, operation: int) -> IO[str] | None:
+    """Open and lock a lock file with `fcntl.flock`, and return it (closing it releases the lock).
+
+    Return None if the lock is requested without blocking (`fcntl.LOCK_NB`) and is held by someone else.
+    """
+    while True:
+        f = open(path, "a")  # noqa: SIM115 (the locked file is returned)
+        try:
+            fcntl.flock(f, operation)
+        except BlockingIOError:
+            f.close()
+            return None
+        # the lock file might have been deleted (with its folder) while waiting for the lock, then lock the new one
+        try:
+            if os.stat(path).st_ino == os.fstat(f.fileno()).st_ino:
+                return f
+        except FileNotFoundError:
+            pass
+        f.close()
+
+
+def _evict_extracted_archives() -> None:
+    """Delete least recently used extracted archives until they fit in `config.SNAPSHOT_EXTRACTED_CACHE_GB`.
+
+    Archives in use (by any process) are never deleted.
+    """
+    root = paths.SNAPSHOTS_EXTRACTED_DIR
+    entries = []
+    for size_file in root.glob("*.size"):
+        try:
+            entries.append((size_file.stat().st_mtime, size_file.stem, int(size_file.read_text())))
+        except (OSError, ValueError):
+            continue
+
+    total_size = sum(size for _, _, size in entries)
+    max_size = config.SNAPSHOT_EXTRACTED_CACHE_GB * 2**30
+    for _, md5, size in sorted(entries):
+        if total_size <= max_size:
+            break
+        lock = _lock_file(root / f"{md5}.lock", fcntl.LOCK_EX | fcntl.LOCK_NB)
+        if lock is None:
+            # in use
+            continue
+        with lock:
+            log.info("snapshot.evict_extracted", md5=md5, size=size)
+            shutil.rmtree(root / md5, ignore_errors=True)
+            (root / f"{md5}.size").unlink(missing_ok=True)
+            (root / f"{md5}.lock").unlink(missing_ok=True)
+        total_size -= size
+
+
 @dataclass
 class Snapshot:
     uri: str
@@ -230,17 +439,20 @@ class Snapshot:
             # issues with cached snapshots. Remove this when convenient
             download_url = f"{config.R2_SNAPSHOTS_PUBLIC_READ}/{md5[:2]}/{md5[2:]}"
             try:
-                download_helpers.download(download_url, str(self.path), progress_bar_min_bytes=2**100)
+                downloaded_md5 = download_helpers.download_resumable(
+                    download_url, str(self.path), workers=config.SNAPSHOT_DOWNLOAD_WORKERS
+                )
             except requests.exceptions.HTTPError as e:
                 if e.response is not None and e.response.status_code == 404:
                     raise SnapshotNotFoundException(self.uri, md5) from None
                 raise
         else:
+            # boto3 already downloads large files with concurrent range requests
             download_url = f"s3://{config.R2_SNAPSHOTS_PRIVATE}/{md5[:2]}/{md5[2:]}"
             s3_utils.download(download_url, str(self.path))
+            downloaded_md5 = checksum_file_nocache(self.path)
 
         # Check if file was downloaded correctly. This should never happen
-        downloaded_md5 = checksum_file(self.path)
         if downloaded_md5 != md5:
             # remove the downloaded file
             self.path.unlink()
@@ -248,6 +460,9 @@ class Snapshot:
                 f"Checksum mismatch for {self.path}: expected {md5}, got {downloaded_md5}. It is possible that download got interrupted."
             )
 
+        # the checksum is known, don't read the file again to check whether the snapshot is dirty
+        CHECKSUM_CACHE.set(self.path, md5)
+
     def pull(self, force=True, retries: int = 1) -> None:
         """Pull file from S3."""
         if not force and not self.is_dirty():
@@ -269,6 +484,7 @@ class Snapshot:
         else:
             self._download_dvc_file(expected_md5)
 
+        # the checksum was already verified by `_download_dvc_file`
         expected_size = self.metadata.outs[0]["size"]
         downloaded_size = self.path.stat().st_size
         if downloaded_size != expected_size:
@@ -276,12 +492,6 @@ class Snapshot:
             self.path.unlink()
             raise ValueError(f"Size mismatch for {self.path}: expected {expected_size}, got {downloaded_size}")
 
-        downloaded_md5 = checksum_file(self.path)
-        if downloaded_md5 != expected_md5:
-            # remove the downloaded file
-            self.path.unlink()
-            raise ValueError(f"Checksum mismatch for {self.path}: expected {expected_md5}, got {downloaded_md5}")
-
     def is_dirty(self) -> bool:
         """Return True if snapshot exists and is in DVC."""
         if not self.path.exists():
@@ -564,12 +774,21 @@ class Snapshot:
         )
 
     @contextmanager
-    def extracted(self) -> Generator[SnapshotArchive, None, None]:
-        """Extract archive to temporary directory and provide access to its contents.
+    def extracted(self, lazy: bool = False) -> Generator[SnapshotArchive, None, None]:
+        """Extract archive and provide access to its contents.
 
         Returns a SnapshotArchive object that provides an intuitive interface
-        for listing and reading files from the archive. The temporary directory
-        is automatically cleaned up when the context manager exits.
+        for listing and reading files from the archive.
+
+        Archives are extracted to a folder named after their md5 and kept for later runs (see
+        `config.SNAPSHOT_EXTRACTED_CACHE_GB`), so unchanged snapshots are only extracted once. They are not
+        evicted while any process is inside this context manager. Don't modify the extracted files. If the
+        cache is disabled, the archive is extracted to a temporary directory that is cleaned up when the
+        context manager exits.
+
+        Args:
+            lazy: If True, read files straight out of zip and tar archives instead of extracting all of them
+                first. Useful when only a few files of a large archive are needed.
 
         Yields:
             SnapshotArchive: Object with methods for listing and reading archive contents.
@@ -593,16 +812,26 @@ class Snapshot:
                     ...
             ```
         """
-        temp_dir = tempfile.TemporaryDirectory()
-        try:
-            decompress_file(self.path, temp_dir.name)
-            archive = SnapshotArchive(self, Path(temp_dir.name))
-            # Keep backward compatibility
-            self._unarchived_dir = archive.path
-            yield archive
-        finally:
-            temp_dir.cleanup()
-            self._unarchived_dir = None
+        with ExitStack() as stack:
+
+            def extract() -> Path:
+                if config.SNAPSHOT_EXTRACTED_CACHE_GB > 0:
+                    return stack.enter_context(_extract_archive_cached(self.path))
+                temp_dir = stack.enter_context(tempfile.TemporaryDirectory())
+                decompress_file(self.path, temp_dir)
+                return Path(temp_dir)
+
+            archive: SnapshotArchive
+            if lazy and SnapshotArchiveLazy.is_supported(self.path):
+                archive = SnapshotArchiveLazy(self, self.path, extract=extract, stack=stack)
+            else:
+                archive = SnapshotArchive(self, extract())
+                # Keep backward compatibility
+                self._unarchived_dir = archive.path
+            try:
+                yield archive
+            finally:
+                self._unarchived_dir = None
 
     def read_from_archive(self, filename: str, force_extension: str | None = None, **kwargs) -> Table:
         """Read a file in an archive.
@@ -671,7 +900,8 @@ class Snapshot:
 
         The read method is inferred based on the file extension of `filename`. Use `force_extension` if you want to override this.
         """
-        with self.extract_to_tempdir() as tmpdir:
+        with self.extracted() as archive:
+            tmpdir = archive.path
             if force_extension is None:
                 new_extension = filename.split(".")[-1]
             else:
@@ -950,6 +1180,15 @@ def snapshot_catalog(match: str = r".*") -> Iterator[Snapshot]:
             yield Snapshot(uri)
 
 
+def pull_snapshots(snapshots: list[Snapshot], workers: int = config.SNAPSHOT_PULL_WORKERS) -> list[Snapshot]:
+    """Download the dirty snapshots concurrently, returning the ones that were downloaded."""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        dirty = [snap for snap, is_dirty in zip(snapshots, executor.map(Snapshot.is_dirty, snapshots)) if is_dirty]
+        list(executor.map(lambda snap: snap.pull(force=True, retries=3), dirty))
+    CHECKSUM_CACHE.save()
+    return dirty
+
+
 _SHORT_NAME_RE = re.compile(r"^[a-z_][a-z0-9_]*$")
 
 
@@ -10,7 +10,7 @@ import rich_click as click
 import structlog
 from click.core import Command
 
-from etl import paths
+from etl import config, paths
 
 log = structlog.get_logger()
 
@@ -196,6 +196,46 @@ def snapshot_cli(dataset_name: str, upload: bool, path_to_file: str | None, dry_
         run_snapshot_dvc_only(dataset_name, upload=upload, path_to_file=path_to_file)
 
 
+@click.command("snapshot-pull")
+@click.argument("steps", nargs=-1, type=str)
+@click.option("--private", "-p", is_flag=True, help="Pull private snapshots too.")
+@click.option(
+    "--dag-path",
+    type=click.Path(exists=True),
+    help="Path to DAG yaml file",
+    default=paths.DEFAULT_DAG_FILE,
+)
+@click.option(
+    "--workers",
+    "-w",
+    type=int,
+    help="Number of snapshots downloaded concurrently.",
+    default=config.SNAPSHOT_PULL_WORKERS,
+)
+def snapshot_pull_cli(steps: tuple[str, ...], private: bool, dag_path: Path, workers: int) -> None:
+    """Download the snapshots needed to run the given steps.
+
+    STEPS are patterns selecting steps of the DAG like in `etl run`. All snapshots they depend on that are
+    missing or outdated locally are downloaded concurrently, so that `etl run` doesn't download them one by one.
+
+    Examples:
+
+        etl snapshot-pull garden/who
+        etl snapshot-pull --private --workers 16
+    """
+    # Defer heavy imports until needed
+    from etl.dag_helpers import load_dag
+    from etl.snapshot import Snapshot, pull_snapshots
+    from etl.steps import filter_to_subgraph, graph_nodes
+
+    dag = filter_to_subgraph(load_dag(dag_path), includes=steps)
+    prefixes = ("snapshot://", "snapshot-private://") if private else ("snapshot://",)
+    snapshots = [Snapshot.from_raw_uri(step) for step in sorted(graph_nodes(dag)) if step.startswith(prefixes)]
+
+    pulled = pull_snapshots(snapshots, workers=workers)
+    log.info("Snapshots pulled", pulled=len(pulled), up_to_date=len(snapshots) - len(pulled))
+
+
 def _find_files_by_pattern(dataset_name: str, extension: str) -> list[Path]:
     """Find files matching a dataset name pattern with given extension.
 
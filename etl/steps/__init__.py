@@ -177,17 +177,17 @@ def traverse(graph: DAG, nodes: set[str]) -> DAG:
     Use BFS to find all nodes in a graph that are reachable from a given
     subset of nodes.
     """
-    reachable: DAG = defaultdict(set)
-    to_visit = nodes.copy()
+    reachable: DAG = {}
+    to_visit = list(nodes)
 
     while to_visit:
         node = to_visit.pop()
         if node in reachable:
             continue  # already visited
         reachable[node] = set(graph.get(node, set()))
-        to_visit = to_visit.union(reachable[node])
+        to_visit.extend(dep for dep in reachable[node] if dep not in reachable)
 
-    return dict(reachable)
+    return reachable
 
 
 def _parse_dag_yaml(dag: dict[str, Any]) -> dict[str, Any]:
@@ -514,7 +514,7 @@ class DataStep(Step):
             return True
 
         try:
-            found_source_checksum = catalog.Dataset(self._dest_dir.as_posix()).metadata.source_checksum
+            found_source_checksum = self._found_source_checksum()
         except KeyError as e:
             if _uses_old_schema(e):
                 return True
@@ -531,6 +531,14 @@ class DataStep(Step):
 
         return False
 
+    def _found_source_checksum(self) -> str | None:
+        """Source checksum of the existing dataset, cached on disk until its index.json changes."""
+        return files.CHECKSUM_CACHE.get(
+            self._dest_dir / "index.json",
+            lambda _: catalog.Dataset(self._dest_dir.as_posix()).metadata.source_checksum,
+            kind="source_checksum",
+        )
+
     def has_existing_data(self) -> bool:
         if not (self._dest_dir.is_dir() and (self._dest_dir / "index.json").exists()):
             return False
@@ -1024,7 +1032,6 @@ class GrapherStep(Step):
         catalog_paths = []
 
         with ThreadPoolExecutor(max_workers=config.GRAPHER_INSERT_WORKERS) as thread_pool:
-            futures = []
             verbose = True
             i = 0
 
@@ -1074,6 +1081,9 @@ class GrapherStep(Step):
                 with Session(engine, expire_on_commit=False) as session:
                     db_origins = db.upsert_origins(session, table)
 
+                # Variables of a table are upserted in parallel, and then their metadata is uploaded and their
+                # checksums saved in a single batch
+                futures = []
                 for t in gh._yield_wide_table(table, na_action="drop"):
                     i += 1
                     assert len(t.columns) == 1
@@ -1101,8 +1111,11 @@ class GrapherStep(Step):
                         )
                     )
 
-            # wait for all tables to be inserted
-            [future.result() for future in as_completed(futures)]
+                # wait for all variables of the table to be inserted
+                results = [future.result() for future in as_completed(futures)]
+                db.upload_metadata_and_save_checksums(
+                    engine, [r for r in results if r is not None], workers=config.GRAPHER_INSERT_WORKERS
+                )
 
         # If INSTANT flag is set, don't clean ghost variables, but update the checksum (with _instant suffix)
         if INSTANT_METADATA_DIFF:
@@ -1315,6 +1328,9 @@ def select_dirty_steps(steps: list[Step], workers: int = 1) -> list[Step]:
 
     cache_is_dirty.clear()
 
+    # persist checksums of files we had to hash, so that the next run doesn't have to
+    files.CHECKSUM_CACHE.save()
+
     return steps
 
 
@@ -1,4 +1,5 @@
 # Force re-run
+from etl.collection import save_collections
 from etl.helpers import PathFinder
 
 # Get paths and naming conventions for current step.
@@ -32,14 +33,17 @@ def run() -> None:
         # "covid.vax_breakdowns.yml",
     ]
 
+    collections = []
     for fname in filenames:
         ## Load config
         paths.log.info(fname)
         config = paths.load_collection_config(fname)
 
-        ## Create and save collection
-        c = paths.create_collection(config=config, short_name=fname_to_short_name(fname))
-        c.save()
+        ## Create collection
+        collections.append(paths.create_collection(config=config, short_name=fname_to_short_name(fname)))
+
+    ## Save collections
+    save_collections(collections)
 
     # PART 2: Collection hybridly generated (YAML file + programmatic config)
     ## Load data
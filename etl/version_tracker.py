@@ -15,7 +15,7 @@ from etl.config import ADMIN_HOST
 from etl.dag_helpers import load_dag, load_single_dag_file
 from etl.db import can_connect
 from etl.grapher.io import get_info_for_etl_datasets
-from etl.steps import extract_step_attributes, reverse_graph
+from etl.steps import extract_step_attributes, reverse_graph, traverse
 
 log = structlog.get_logger()
 
@@ -134,7 +134,7 @@ def get_all_step_dependencies(dag: dict[str, Any], step: str) -> list[str]:
     dependencies : List[str]
         All dependencies of a given step in a dag.
     """
-    dependencies = sorted(_recursive_get_all_step_dependencies(dag=dag, step=step))
+    dependencies = sorted(set(traverse(dag, {step})) - {step})
 
     return dependencies
 
@@ -203,28 +203,10 @@ def load_dag_file_for_each_step() -> dict[str, str]:
     return dag_file_steps_reverse
 
 
-def _recursive_get_all_step_dependencies(dag: dict[str, Any], step: str, dependencies: set[str] = set()) -> set[str]:
-    if step in dag:
-        # If step is in the dag, gather all its substeps.
-        substeps = dag[step]
-        # Add substeps to the set of dependencies (union of sets, to avoid repetitions).
-        dependencies = dependencies | set(substeps)
-        for substep in substeps:
-            # For each of the substeps, repeat the process.
-            dependencies = dependencies | _recursive_get_all_step_dependencies(
-                dag, step=substep, dependencies=dependencies
-            )
-    else:
-        # If step is not in the dag, return the default dependencies (which is an empty set).
-        pass
-
-    return dependencies
-
-
 def _recursive_get_all_step_dependencies_ndim(
     dag: dict[str, Any], step: str, memo: dict[str, set[str]]
 ) -> tuple[set[str], dict[str, set[str]]]:
-    """Optimised version of `_recursive_get_all_step_dependencies` using `memo` to store already computed dependencies."""
+    """Get all dependencies of a step, using `memo` to store already computed dependencies."""
     if step in memo:
         # Return already computed dependencies immediately
         return memo[step], memo
@@ -415,10 +397,8 @@ class VersionTracker:
 
     def get_all_dependencies_of_active_steps(self) -> list[str]:
         """Get all dependencies of active steps in the dag."""
-        # Gather all dependencies of active steps in the dag.
-        active_dependencies = set()
-        for step in self.dag_active:
-            active_dependencies = active_dependencies | set(self.get_all_step_dependencies(step=step))
+        # Gather all dependencies of active steps in the dag (i.e. all steps reachable from them through an edge).
+        active_dependencies = {dep for deps in traverse(self.dag_active, set(self.dag_active)).values() for dep in deps}
 
         return sorted(active_dependencies)
 
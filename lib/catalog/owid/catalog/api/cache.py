@@ -0,0 +1,195 @@
+#
+#  owid.catalog.api.cache
+#
+#  Local on-disk cache of table files downloaded from the catalog.
+#
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from os import environ
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+
+import requests
+
+from owid.catalog import s3_utils
+from owid.catalog.api.utils import session
+
+# Directory of the cache, shared by all processes of the user (notebooks, `etl diff`, the MCP server, ...).
+# Set OWID_CATALOG_CACHE=0 to disable it.
+CACHE_DIR = Path(
+    environ.get("OWID_CATALOG_CACHE_DIR")
+    or Path(environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "owid-catalog"
+)
+CACHE_ENABLED = environ.get("OWID_CATALOG_CACHE", "1").lower() not in ("0", "false", "no")
+
+# Maximum size of the cache in GB, least recently used files are evicted beyond it
+CACHE_MAX_SIZE_GB = float(environ.get("OWID_CATALOG_CACHE_SIZE_GB", "5"))
+
+
+class FileCache:
+    """Cache of remote files keyed by their URL and ETag.
+
+    Files are stored under `path` mirroring the layout of the catalog, so that a table's `.meta.json`
+    sits next to its data file and the cached table can be read with `Table.read`. Every fetch revalidates
+    the cached copy with a conditional request (`If-None-Match`), so that unchanged tables are read from
+    disk and changed ones are downloaded again. If the catalog cannot be reached, cached copies are used
+    as they are. Least recently used files are evicted once the cache grows over `max_size` bytes.
+
+    The index of the cache is read and written on every operation, so that several processes can share it.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path, max_size: int) -> None:
+        self.path = path
+        self.max_size = max_size
+        self._lock = threading.Lock()
+
+    @property
+    def _index_path(self) -> Path:
+        return self.path / "index.json"
+
+    def _read_index(self) -> dict[str, dict[str, Any]]:
+        try:
+            with open(self._index_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            return {}
+        return data.get("entries", {})
+
+    def _write_index(self, entries: dict[str, dict[str, Any]]) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file first, so that other processes never read a partial index
+        tmp_path = self._index_path.with_name(f"index.json.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"version": self.VERSION, "entries": entries}, f)
+        os.replace(tmp_path, self._index_path)
+
+    def _local_path(self, url: str) -> Path:
+        parsed = urlparse(url)
+        return self.path / "files" / parsed.scheme / parsed.netloc / parsed.path.lstrip("/")
+
+    def _lookup(self, url: str) -> dict[str, Any] | None:
+        """Return the index entry of the URL if its file is still in the cache."""
+        with self._lock:
+            entry = self._read_index().get(url)
+        if entry is None or not self._local_path(url).exists():
+            return None
+        return entry
+
+    def _update(self, url: str, etag: str | None = None) -> None:
+        """Record a fetch of the URL, with the ETag of a new download (if any)."""
+        with self._lock:
+            entries = self._read_index()
+            entry = entries.setdefault(url, {})
+            if etag is not None:
+                entry["etag"] = etag
+                entry["size"] = self._local_path(url).stat().st_size
+            entry["atime"] = time.time()
+            self._write_index(entries)
+
+    def _download_to(self, url: str, chunks: Any, etag: str | None) -> None:
+        """Write downloaded chunks to the cache, checking them against the ETag if it is an MD5 of the contents
+        (weak ETags of compressed responses are not)."""
+        local_path = self._local_path(url)
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = local_path.with_name(f"{local_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        md5 = hashlib.md5()
+        try:
+            with open(tmp_path, "wb") as f:
+                for chunk in chunks:
+                    md5.update(chunk)
+                    f.write(chunk)
+            if etag and re.fullmatch('"?[0-9a-f]{32}"?', etag) and md5.hexdigest() != etag.strip('"'):
+                raise OSError(f"Checksum of {url} does not match its ETag")
+            os.replace(tmp_path, local_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def fetch(self, url: str, timeout: int = 30) -> str:
+        """Return the local path of a cached copy of the file at an HTTP(S) URL, downloading it if it changed.
+
+        Raises:
+            requests.HTTPError: If the file does not exist.
+        """
+        entry = self._lookup(url)
+        headers = {"If-None-Match": entry["etag"]} if entry and entry.get("etag") else {}
+        try:
+            resp = session.get(url, headers=headers, timeout=timeout, stream=True)
+        except requests.ConnectionError:
+            if entry is None:
+                raise
+            # work offline with the cached copy
+            self._update(url)
+            return self._local_path(url).as_posix()
+
+        with resp:
+            if resp.status_code == 304 and entry is not None:
+                self._update(url)
+                return self._local_path(url).as_posix()
+
+            resp.raise_for_status()
+            etag = resp.headers.get("ETag")
+            if entry is not None and etag is not None and etag == entry.get("etag"):
+                # server does not support conditional requests, but the file is the same
+                self._update(url)
+                return self._local_path(url).as_posix()
+
+            self._download_to(url, resp.iter_content(chunk_size=2**20), etag)
+
+        self._update(url, etag=etag or "")
+        return self._local_path(url).as_posix()
+
+    def fetch_s3(self, s3_url: str) -> str:
+        """Return the local path of a cached copy of a file in S3 (e.g. the private catalog), downloading it if
+        it changed."""
+        client = s3_utils.connect_r2_cached()
+        bucket, key = s3_utils.s3_bucket_key(s3_url)
+        etag = client.head_object(Bucket=bucket, Key=key)["ETag"].strip('"')  # ty: ignore
+
+        entry = self._lookup(s3_url)
+        if entry is None or entry.get("etag") != etag:
+            body = client.get_object(Bucket=bucket, Key=key)["Body"]  # ty: ignore
+            self._download_to(s3_url, body.iter_chunks(chunk_size=2**20), etag)
+            self._update(s3_url, etag=etag)
+        else:
+            self._update(s3_url)
+        return self._local_path(s3_url).as_posix()
+
+    def evict(self) -> None:
+        """Delete least recently used files until the cache fits in `max_size`."""
+        with self._lock:
+            entries = self._read_index()
+            total_size = sum(e.get("size", 0) for e in entries.values())
+            if total_size <= self.max_size:
+                return
+
+            for url in sorted(entries, key=lambda u: entries[u].get("atime", 0)):
+                if total_size <= self.max_size:
+                    break
+                self._local_path(url).unlink(missing_ok=True)
+                total_size -= entries.pop(url).get("size", 0)
+            self._write_index(entries)
+
+    def clear(self) -> None:
+        """Delete all cached files."""
+        with self._lock:
+            for url in self._read_index():
+                self._local_path(url).unlink(missing_ok=True)
+            self._write_index({})
+
+
+def get_cache() -> FileCache | None:
+    """Return the shared cache of catalog files, or None if it is disabled with OWID_CATALOG_CACHE=0."""
+    if not CACHE_ENABLED:
+        return None
+    return FileCache(CACHE_DIR, max_size=int(CACHE_MAX_SIZE_GB * 2**30))
@@ -8,6 +8,7 @@ from __future__ import annotations
 import json
 import os
 import re
+import shutil
 import tempfile
 from collections.abc import Callable
 from typing import TYPE_CHECKING, Literal, TypeVar, cast
@@ -20,6 +21,7 @@ from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 from rapidfuzz import fuzz
 
 from owid.catalog import s3_utils
+from owid.catalog.api.cache import FileCache, get_cache
 from owid.catalog.api.models import ResponseSet
 from owid.catalog.api.utils import (
     OWID_CATALOG_VERSION,
@@ -66,6 +68,26 @@ def _download_private_file_s3(uri: str, tmpdir: str) -> str:
     return tmpdir + "/data" + ext
 
 
+def _fetch_file_cached(uri: str, cache: FileCache) -> str:
+    """Fetch a public file and its metadata through the local cache and return the local path of the file."""
+    cache.fetch(os.path.splitext(uri)[0] + ".meta.json")
+    return cache.fetch(uri)
+
+
+def _fetch_private_file_s3_cached(uri: str, cache: FileCache) -> str:
+    """Fetch private files from S3 through the local cache and return the local path of the data file.
+
+    Metadata is fetched from the public bucket into the folder of the private bucket, so that it sits next to
+    the data file (see `_download_private_file_s3`).
+    """
+    parsed = urlparse(uri)
+    base, ext = os.path.splitext(parsed.path)
+    data_path = cache.fetch_s3(S3_OWID_URI_PRIVATE + base + ext)
+    metadata_path = cache.fetch_s3(S3_OWID_URI + base + ".meta.json")
+    shutil.copyfile(metadata_path, os.path.splitext(data_path)[0] + ".meta.json")
+    return data_path
+
+
 class CatalogVersionError(Exception):
     """Raised when catalog format version is newer than library version."""
 
@@ -267,20 +289,32 @@ def _load_table(
         if PREFERRED_FORMAT in formats_to_try:
             formats_to_try = [PREFERRED_FORMAT] + [f for f in formats_to_try if f != PREFERRED_FORMAT]
 
+        # Data is read from the local cache (if enabled), which revalidates cached files with the catalog
+        cache = get_cache() if load_data else None
+
         for fmt in formats_to_try:
             try:
                 table_uri = f"{uri}.{fmt}"
 
                 # Handle private files
                 if not is_public:
-                    tmpdir = tempfile.mkdtemp()
-                    table_uri = _download_private_file_s3(table_uri, tmpdir)
+                    if cache:
+                        table_uri = _fetch_private_file_s3_cached(table_uri, cache)
+                    else:
+                        tmpdir = tempfile.mkdtemp()
+                        table_uri = _download_private_file_s3(table_uri, tmpdir)
+                elif cache:
+                    table_uri = _fetch_file_cached(table_uri, cache)
 
                 # If header_only, return empty table with same structure
-                return Table.read(table_uri, load_data=load_data)
+                tb = Table.read(table_uri, load_data=load_data)
             except Exception:
                 continue
 
+            if cache:
+                cache.evict()
+            return tb
+
         raise KeyError(f"No matching table found at: {path}")
 
     if load_data:
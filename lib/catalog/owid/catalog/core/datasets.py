@@ -213,6 +213,9 @@ class Dataset:
         safe_types: bool = True,
         reset_metadata: Literal["keep", "keep_origins", "reset"] = "keep",
         load_data: bool = True,
+        columns: list[str] | None = None,
+        filters: tables.Filters | None = None,
+        mmap: bool = False,
     ) -> tables.Table:
         """Read a table from the dataset with performance options.
 
@@ -233,6 +236,15 @@ class Dataset:
                 - "reset": Reset all variable metadata
             load_data: If False, only load metadata without actual data. Useful
                 when you only need to inspect metadata. Default is True.
+            columns: Only load these columns (plus primary key columns). Metadata is
+                only parsed for loaded columns. Default is None (all columns).
+            filters: Only load rows matching these filters, pushed down to pyarrow,
+                e.g. `[("country", "in", ["France"]), ("year", ">=", 2000)]`. Not
+                supported for CSV. Default is None (all rows).
+            mmap: If True, memory-map feather files and return Arrow-backed columns
+                without copying data from uncompressed files, so that processes reading
+                the same table share memory. `safe_types` is ignored, since Arrow-backed
+                columns are already nullable. Default is False.
 
         Returns:
             The loaded table with data and metadata.
@@ -261,6 +273,11 @@ class Dataset:
             ```python
             >>> meta_only = ds.read(load_data=False)
             ```
+
+            Subset of columns and rows
+            ```python
+            >>> tb = ds.read("population", columns=["population"], filters=[("year", ">=", 2000)])
+            ```
         """
         if name is None:
             if len(self.table_names) == 1:
@@ -272,9 +289,15 @@ class Dataset:
         for format in SUPPORTED_FORMATS:
             path = stem.with_suffix(f".{format}")
             if path.exists():
-                t = tables.Table.read(path, primary_key=[] if reset_index else None, load_data=load_data)
+                # only pass options when given, so that readers without support for them still work
+                options: dict[str, Any] = {
+                    k: v for k, v in {"columns": columns, "filters": filters}.items() if v is not None
+                }
+                if mmap:
+                    options["mmap"] = True
+                t = tables.Table.read(path, primary_key=[] if reset_index else None, load_data=load_data, **options)
                 t.metadata.dataset = self.metadata
-                if safe_types and load_data:
+                if safe_types and load_data and not mmap:
                     t = cast(tables.Table, to_safe_types(t))
                 if reset_metadata in ["keep_origins", "reset"]:  # Handles "keep_origins" and "reset"
                     t.metadata = TableMeta()
@@ -11,7 +11,7 @@ import os
 import re
 from collections import defaultdict
 from collections.abc import Callable
-from typing import TYPE_CHECKING, Any, Literal, cast, overload
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple, cast, overload
 
 import pandas as pd
 import structlog
@@ -558,6 +558,13 @@ class IndicatorRolling:
         return func
 
 
+class _IndicatorMetadata(NamedTuple):
+    """Name and metadata of an indicator, resolved once when combining metadata."""
+
+    name: str
+    metadata: VariableMeta
+
+
 def _hash_dict(d: dict[str, Any]) -> int:
     return hash(json.dumps(d, sort_keys=True))
 
@@ -859,8 +866,14 @@ def combine_indicators_metadata(
     metadata = VariableMeta()
 
     # Skip other objects passed in indicators that may not contain metadata (e.g. a scalar),
-    # and skip unnamed indicators that cannot have metadata
-    indicators_only = [v for v in indicators if hasattr(v, "name") and v.name and hasattr(v, "metadata")]
+    # and skip unnamed indicators that cannot have metadata. Indicators sharing the same metadata object
+    # (e.g. `tb.a * tb.a`) don't change the result, so each metadata object is combined only once.
+    unique_metadata: dict[int, _IndicatorMetadata] = {}
+    for v in indicators:
+        if hasattr(v, "name") and v.name and hasattr(v, "metadata"):
+            meta = v.metadata
+            unique_metadata.setdefault(id(meta), _IndicatorMetadata(v.name, meta))
+    indicators_only = cast(list[Indicator], list(unique_metadata.values()))
 
     # Combine each metadata field using the logic of the specified operation.
     metadata.title = _get_metadata_value_from_indicators_if_all_identical(
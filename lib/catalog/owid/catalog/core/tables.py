@@ -9,6 +9,7 @@ import types
 from collections import defaultdict
 from collections.abc import Callable, Iterable, Iterator
 from functools import wraps
+from os import environ
 from os.path import dirname, join, splitext
 from pathlib import Path
 from typing import (
@@ -17,6 +18,7 @@ from typing import (
     Literal,
     TypeVar,
     cast,
+    get_args,
     overload,
 )
 
@@ -46,6 +48,27 @@ AnyStr = TypeVar("AnyStr", str, bytes)
 # pd.Series or Variable
 SeriesOrVariable = TypeVar("SeriesOrVariable", pd.Series, indicators.Indicator)
 
+FeatherCompression = Literal["zstd", "lz4", "uncompressed"]
+
+
+def _feather_compression_from_env() -> FeatherCompression:
+    compression = environ.get("FEATHER_COMPRESSION", "zstd")
+    if compression not in get_args(FeatherCompression):
+        raise ValueError(
+            f"Invalid FEATHER_COMPRESSION environment variable {compression!r}, "
+            f"expected one of: {', '.join(get_args(FeatherCompression))}"
+        )
+    return cast(FeatherCompression, compression)
+
+
+# Compression of feather files written by `Table.to_feather`. Uncompressed (or lz4) files are faster to
+# write and read, and uncompressed files can be memory-mapped without copying (see `read_feather(mmap=True)`),
+# at the cost of more disk space. Useful as a local working format for the data/ folder.
+FEATHER_COMPRESSION: FeatherCompression = _feather_compression_from_env()
+
+# Row filters in pyarrow's disjunctive normal form, e.g. [("country", "in", ["France"]), ("year", ">=", 2000)]
+Filters = list[tuple[str, str, Any]] | list[list[tuple[str, str, Any]]]
+
 
 class Table(pd.DataFrame):
     """Enhanced pandas DataFrame with rich metadata support.
@@ -488,7 +511,7 @@ class Table(pd.DataFrame):
         self,
         path: Any,
         repack: bool = True,
-        compression: Literal["zstd", "lz4", "uncompressed"] = "zstd",
+        compression: FeatherCompression | None = None,
         **kwargs: Any,
     ) -> None:
         """Save table as Feather file with accompanying metadata.
@@ -506,9 +529,10 @@ class Table(pd.DataFrame):
             repack: If True, optimize column dtypes to reduce file size.
                 Set to False for very large tables if repacking is slow.
             compression: Compression algorithm to use. Options are:
-                - "zstd" (default): High compression ratio
+                - "zstd": High compression ratio
                 - "lz4": Faster compression
-                - "uncompressed": No compression
+                - "uncompressed": No compression, can be memory-mapped without copying
+                Defaults to the `FEATHER_COMPRESSION` environment variable, or "zstd" if not set.
             **kwargs: Additional arguments passed to pandas.DataFrame.to_feather.
 
         Raises:
@@ -545,7 +569,7 @@ class Table(pd.DataFrame):
                     time=time.time() - t,
                 )
 
-        df.to_feather(path, compression=compression, **kwargs)
+        df.to_feather(path, compression=compression or FEATHER_COMPRESSION, **kwargs)
 
         self._save_metadata(self.metadata_filename(path))
 
@@ -627,7 +651,9 @@ class Table(pd.DataFrame):
                 raise ValueError(f"metadata contains NaNs:\n{metadata}") from e
 
     @classmethod
-    def read_csv(cls, path: str | Path, **kwargs: Any) -> Table:
+    def read_csv(
+        cls, path: str | Path, columns: list[str] | None = None, filters: Filters | None = None, **kwargs: Any
+    ) -> Table:
         """Read table from CSV file with accompanying metadata.
 
         Loads a table from a CSV file and its associated .meta.json metadata file.
@@ -635,6 +661,8 @@ class Table(pd.DataFrame):
 
         Args:
             path: Path to the CSV file (must end with .csv).
+            columns: Columns to load. Primary key columns are always loaded. If None, load all columns.
+            filters: Not supported for CSV files, only for feather and parquet.
             **kwargs: Additional arguments passed to the internal metadata loader.
 
         Returns:
@@ -655,9 +683,13 @@ class Table(pd.DataFrame):
         if not path.endswith(".csv"):
             raise ValueError(f'filename must end in ".csv": {path}')
 
+        if filters is not None:
+            raise ValueError("Argument 'filters' is only supported for feather and parquet formats.")
+
         # load the data and add metadata
-        tb = Table(pd.read_csv(path, index_col=False, na_values=[""], keep_default_na=False))
-        cls._add_metadata(tb, path, **kwargs)
+        usecols, metadata = cls._select_columns(cls._read_metadata(path), columns, kwargs.get("primary_key"))
+        tb = Table(pd.read_csv(path, index_col=False, na_values=[""], keep_default_na=False, usecols=usecols))
+        cls._add_metadata(tb, path, metadata=metadata, **kwargs)
         return tb
 
     def update_metadata(self, **kwargs: Any) -> Table:
@@ -687,12 +719,25 @@ class Table(pd.DataFrame):
         return self
 
     @classmethod
-    def _add_metadata(cls, tb: Table, path: str, primary_key: list[str] | None = None, load_data: bool = True) -> None:
-        """Read metadata from JSON sidecar and add it to the dataframe."""
+    def _add_metadata(
+        cls,
+        tb: Table,
+        path: str,
+        primary_key: list[str] | None = None,
+        load_data: bool = True,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """Read metadata from JSON sidecar and add it to the dataframe.
+
+        If `metadata` is given, it is used instead of reading the sidecar again.
+        """
         if not load_data:
             log.warning("Using load_data=False is only supported when reading feather format.")
 
-        metadata = cls._read_metadata(path)
+        if metadata is None:
+            metadata = cls._read_metadata(path)
+        else:
+            metadata = dict(metadata)
 
         if primary_key is None:
             primary_key = metadata.get("primary_key", [])
@@ -708,8 +753,73 @@ class Table(pd.DataFrame):
             if set(current_index_names) != set(primary_key):
                 tb.set_index(primary_key, inplace=True)
 
+    @staticmethod
+    def _select_columns(
+        metadata: dict[str, Any], columns: list[str] | None, primary_key: list[str] | None = None
+    ) -> tuple[list[str] | None, dict[str, Any]]:
+        """Return columns to read from the file (including primary key columns, None means all columns)
+        and metadata restricted to them, so that metadata of columns that are not loaded is never parsed."""
+        if columns is None:
+            return None, metadata
+        if primary_key is None:
+            primary_key = metadata.get("primary_key", [])
+        columns = list(dict.fromkeys([*primary_key, *columns]))
+        fields = {k: v for k, v in metadata.get("fields", {}).items() if k in columns}
+        return columns, {**metadata, "fields": fields}
+
+    @staticmethod
+    def _read_arrow(
+        path: str,
+        format: Literal["feather", "parquet"],
+        columns: list[str] | None,
+        filters: Filters | None,
+        mmap: bool = False,
+    ) -> pd.DataFrame:
+        """Read a subset of columns and rows of a feather or parquet file.
+
+        Projection and row filters are applied by pyarrow before converting to pandas, so that columns
+        and rows that are not needed are never materialised. With `mmap`, a local feather file is
+        memory-mapped and converted to Arrow-backed columns, which reference the mapped pages of
+        uncompressed files instead of copying them.
+        """
+        if format == "parquet":
+            # pyarrow pushes filters down to row groups and can filter on columns that are not loaded
+            return pd.read_parquet(
+                path, columns=columns, filters=filters, storage_options=storage_options_for_http(path)
+            )
+
+        import pyarrow.feather as feather
+
+        source = pyarrow.BufferReader(session.get(path).content) if path.startswith("http") else path
+        types_mapper = pd.ArrowDtype if mmap else None
+
+        if filters is None:
+            return feather.read_table(source, columns=columns, memory_map=mmap).to_pandas(types_mapper=types_mapper)
+
+        expression = pq.filters_to_expression(filters)  # ty: ignore[invalid-argument-type]
+
+        # filter columns need to be loaded too, but are dropped after filtering if not requested
+        read_columns = columns
+        if columns is not None:
+            # filters are either a list of predicates or a list of lists of predicates (DNF)
+            predicates = [p for group in filters for p in (group if isinstance(group, list) else [group])]
+            read_columns = list(dict.fromkeys([*columns, *(p[0] for p in predicates)]))
+
+        t = feather.read_table(source, columns=read_columns, memory_map=mmap).filter(expression)
+        if columns is not None:
+            t = t.select(columns)
+        return t.to_pandas(types_mapper=types_mapper)
+
     @classmethod
-    def read_feather(cls, path: str | Path, load_data: bool = True, **kwargs: Any) -> Table:
+    def read_feather(
+        cls,
+        path: str | Path,
+        load_data: bool = True,
+        columns: list[str] | None = None,
+        filters: Filters | None = None,
+        mmap: bool = False,
+        **kwargs: Any,
+    ) -> Table:
         """Read table from Feather file with accompanying metadata.
 
         Loads a table from a Feather file and its associated .meta.json metadata file.
@@ -719,6 +829,14 @@ class Table(pd.DataFrame):
             path: Path or URL to the Feather file (must end with .feather).
             load_data: If True, load the actual data. If False, only load metadata
                 and column structure (useful for inspecting large files).
+            columns: Columns to load. Primary key columns are always loaded. If None, load all columns.
+            filters: Only load rows matching these filters, given in pyarrow's format, e.g.
+                `[("country", "in", ["France", "Spain"]), ("year", ">=", 2000)]`. A list of such lists
+                is combined with OR.
+            mmap: If True, memory-map the file and return Arrow-backed columns (`pd.ArrowDtype`). For
+                uncompressed files (see `FEATHER_COMPRESSION`) no data is copied, so processes reading
+                the same file share its pages in the OS page cache. Compressed files still have to be
+                decompressed into memory.
             **kwargs: Additional arguments passed to the internal metadata loader.
 
         Returns:
@@ -732,6 +850,7 @@ class Table(pd.DataFrame):
             table = Table.read_feather("data.feather")
             table = Table.read_feather("https://example.com/data.feather")
             metadata_only = Table.read_feather("data.feather", load_data=False)
+            subset = Table.read_feather("data.feather", columns=["gdp"], filters=[("year", ">=", 2000)])
             ```
         """
         if isinstance(path, Path):
@@ -741,18 +860,21 @@ class Table(pd.DataFrame):
             raise ValueError(f'filename must end in ".feather": {path}')
 
         # load the data and add metadata
+        columns, metadata = cls._select_columns(cls._read_metadata(path), columns, kwargs.get("primary_key"))
         if not load_data:
-            metadata = cls._read_metadata(path)
-            columns = list(metadata["fields"].keys())
-            df = Table(pd.DataFrame(columns=columns))
-        else:
+            df = Table(pd.DataFrame(columns=columns if columns is not None else list(metadata["fields"].keys())))
+        elif columns is None and filters is None and not mmap:
             df = Table(pd.read_feather(path))
+        else:
+            df = Table(cls._read_arrow(path, "feather", columns, filters, mmap=mmap))
 
-        cls._add_metadata(df, path, **kwargs)
+        cls._add_metadata(df, path, metadata=metadata, **kwargs)
         return df
 
     @classmethod
-    def read_parquet(cls, path: str | Path, **kwargs: Any) -> Table:
+    def read_parquet(
+        cls, path: str | Path, columns: list[str] | None = None, filters: Filters | None = None, **kwargs: Any
+    ) -> Table:
         """Read table from Parquet file with accompanying metadata.
 
         Loads a table from a Parquet file and its associated .meta.json metadata file.
@@ -760,6 +882,8 @@ class Table(pd.DataFrame):
 
         Args:
             path: Path or URL to the Parquet file (must end with .parquet).
+            columns: Columns to load. Primary key columns are always loaded. If None, load all columns.
+            filters: Only load rows matching these filters, given in pyarrow's format (see `read_feather`).
             **kwargs: Additional arguments passed to the internal metadata loader.
 
         Returns:
@@ -781,8 +905,12 @@ class Table(pd.DataFrame):
             raise ValueError(f'filename must end in ".parquet": {path}')
 
         # load the data and add metadata
-        df = Table(pd.read_parquet(path))
-        cls._add_metadata(df, path, **kwargs)
+        columns, metadata = cls._select_columns(cls._read_metadata(path), columns, kwargs.get("primary_key"))
+        if columns is None and filters is None:
+            df = Table(pd.read_parquet(path))
+        else:
+            df = Table(cls._read_arrow(path, "parquet", columns, filters))
+        cls._add_metadata(df, path, metadata=metadata, **kwargs)
         return df
 
     @classmethod
@@ -2081,6 +2209,51 @@ def align_categoricals(left: SeriesOrVariable, right: SeriesOrVariable) -> tuple
         return left, right
 
 
+def _copy_sharing_metadata(table: Table | pd.DataFrame) -> Table | pd.DataFrame:
+    """Shallow copy of a table that shares indicator metadata objects with the original one.
+
+    Unlike `Table.copy`, it doesn't copy metadata of every column, so it should only be used for intermediate
+    tables whose metadata is not modified.
+    """
+    if not isinstance(table, Table):
+        return table.copy(deep=False)
+    tab = Table(pd.DataFrame.copy(table, deep=False), metadata=table.metadata.copy())
+    tab._fields = defaultdict(VariableMeta, table._fields)
+    return tab
+
+
+def _combine_columns_metadata(
+    sources: dict[str, list[tuple[pd.DataFrame, str]]], operation: indicators.OPERATION, copy: bool = False
+) -> dict[str, VariableMeta]:
+    """Combine metadata of each new column from the columns of tables it was created from.
+
+    Metadata is combined only once for all new columns created from the same metadata objects (e.g. when tables
+    share them), but every new column still gets its own metadata object. If `copy` is True, metadata of new
+    columns doesn't share any objects (e.g. origins) with the original tables.
+    """
+    combined: dict[tuple[int | None, ...], VariableMeta] = {}
+    fields = {}
+    for new_column, columns in sources.items():
+        # tables without metadata (pandas DataFrames) don't contribute to it
+        key = tuple(id(tb._fields[column]) if isinstance(tb, Table) else None for tb, column in columns)
+        if key in combined:
+            fields[new_column] = combined[key].copy()
+        else:
+            # pass metadata directly instead of creating indicators, which is slow for wide tables
+            meta = indicators.combine_indicators_metadata(
+                [
+                    indicators._IndicatorMetadata(column, tb._fields[column])
+                    for tb, column in columns
+                    if isinstance(tb, Table)
+                ],
+                operation=operation,
+                name=new_column,
+            )
+            combined[key] = meta
+            fields[new_column] = meta.copy() if copy else meta
+    return fields
+
+
 def merge(
     left: Table | pd.DataFrame,
     right: Table | pd.DataFrame,
@@ -2115,18 +2288,19 @@ def merge(
         lefts_rights = []
 
     # copy to avoid warnings
-    left = left.copy(deep=False)
-    right = right.copy(deep=False)
+    left = _copy_sharing_metadata(left)
+    right = _copy_sharing_metadata(right)
     for left_col, right_col in lefts_rights:
         left[left_col], right[right_col] = align_categoricals(left[left_col], right[right_col])
 
     # Create merged table.
     tb = Table(
         # There's a weird bug that removes metadata of the left table. I could not replicate it with unit test
-        # It is necessary to copy metadata here to avoid mutating passed left.
+        # Merging plain dataframes makes sure that pandas doesn't propagate (and later mutate) metadata of left.
+        # Metadata of all columns is set below anyway.
         pd.merge(
-            left=left.copy(deep=False),
-            right=right.copy(deep=False),
+            left=pd.DataFrame(left, copy=False),
+            right=pd.DataFrame(right, copy=False),
             how=how,
             on=on,
             left_on=left_on,
@@ -2160,28 +2334,26 @@ def merge(
     columns_from_left = set(left.all_columns) - set(common_columns)
     columns_from_right = set(right.all_columns) - set(common_columns)
 
+    sources: dict[str, list[tuple[pd.DataFrame, str]]] = {}
     for column in columns_from_left:
         if column in overlapping_columns:
             new_column = f"{column}{suffixes[0]}"
         else:
             new_column = column
-        tb[new_column].metadata = indicators.combine_indicators_metadata(  # ty: ignore[invalid-assignment]
-            [left[column]], operation="merge", name=column
-        )
+        sources[new_column] = [(left, column)]
 
     for column in columns_from_right:
         if column in overlapping_columns:
             new_column = f"{column}{suffixes[1]}"
         else:
             new_column = column
-        tb[new_column].metadata = indicators.combine_indicators_metadata(  # ty: ignore[invalid-assignment]
-            [right[column]], operation="merge", name=column
-        )
+        sources[new_column] = [(right, column)]
 
     for column in common_columns:
-        tb[column].metadata = indicators.combine_indicators_metadata(
-            [left[column], right[column]], operation="merge", name=column
-        )
+        sources[column] = [(left, column), (right, column)]
+
+    # metadata of the merged table must not share objects with left and right tables
+    tb._fields.update(_combine_columns_metadata(sources, operation="merge", copy=True))
 
     # Update table metadata.
     tb.metadata = combine_tables_metadata(tables=cast(list[Table], [left, right]), short_name=short_name)
@@ -2251,11 +2423,12 @@ def concat(
 
         # Add to each column either the metadata of the original variable (if the variable appeared only in one of the input
         # tables) or the combination of the metadata from different tables (if the variable appeared in various tables).
-        for column in table.all_columns:
-            variables_to_combine = [table_i[column] for table_i in objs if column in table_i.all_columns]
-            table._fields[column] = indicators.combine_indicators_metadata(
-                variables=variables_to_combine, operation="concat", name=column
-            )
+        columns_i = [set(table_i.all_columns) for table_i in objs]
+        sources = {
+            column: [(table_i, column) for table_i, columns in zip(objs, columns_i) if column in columns]
+            for column in table.all_columns
+        }
+        table._fields.update(_combine_columns_metadata(sources, operation="concat"))
 
     # Update table metadata.
     table.metadata = combine_tables_metadata(tables=objs, short_name=short_name)
@@ -0,0 +1,124 @@
+import hashlib
+from pathlib import Path
+
+import pandas as pd
+import pytest
+import requests
+
+from owid.catalog import Table
+from owid.catalog.api import cache as cache_module
+from owid.catalog.api import tables
+from owid.catalog.api.cache import FileCache
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, content: bytes = b"", etag: str | None = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {"ETag": etag} if etag else {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}")
+
+    def iter_content(self, chunk_size):
+        yield self.content
+
+
+class FakeServer:
+    """Serves files from a dict and answers conditional requests like the catalog."""
+
+    def __init__(self, files: dict[str, bytes]):
+        self.files = files
+        self.requests: list[tuple[str, int]] = []
+
+    def get(self, url, headers=None, **kwargs):
+        if url not in self.files:
+            response = FakeResponse(404)
+        else:
+            etag = f'"{hashlib.md5(self.files[url]).hexdigest()}"'
+            if (headers or {}).get("If-None-Match") == etag:
+                response = FakeResponse(304)
+            else:
+                response = FakeResponse(200, self.files[url], etag)
+        self.requests.append((url, response.status_code))
+        return response
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = FakeServer({})
+    monkeypatch.setattr(cache_module, "session", server)
+    return server
+
+
+def test_fetch_revalidates(tmp_path, server):
+    cache = FileCache(tmp_path, max_size=2**20)
+    url = "https://catalog.example.com/garden/ns/2024/ds/tb.feather"
+    server.files[url] = b"first"
+
+    path = cache.fetch(url)
+    assert Path(path).read_bytes() == b"first"
+
+    # unchanged file is not downloaded again
+    assert cache.fetch(url) == path
+    assert [status for _, status in server.requests] == [200, 304]
+
+    # changed file is downloaded again
+    server.files[url] = b"second"
+    assert Path(cache.fetch(url)).read_bytes() == b"second"
+
+
+def test_fetch_offline(tmp_path, server, monkeypatch):
+    cache = FileCache(tmp_path, max_size=2**20)
+    url = "https://catalog.example.com/a.csv"
+    server.files[url] = b"a"
+    path = cache.fetch(url)
+
+    def offline(*args, **kwargs):
+        raise requests.ConnectionError()
+
+    monkeypatch.setattr(server, "get", offline)
+    assert cache.fetch(url) == path
+    with pytest.raises(requests.ConnectionError):
+        cache.fetch("https://catalog.example.com/b.csv")
+
+
+def test_evict_least_recently_used(tmp_path, server):
+    cache = FileCache(tmp_path, max_size=10)
+    urls = [f"https://catalog.example.com/{i}.csv" for i in range(3)]
+    for url in urls:
+        server.files[url] = b"12345"
+    paths = [cache.fetch(url) for url in urls[:2]]
+    # access the first file again, so that the second one is the least recently used
+    cache.fetch(urls[0])
+    cache.fetch(urls[2])
+
+    cache.evict()
+    assert [cache._lookup(url) is not None for url in urls] == [True, False, True]
+    assert not tmp_path.joinpath(paths[1]).exists()
+
+
+def test_load_table_from_cache(tmp_path, server, monkeypatch):
+    tb = Table(pd.DataFrame({"country": ["France", "Spain"], "value": [1, 2]}), short_name="tb")
+    tb["value"].metadata.unit = "people"
+    tb = tb.set_index("country")
+    tb.to_feather(tmp_path / "tb.feather")
+
+    base = "https://catalog.example.com/garden/ns/2024/ds/tb"
+    server.files[base + ".feather"] = (tmp_path / "tb.feather").read_bytes()
+    server.files[base + ".meta.json"] = (tmp_path / "tb.meta.json").read_bytes()
+    monkeypatch.setattr(tables, "get_cache", lambda: FileCache(tmp_path / "cache", max_size=2**30))
+
+    for _ in range(2):
+        tb_loaded = tables._load_table("garden/ns/2024/ds/tb", catalog_url="https://catalog.example.com/")
+        assert tb_loaded["value"].tolist() == [1, 2]
+        assert tb_loaded["value"].metadata.unit == "people"
+
+    assert [status for _, status in server.requests] == [200, 200, 304, 304]
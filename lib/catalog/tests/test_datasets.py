@@ -244,6 +244,64 @@ def test_add_table_parquet():
         assert t2.equals_table(t)
 
 
+@pytest.mark.parametrize("format", ["feather", "parquet"])
+def test_read_columns_and_filters(format):
+    t = Table(
+        pd.DataFrame(
+            {
+                "country": ["France", "France", "Spain", "Spain"],
+                "year": [2000, 2001, 2000, 2001],
+                "gdp": [1.0, 2.0, 3.0, 4.0],
+                "population": [10, 20, 30, 40],
+            }
+        ).set_index(["country", "year"]),
+        short_name="gdp",
+    )
+    t.gdp.metadata.title = "GDP"
+    t.population.metadata.title = "Population"
+
+    with temp_dataset_dir() as dirname:
+        ds = Dataset.create_empty(dirname)
+        ds.add(t, formats=[format])
+
+        t2 = ds.read("gdp", reset_index=False, safe_types=False, columns=["gdp"], filters=[("year", ">=", 2001)])
+
+        # primary key is always loaded, and only the selected rows are indexed
+        assert list(t2.columns) == ["gdp"]
+        assert t2.index.names == ["country", "year"]
+        assert t2.gdp.tolist() == [2.0, 4.0]
+        assert t2.gdp.metadata.title == "GDP"
+        # metadata is only kept for loaded columns
+        assert "population" not in t2._fields
+
+        # filter on a column that is not selected, with OR of two conditions
+        t3 = ds.read(
+            "gdp",
+            safe_types=False,
+            columns=["population"],
+            filters=[[("country", "==", "Spain"), ("year", "==", 2000)], [("gdp", "<", 2)]],
+        )
+        assert t3.population.tolist() == [10, 30]
+
+
+def test_read_mmap():
+    t = mock_table()
+
+    with temp_dataset_dir() as dirname:
+        ds = Dataset.create_empty(dirname)
+        with patch("owid.catalog.core.tables.FEATHER_COMPRESSION", "uncompressed"):
+            ds.add(t, formats=["feather"])
+
+        t2 = ds.read(t.metadata.checked_name, reset_index=False, mmap=True)
+
+        # columns are backed by the memory-mapped Arrow buffers
+        assert all(isinstance(dtype, pd.ArrowDtype) for dtype in t2.dtypes)
+        assert t2.index.names == t.index.names
+        for col in t.columns:
+            assert t2[col].tolist() == t[col].tolist()
+            assert t2[col].metadata == t[col].metadata
+
+
 def test_add_table_json():
     t = mock_table()
 
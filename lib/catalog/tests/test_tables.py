@@ -126,6 +126,18 @@ def test_saving_empty_table_fails():
         t.to_feather("/tmp/example.feather")
 
 
+def test_feather_compression_from_env(monkeypatch):
+    monkeypatch.delenv("FEATHER_COMPRESSION", raising=False)
+    assert tables._feather_compression_from_env() == "zstd"
+
+    monkeypatch.setenv("FEATHER_COMPRESSION", "uncompressed")
+    assert tables._feather_compression_from_env() == "uncompressed"
+
+    monkeypatch.setenv("FEATHER_COMPRESSION", "gzip")
+    with pytest.raises(ValueError, match="FEATHER_COMPRESSION"):
+        tables._feather_compression_from_env()
+
+
 # The parametrize decorator runs this test multiple times with different formats
 @pytest.mark.parametrize("format", ["csv", "feather", "parquet", "json"])
 def test_round_trip_no_metadata(format: FileFormat) -> None:
@@ -616,6 +628,27 @@ def test_merge_with_dimensions(table_1, table_2) -> None:
     assert tb.c.m.dimensions == {"sex": "female"}
 
 
+def test_merge_does_not_share_metadata_with_inputs(table_1, table_2) -> None:
+    # columns sharing the same metadata object
+    table_1["b"].metadata = table_1["a"].metadata
+    tb = tables.merge(table_1, table_2, on=["country", "year"])
+
+    assert tb.b.m == tb.a_x.m
+    assert tb.b.m is not tb.a_x.m
+    tb.a_x.m.origins[0].title = "New title"
+    assert table_1.a.m.origins[0].title != "New title"
+    assert tb.b.m.origins[0].title != "New title"
+
+
+def test_concat_columns_sharing_metadata(table_1) -> None:
+    table_1["b"].metadata = table_1["a"].metadata
+    tb = tables.concat([table_1, table_1])
+
+    assert tb.b.m == tb.a.m
+    tb.a.m.title = "New title"
+    assert tb.b.m.title != "New title"
+
+
 def test_concat_categoricals(table_1, table_2, origins) -> None:
     table_1.country.m.origins = [origins[1]]
     table_2.loc[0, "country"] = "Poland"
@@ -275,36 +275,62 @@ def are_equal(
     return equal, compared  # ty: ignore[invalid-return-type]
 
 
-def _calculate_weighted_mean(
-    group_data: pd.DataFrame,
-    value_col: str,
-    weight_col: str,
+def _calculate_weighted_means(
+    df: pd.DataFrame,
+    groupby_columns: list[str],
+    weighted_aggregations: dict[str, str],
     num_allowed_nans: int | None = None,
     frac_allowed_nans: float | None = None,
     min_num_values: int | None = None,
-) -> float:
-    """Calculate weighted mean for a group, applying NaN handling rules."""
-    values = group_data[value_col]
-    weights = group_data[weight_col]
-
-    # Apply same NaN handling logic as regular aggregations
-    total_count = len(values)
-    mask = ~(pd.isna(values) | pd.isna(weights) | (weights == 0))
-    valid_values = values[mask]
-    valid_weights = weights[mask]
-    valid_count = len(valid_values)
+) -> pd.DataFrame:
+    """Calculate weighted means of several columns for all groups at once, applying NaN handling rules.
+
+    A value is considered missing if either the value or its weight is nan, or if its weight is zero. Sums of
+    value*weight and of weights over the valid values of all columns are computed in a single grouped sum.
+    """
+    columns = list(weighted_aggregations)
+    numerators = []
+    denominators = []
+    valid_masks = []
+    for col in columns:
+        weight_col = weighted_aggregations[col].replace("mean_weighted_by_", "")
+        if weight_col not in df.columns:
+            raise ValueError(f"Weight column '{weight_col}' not found in data")
+
+        values = df[col].to_numpy(dtype=float, na_value=np.nan)
+        weights = df[weight_col].to_numpy(dtype=float, na_value=np.nan)
+        valid = ~(np.isnan(values) | np.isnan(weights) | (weights == 0))
+        numerators.append(np.where(valid, values * weights, 0.0))
+        denominators.append(np.where(valid, weights, 0.0))
+        valid_masks.append(valid)
+
+    # Sum numerators, denominators, number of valid values and number of elements of each group in one pass.
+    n = len(columns)
+    data = np.column_stack(numerators + denominators + valid_masks + [np.ones(len(df))])
+    # Groupby keys can be columns or index levels, as in df.groupby(groupby_columns).
+    keys = [df[c] if c in df.columns else df.index.get_level_values(c) for c in groupby_columns]
+    sums = pd.DataFrame(data, index=df.index).groupby(keys, dropna=False, observed=True).sum()  # ty: ignore
+    numerator = sums.iloc[:, :n].to_numpy()
+    denominator = sums.iloc[:, n : 2 * n].to_numpy()
+    valid_count = sums.iloc[:, 2 * n : 3 * n].to_numpy()
+    total_count = sums.iloc[:, [3 * n]].to_numpy()
     nan_count = total_count - valid_count
 
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = numerator / denominator
+
     # Apply NaN handling rules to follow the same logic as for the non-weighted aggregations (defined in groupby_agg).
-    if (num_allowed_nans is not None) and (nan_count > num_allowed_nans):
-        return np.nan
-    if (frac_allowed_nans is not None) and (total_count > 0) and (nan_count / total_count > frac_allowed_nans):
-        return np.nan
-    if (min_num_values is not None) and (valid_count < min_num_values) and (nan_count > 0):
-        return np.nan
-    if len(valid_values) == 0:
-        return np.nan
-    return float(np.average(valid_values, weights=valid_weights))
+    invalid = valid_count == 0
+    if num_allowed_nans is not None:
+        invalid |= nan_count > num_allowed_nans
+    if frac_allowed_nans is not None:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            invalid |= (total_count > 0) & (nan_count / total_count > frac_allowed_nans)
+    if min_num_values is not None:
+        invalid |= (valid_count < min_num_values) & (nan_count > 0)
+    means[invalid] = np.nan
+
+    return pd.DataFrame(means, index=sums.index, columns=columns)
 
 
 def groupby_agg(
@@ -433,18 +459,11 @@ def groupby_agg(
             )
 
         # Add weighted mean columns
-        for col, agg_func in weighted_aggregations.items():
-            weight_col = agg_func.replace("mean_weighted_by_", "")
-            if weight_col not in df.columns:
-                raise ValueError(f"Weight column '{weight_col}' not found in data")
-
-            weighted_results = df.groupby(groupby_columns, dropna=False, observed=True).apply(
-                lambda group: _calculate_weighted_mean(
-                    group, col, weight_col, num_allowed_nans, frac_allowed_nans, min_num_values
-                ),
-                include_groups=False,
-            )
-            grouped[col] = weighted_results  # ty: ignore
+        weighted_means = _calculate_weighted_means(
+            df, groupby_columns, weighted_aggregations, num_allowed_nans, frac_allowed_nans, min_num_values
+        )
+        for col in weighted_aggregations:
+            grouped[col] = weighted_means[col]  # ty: ignore
     else:
         # No weighted aggregations; use standard grouping logic
         grouped = df.groupby(groupby_columns, **groupby_kwargs).agg(aggregations)  # ty: ignore
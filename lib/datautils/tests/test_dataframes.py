@@ -874,6 +874,27 @@ class TestGroupbyAggregate:
         assert abs(result_a - expected_a) < 0.01
         assert abs(result_b - expected_b) < 0.01
 
+    def test_weighted_aggregation_groupby_index_level(self):
+        """Test weighted aggregation when a groupby key is an index level."""
+        df_in = pd.DataFrame(
+            {
+                "year": [2020, 2020, 2020, 2020],
+                "category": ["A", "A", "B", "B"],
+                "value": [100, 200, 300, 400],
+                "weight": [1, 2, 3, 4],
+            }
+        ).set_index("year")
+
+        result = dataframes.groupby_agg(
+            df_in, ["year", "category"], aggregations={"value": "mean_weighted_by_weight", "weight": "sum"}
+        )
+
+        expected = pd.DataFrame(
+            {"weight": [3, 7], "value": [(100 * 1 + 200 * 2) / (1 + 2), (300 * 3 + 400 * 4) / (3 + 4)]},
+            index=pd.MultiIndex.from_tuples([(2020, "A"), (2020, "B")], names=["year", "category"]),
+        )
+        assert dataframes.are_equal(df1=expected, df2=result, verbose=True)[0]
+
     def test_weighted_aggregation_mixed_with_regular(self):
         """Test mixing weighted and regular aggregations in same call."""
         df_in = pd.DataFrame(
@@ -1030,6 +1051,36 @@ class TestGroupbyAggregate:
         assert abs(result.loc[2020, "gdp"] - expected_gdp_2020) < 0.01
         assert abs(result.loc[2020, "emissions"] - expected_emissions_2020) < 0.01
 
+    def test_weighted_aggregation_multiple_columns_with_nan_handling(self):
+        """Test that NaN handling rules are applied independently to each weighted column."""
+        df_in = pd.DataFrame(
+            {
+                "year": [2020, 2020, 2020, 2021, 2021, 2021],
+                "age": ["0-14", "0-14", "15+", "0-14", "0-14", "15+"],
+                "gdp": [100, np.nan, 300, 150, 250, np.nan],
+                "emissions": pd.array([10, 30, 50, None, None, 70], dtype="Int64"),
+                "population": [10, 20, 30, 15, 25, 35],
+                "area": [5, 15, 25, 7, 18, 0],
+            }
+        )
+
+        result = dataframes.groupby_agg(
+            df_in,
+            ["year", "age"],
+            aggregations={"gdp": "mean_weighted_by_population", "emissions": "mean_weighted_by_area"},
+            min_num_values=2,
+        )
+
+        # Only one valid value out of two.
+        assert pd.isna(result.loc[(2020, "0-14"), "gdp"])
+        # All values valid, even if fewer than min_num_values.
+        assert result.loc[(2020, "15+"), "gdp"] == 300
+        assert abs(result.loc[(2020, "0-14"), "emissions"] - (10 * 5 + 30 * 15) / (5 + 15)) < 0.01
+        assert abs(result.loc[(2021, "0-14"), "gdp"] - (150 * 15 + 250 * 25) / (15 + 25)) < 0.01
+        # No valid values (missing values, or zero weight).
+        assert pd.isna(result.loc[(2021, "0-14"), "emissions"])
+        assert pd.isna(result.loc[(2021, "15+"), "emissions"])
+
     def test_weighted_aggregation_with_lambda_functions(self):
         """Test weighted aggregation mixed with lambda aggregations (common in ETL)."""
         df_in = pd.DataFrame(
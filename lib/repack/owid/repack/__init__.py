@@ -1,4 +1,5 @@
 import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, cast
 
 import numpy as np
@@ -9,6 +10,7 @@ def repack_frame(
     df: pd.DataFrame,
     remap: dict[str, str] | None = None,
     dtypes: dict[str, Any] | None = {},
+    workers: int = 1,
 ) -> pd.DataFrame:
     """
     Convert the DataFrame's columns to the most compact types possible.
@@ -18,6 +20,7 @@ def repack_frame(
     Args:
         remap: remap column names
         dtypes: dictionary of fixed dtypes to use
+        workers: number of threads repacking columns in parallel
     """
     if df.index.names != [None]:
         raise ValueError("repacking is lost for index columns")
@@ -33,10 +36,15 @@ def repack_frame(
         df.reset_index(inplace=True)
 
     # repack each column into the best dtype we can give it
-    df = pd.concat(
-        [repack_series(df.loc[:, col]) if col not in dtypes else df[col] for col in df.columns],
-        axis=1,
-    )
+    def _repack_column(col: str) -> pd.Series:
+        return repack_series(df.loc[:, col]) if col not in dtypes else df[col]
+
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            columns = list(executor.map(_repack_column, df.columns))
+    else:
+        columns = [_repack_column(col) for col in df.columns]
+    df = pd.concat(columns, axis=1)
 
     # use given dtypes
     if dtypes:
@@ -65,16 +73,67 @@ def repack_series(s: pd.Series) -> pd.Series:
     if dtype_name in ("int64", "uint64"):
         return shrink_integer(s.astype("Int64"))
 
-    if dtype_name in ("object", "str", "string", "float64"):
-        for strategy in [to_int, to_float, to_category]:
+    if dtype_name == "float64":
+        return _repack_float(s.to_numpy(dtype="float64", na_value=np.nan), s.isnull().to_numpy(), s)
+
+    if dtype_name in ("object", "str", "string"):
+        # parse values only once, then pick the dtype from the parsed floats
+        try:
+            r = _to_float(s)
+        except (ValueError, TypeError, OverflowError):
             try:
-                return strategy(s)
-            except (ValueError, TypeError, OverflowError):
-                continue
+                return to_category(s)
+            except ValueError:
+                return s
+        return _repack_float(r.to_numpy(dtype="float64", na_value=np.nan), r.isnull().to_numpy(), s)
 
     return s
 
 
+def _repack_float(values: np.ndarray, mask: np.ndarray, s: pd.Series) -> pd.Series:
+    """Pack float values with missing values in `mask` into the smallest nullable dtype that represents them.
+
+    Gives the same result as trying `to_int` and then `to_float`, but converts values only once and picks the
+    integer size from their min and max.
+    """
+    if mask.all():
+        # shrink all NaNs to Int8
+        return _series(pd.arrays.IntegerArray(np.zeros(len(values), dtype="int8"), mask.copy()), s)
+
+    # zero is a placeholder for missing values, it fits in any integer dtype
+    values = np.where(mask, 0.0, values)
+    with np.errstate(invalid="ignore"):
+        ints = values.astype("int64")
+
+    if series_eq(ints, values):
+        dtype = _integer_dtype(ints.min(), ints.max())
+        return _series(pd.arrays.IntegerArray(ints.astype(dtype.numpy_dtype), mask.copy()), s)
+
+    values32 = values.astype("float32")
+    if series_eq(values, values32):
+        return _series(pd.arrays.FloatingArray(values32, mask.copy()), s)
+    return _series(pd.arrays.FloatingArray(values, mask.copy()), s)
+
+
+def _series(values: Any, s: pd.Series) -> pd.Series:
+    return pd.Series(values, index=s.index, name=s.name, copy=False)
+
+
+def _integer_dtype(lo: int, hi: int) -> Any:
+    """Return the smallest nullable integer dtype for values between `lo` and `hi`. We don't bother with UInt64."""
+    if lo < 0:
+        options = [pd.Int8Dtype(), pd.Int16Dtype(), pd.Int32Dtype()]
+    else:
+        options = [pd.UInt8Dtype(), pd.UInt16Dtype(), pd.UInt32Dtype()]
+
+    for dtype in options:
+        info = np.iinfo(dtype.numpy_dtype)
+        if info.min <= lo and hi <= info.max:
+            return dtype
+
+    return pd.Int64Dtype()
+
+
 def _to_float(s: pd.Series) -> pd.Series:
     """Convert series to Float64. Replace numpy NaNs with NA. This can
     happen when original series is an object and contains 'nan' string."""
@@ -106,20 +165,8 @@ def shrink_integer(s: pd.Series) -> pd.Series:
     if s.isnull().all():
         # shrink all NaNs to Int8
         return s.astype("Int8")
-    else:
-        if s.min() < 0:
-            series = ["Int32", "Int16", "Int8"]
-        else:
-            series = ["UInt32", "UInt16", "UInt8"]
-
-    for dtype in series:
-        v = s.astype(dtype)
-        if not (v == s).all():
-            break
-
-        s = v
 
-    return s
+    return s.astype(_integer_dtype(s.min(), s.max()))
 
 
 def to_float(s: pd.Series) -> pd.Series:
@@ -351,3 +351,24 @@ def test_to_safe_types_with_nan():
     # Ensure that the NA value in 'cat_col' remains pd.NA and not the string "NA"
     assert pd.isna(df_safe["cat_col"].iloc[1])
     assert df_safe["cat_col"].iloc[1] is pd.NA
+
+
+def test_repack_frame_workers():
+    df = pd.DataFrame(
+        {
+            "myint": [1, 2, None, 300],
+            "myfloat": [1.2, 2.0, 3.0, None],
+            "mycat": ["a", None, "b", "c"],
+            "myintstr": ["1", "2", "3", "-4"],
+        }
+    )
+
+    assert_frame_equal(repack.repack_frame(df.copy(), workers=4), repack.repack_frame(df.copy()))
+
+
+def test_repack_float64_with_nan_value():
+    # NaN that is not missing can't be an integer
+    s = pd.Series(pd.arrays.FloatingArray(np.array([1.0, np.nan, 0.0]), np.array([False, False, True])))
+    v = repack.repack_series(s)
+    assert v.dtype.name == "Float32"
+    assert v.isnull().sum() == 1
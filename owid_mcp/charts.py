@@ -2,7 +2,6 @@ import io
 import urllib.parse
 from typing import Any
 
-import httpx
 import pandas as pd
 import structlog
 from fastmcp import FastMCP
@@ -10,9 +9,8 @@ from fastmcp.utilities.types import Image
 from mcp.types import ImageContent
 from pydantic import BaseModel
 
-from etl.http import HEADERS
-from owid_mcp.config import HTTP_TIMEOUT
 from owid_mcp.data_utils import make_algolia_request
+from owid_mcp.http_client import fetch_cached
 
 log = structlog.get_logger()
 
@@ -77,10 +75,8 @@ async def _fetch_chart_data_impl(
     query_string = urllib.parse.urlencode(query_params)
     fetch_url = f"{csv_url}?{query_string}"
 
-    async with httpx.AsyncClient(timeout=HTTP_TIMEOUT, headers=HEADERS) as client:
-        resp = await client.get(fetch_url)
-        resp.raise_for_status()
-        csv_content = resp.text
+    resp = await fetch_cached(fetch_url)
+    csv_content = resp.text
 
     # Process CSV - remove Entity column if Code column has no empty values
     df = pd.read_csv(io.StringIO(csv_content))
@@ -173,10 +169,8 @@ async def fetch_chart_image(id: str, time: str | None = None, countries: str | N
     png_url = f"{png_url}?{query_string}"
 
     try:
-        async with httpx.AsyncClient(timeout=HTTP_TIMEOUT, headers=HEADERS) as client:
-            resp = await client.get(png_url)
-            resp.raise_for_status()
-            png_bytes = resp.content
+        resp = await fetch_cached(png_url)
+        png_bytes = resp.content
 
         # Use FastMCP Image utility to create proper ImageContent
         img_obj = Image(data=png_bytes, format="png")
@@ -18,6 +18,11 @@ ALGOLIA_URL = f"https://{ALGOLIA_APP_ID.lower()}-dsn.algolia.net/1/indexes/*/que
 
 # HTTP configuration
 HTTP_TIMEOUT = httpx.Timeout(10.0)
+HTTP_MAX_CONNECTIONS = int(os.getenv("OWID_MCP_MAX_CONNECTIONS", "50"))
+
+# In-process cache of responses (indicator data and metadata, charts, SQL queries)
+HTTP_CACHE_TTL = float(os.getenv("OWID_MCP_CACHE_TTL", "300"))
+HTTP_CACHE_SIZE = int(os.getenv("OWID_MCP_CACHE_SIZE", "256"))
 
 # SQL tool configuration
 MAX_ROWS_DEFAULT = 1000
@@ -12,22 +12,20 @@ import urllib.parse
 from pathlib import Path
 from typing import Any
 
-import httpx
 import structlog
 import yaml
 from owid.catalog.core import CatalogPath
 
-from etl.http import HEADERS
 from owid_mcp.config import (
     ALGOLIA_API_KEY,
     ALGOLIA_APP_ID,
     ALGOLIA_URL,
     CATALOG_BASE,
     DATASETTE_BASE,
-    HTTP_TIMEOUT,
     MAX_ROWS_DEFAULT,
     MAX_ROWS_HARD,
 )
+from owid_mcp.http_client import fetch_json_cached, get_client
 
 log = structlog.get_logger()
 
@@ -112,13 +110,13 @@ async def _make_algolia_request_base(request_config: dict[str, Any], log_prefix:
         "x-algolia-agent": "OWID-MCP (python)",
     }
 
-    async with httpx.AsyncClient(timeout=HTTP_TIMEOUT) as client:
+    async with get_client() as client:
         resp = await client.post(ALGOLIA_URL, json=payload, headers=headers)
-        resp.raise_for_status()
-        response_data = resp.json()
-        hits = response_data["results"][0].get("hits", [])
-        log.debug(f"{log_prefix}.response", hits_count=len(hits))
-        return hits
+    resp.raise_for_status()
+    response_data = resp.json()
+    hits = response_data["results"][0].get("hits", [])
+    log.debug(f"{log_prefix}.response", hits_count=len(hits))
+    return hits
 
 
 async def make_algolia_request(query: str, limit: int = 10) -> list[dict[str, Any]]:
@@ -242,45 +240,44 @@ async def run_sql(query: str, max_rows: int = MAX_ROWS_DEFAULT) -> dict[str, Any
     # Use JSON endpoint for better error handling
     datasette_json_url = f"{DATASETTE_BASE}?{qs}"
 
-    async with httpx.AsyncClient(timeout=HTTP_TIMEOUT, headers=HEADERS) as client:
-        resp = await client.get(datasette_json_url)
-
-        json_data = resp.json()
-
-        # Check if there's an error in the JSON response
-        if "error" in json_data and json_data["error"] is not None:
-            error_msg = json_data["error"]
-
-            # Handle specific case: DuckDB's "missing column" binder error, e.g.
-            # 'Binder Error: Referenced column "abc" not found in FROM clause!\n...'
-            column_match = DUCKDB_MISSING_COLUMN_RE.search(error_msg) if isinstance(error_msg, str) else None
-            if column_match:
-                column_name = column_match.group(1)
-                error_msg = (
-                    f"SQL Error: Column '{column_name}' does not exist in the table. "
-                    f"You can check columns with: SELECT column_name FROM information_schema.columns WHERE table_name = 'table_name';"
-                )
-            # For all other errors, just pass through the original message
-            else:
-                error_msg = f"SQL Query Error: {error_msg}"
-
-            # Return error information in a structured way that LLM can understand
-            return {
-                "csv": "",
-                "source": datasette_json_url,
-                "error": error_msg,
-            }
-
-        # Success - convert JSON to CSV format
-        rows = json_data["rows"]
-        columns = json_data["columns"]
-
-        # Create CSV content using csv module
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(columns)  # Header
-        writer.writerows(rows)  # Data rows
-        csv_content = output.getvalue()
+    # Identical queries are answered from the cache, including SQL errors (which Datasette returns as JSON with
+    # status 400), but not transient errors like rate limits or server errors
+    json_data = await fetch_json_cached(datasette_json_url, raise_for_status=False, cache_error_statuses={400})
+
+    # Check if there's an error in the JSON response
+    if "error" in json_data and json_data["error"] is not None:
+        error_msg = json_data["error"]
+
+        # Handle specific case: DuckDB's "missing column" binder error, e.g.
+        # 'Binder Error: Referenced column "abc" not found in FROM clause!\n...'
+        column_match = DUCKDB_MISSING_COLUMN_RE.search(error_msg) if isinstance(error_msg, str) else None
+        if column_match:
+            column_name = column_match.group(1)
+            error_msg = (
+                f"SQL Error: Column '{column_name}' does not exist in the table. "
+                f"You can check columns with: SELECT column_name FROM information_schema.columns WHERE table_name = 'table_name';"
+            )
+        # For all other errors, just pass through the original message
+        else:
+            error_msg = f"SQL Query Error: {error_msg}"
+
+        # Return error information in a structured way that LLM can understand
+        return {
+            "csv": "",
+            "source": datasette_json_url,
+            "error": error_msg,
+        }
+
+    # Success - convert JSON to CSV format
+    rows = json_data["rows"]
+    columns = json_data["columns"]
+
+    # Create CSV content using csv module
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(columns)  # Header
+    writer.writerows(rows)  # Data rows
+    csv_content = output.getvalue()
 
     return {
         "csv": csv_content,
@@ -422,11 +419,8 @@ def build_efficient_rows(data_json: dict[str, Any], entities_meta: dict[int, dic
 
 
 async def fetch_json(url: str) -> dict[str, Any]:
-    """Fetch JSON data from a URL."""
-    async with httpx.AsyncClient(timeout=HTTP_TIMEOUT, headers=HEADERS) as client:
-        resp = await client.get(url)
-        resp.raise_for_status()
-        return resp.json()
+    """Fetch JSON data from a URL, reusing recent responses. The returned data is shared and must not be modified."""
+    return await fetch_json_cached(url)
 
 
 def rows_to_csv(rows: list[dict[str, Any]]) -> str:
@@ -0,0 +1,144 @@
+"""
+OWID HTTP Client
+----------------
+Shared HTTP client and in-process response cache for MCP modules.
+
+The server answers bursts of tool calls hitting the same popular indicators, charts and queries, so
+responses are cached for a short time and concurrent requests for the same resource share a single
+download. Connections are reused through a pooled client kept open for the lifetime of the server.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Container, Hashable
+from contextlib import asynccontextmanager
+from typing import Any
+
+import httpx
+
+from etl.http import HEADERS
+from owid_mcp.config import HTTP_CACHE_SIZE, HTTP_CACHE_TTL, HTTP_MAX_CONNECTIONS, HTTP_TIMEOUT
+
+# Pooled client shared by all requests while the server is running
+_CLIENT: httpx.AsyncClient | None = None
+
+
+@asynccontextmanager
+async def client_lifespan() -> AsyncIterator[httpx.AsyncClient]:
+    """Open the shared pooled client for the lifetime of the server."""
+    global _CLIENT
+    limits = httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_CONNECTIONS)
+    async with httpx.AsyncClient(timeout=HTTP_TIMEOUT, headers=HEADERS, limits=limits) as client:
+        _CLIENT = client
+        try:
+            yield client
+        finally:
+            _CLIENT = None
+
+
+@asynccontextmanager
+async def get_client() -> AsyncIterator[httpx.AsyncClient]:
+    """Return the shared pooled client, or a short-lived client when used outside of the server (e.g. in scripts)."""
+    if _CLIENT is not None:
+        yield _CLIENT
+    else:
+        async with httpx.AsyncClient(timeout=HTTP_TIMEOUT, headers=HEADERS) as client:
+            yield client
+
+
+class AsyncTTLCache:
+    """Cache of results of coroutines, with a time to live and least recently used eviction.
+
+    Concurrent calls for a key that is not cached share a single call of `fetch`, and only successful results are
+    cached. Cached values are shared between callers, so they must not be modified.
+    """
+
+    def __init__(self, maxsize: int = HTTP_CACHE_SIZE, ttl: float = HTTP_CACHE_TTL) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                return entry[1]
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._store(key, t))
+        # a cancelled caller must not cancel the download shared with other callers
+        return await asyncio.shield(task)
+
+    def _store(self, key: Hashable, task: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None or self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, task.result())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Responses of GET requests, and their parsed JSON, keyed by URL
+_RESPONSE_CACHE = AsyncTTLCache()
+_JSON_CACHE = AsyncTTLCache()
+
+
+async def _get(url: str, raise_for_status: bool) -> httpx.Response:
+    async with get_client() as client:
+        resp = await client.get(url)
+    if raise_for_status:
+        resp.raise_for_status()
+    return resp
+
+
+async def fetch_cached(url: str, raise_for_status: bool = True) -> httpx.Response:
+    """GET the URL, reusing a recent response to the same URL.
+
+    Raises:
+        httpx.HTTPStatusError: If the response is an error and `raise_for_status` is set (then it is not cached).
+    """
+    return await _RESPONSE_CACHE.get((url, raise_for_status), lambda: _get(url, raise_for_status))
+
+
+class _Uncached(Exception):
+    """Carries a result out of the cache without storing it."""
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+
+async def fetch_json_cached(url: str, raise_for_status: bool = True, cache_error_statuses: Container[int] = ()) -> Any:
+    """GET the URL and parse its JSON, reusing a recent result for the same URL. The result must not be modified.
+
+    If `raise_for_status` is unset, the JSON of error responses is returned too, but only cached if their status is
+    in `cache_error_statuses` (e.g. errors that the server gives for every identical request). Transient errors like
+    429 or 5xx are not cached.
+    """
+
+    async def fetch() -> Any:
+        resp = await _get(url, raise_for_status)
+        if resp.is_success or resp.status_code in cache_error_statuses:
+            return resp.json()
+        raise _Uncached(resp.json())
+
+    try:
+        return await _JSON_CACHE.get((url, raise_for_status), fetch)
+    except _Uncached as e:
+        return e.value
+
+
+def clear_cache() -> None:
+    """Forget all cached responses."""
+    _RESPONSE_CACHE.clear()
+    _JSON_CACHE.clear()
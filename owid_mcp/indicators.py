@@ -1,4 +1,5 @@
 import asyncio
+from collections import defaultdict
 from typing import Any
 
 import structlog
@@ -10,6 +11,7 @@ from owid_mcp.config import (
 )
 from owid_mcp.data_utils import build_efficient_rows, fetch_json
 from owid_mcp.data_utils import run_sql as _run_sql
+from owid_mcp.http_client import AsyncTTLCache
 from owid_mcp.semantic_search import semantic_search_indicators
 
 log = structlog.get_logger()
@@ -96,43 +98,54 @@ async def _fetch_indicator_metadata_impl(indicator_id: int) -> dict[str, Any]:
     meta_url = f"{OWID_API_BASE}/{indicator_id}.metadata.json"
     metadata = await fetch_json(meta_url)
 
-    # Filter metadata to remove large dimensions and origins data
-    metadata.pop("dimensions", None)
-    metadata.pop("origins", None)
+    # Filter metadata to remove large dimensions and origins data (without modifying the cached metadata)
+    return {k: v for k, v in metadata.items() if k not in ("dimensions", "origins")}
 
-    return metadata
+
+class IndicatorEntities:
+    """Entities of an indicator, indexed by their lowercase name and code for filtering."""
+
+    def __init__(self, metadata: dict[str, Any]):
+        # Build mapping from numeric id -> {name, code}
+        self.entities_meta = {
+            ent["id"]: {"name": ent["name"], "code": ent["code"]}
+            for ent in metadata["dimensions"]["entities"]["values"]
+        }
+        # Build mapping from lowercase name or code -> names of matching entities
+        self.names_by_key: dict[str, set[str]] = defaultdict(set)
+        for ent_meta in self.entities_meta.values():
+            for key in (ent_meta["name"], ent_meta["code"]):
+                if key:
+                    self.names_by_key[key.lower()].add(ent_meta["name"])
+
+    def filter(self, entity: str) -> dict[int, dict[str, str]]:
+        """Return entities whose name or code matches the given one (case-insensitive)."""
+        names = self.names_by_key.get(entity.lower(), set())
+        return {eid: meta for eid, meta in self.entities_meta.items() if meta["name"] in names}
+
+
+_ENTITIES_CACHE = AsyncTTLCache()
+
+
+async def _fetch_indicator_entities(indicator_id: int) -> IndicatorEntities:
+    """Fetch entities of an indicator, reusing the index of recently used indicators."""
+
+    async def fetch() -> IndicatorEntities:
+        return IndicatorEntities(await fetch_json(f"{OWID_API_BASE}/{indicator_id}.metadata.json"))
+
+    return await _ENTITIES_CACHE.get(indicator_id, fetch)
 
 
 async def _fetch_indicator_data_impl(indicator_id: int, entity: str | None = None) -> list[dict[str, Any]]:
     """Core implementation for fetching indicator data."""
     # Fetch OWID raw data + metadata concurrently
     data_url = f"{OWID_API_BASE}/{indicator_id}.data.json"
-    meta_url = f"{OWID_API_BASE}/{indicator_id}.metadata.json"
-    data_json, metadata = await asyncio.gather(fetch_json(data_url), fetch_json(meta_url))
-
-    # Build mapping from numeric id -> {name, code}
-    entities_meta = {
-        ent["id"]: {"name": ent["name"], "code": ent["code"]} for ent in metadata["dimensions"]["entities"]["values"]
-    }
-
-    rows = build_efficient_rows(data_json, entities_meta)
-
-    # Optional server-side filter for a single entity
-    if entity is not None:
-        ent_lower = entity.lower()
-        filtered_rows = []
-        for r in rows:
-            if r["entity"] and r["entity"].lower() == ent_lower:
-                filtered_rows.append(r)
-            else:
-                # Check if entity matches any code in entities_meta
-                for ent_meta in entities_meta.values():
-                    if ent_meta["code"] and ent_meta["code"].lower() == ent_lower and ent_meta["name"] == r["entity"]:
-                        filtered_rows.append(r)
-                        break
-        rows = filtered_rows
-
-    return rows
+    data_json, entities = await asyncio.gather(fetch_json(data_url), _fetch_indicator_entities(indicator_id))
+
+    # Optional server-side filter for a single entity, by skipping rows of other entities
+    entities_meta = entities.entities_meta if entity is None else entities.filter(entity)
+
+    return build_efficient_rows(data_json, entities_meta)
 
 
 @mcp.tool(tags={"indicator", "metadata"})
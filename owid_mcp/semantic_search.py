@@ -2,10 +2,8 @@
 
 from typing import Any
 
-import httpx
-
-from etl.http import HEADERS
-from owid_mcp.config import HTTP_TIMEOUT, SEARCH_API_URL
+from owid_mcp.config import SEARCH_API_URL
+from owid_mcp.http_client import get_client
 
 
 async def semantic_search_indicators(query: str, limit: int = 10) -> list[dict[str, Any]]:
@@ -20,10 +18,10 @@ async def semantic_search_indicators(query: str, limit: int = 10) -> list[dict[s
         List of indicator results with similarity scores
     """
     # Make HTTP request to the Search API
-    async with httpx.AsyncClient(timeout=HTTP_TIMEOUT, headers=HEADERS) as client:
+    async with get_client() as client:
         response = await client.get(f"{SEARCH_API_URL}/indicators", params={"query": query, "limit": limit})
-        response.raise_for_status()
-        data = response.json()
+    response.raise_for_status()
+    data = response.json()
 
     # Convert API response to expected MCP format
     results = []
@@ -15,6 +15,7 @@ from etl.config import enable_sentry
 # Import the modular servers
 from owid_mcp import charts, indicators, posts
 from owid_mcp.config import COMMON_ENTITIES
+from owid_mcp.http_client import client_lifespan
 
 enable_sentry(enable_logs=True, integrations=[MCPIntegration()])
 
@@ -48,8 +49,9 @@ async def lifespan(app: FastMCP) -> AsyncIterator[None]:
     app.mount(indicators.mcp)
     app.mount(posts.mcp)
     app.mount(charts.mcp)
-    yield
-    # Shutdown: cleanup if needed
+    # Share a pool of connections between all requests
+    async with client_lifespan():
+        yield
 
 
 # NOTE:
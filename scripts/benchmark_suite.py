@@ -0,0 +1,420 @@
+"""Benchmark suite of catalog I/O and table operations on synthetic datasets.
+
+Times reading and writing tables (feather and parquet), `repack_frame`, saving and reading datasets, `merge`, `concat`,
+arithmetic of indicators and region aggregates on synthetic tables of several sizes (rows x columns x cardinality of
+categorical columns), and saves the results as JSON. Indicators carry rich metadata, and the `wide` size (few rows, many
+columns) is dominated by its handling; `merge_pandas` and `concat_pandas` do the same operations on plain pandas
+objects, which gives the overhead of metadata. Results can be compared against a baseline to flag regressions:
+
+    python scripts/benchmark_suite.py run --output baseline.json
+    (make some changes)
+    python scripts/benchmark_suite.py run --output current.json
+    python scripts/benchmark_suite.py compare baseline.json current.json
+
+Each benchmark runs in a fresh process, so that its peak resident memory (RSS) can be recorded, and `compare` exits with
+an error if any benchmark got slower or uses more memory than allowed. Everything runs offline, on data written to a
+temporary directory.
+"""
+
+import json
+import multiprocessing
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from itertools import pairwise
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import click
+import numpy as np
+import pandas as pd
+import pyarrow
+from owid.catalog import Dataset, DatasetMeta, License, Origin, Table, VariableMeta
+from owid.catalog.core import tables
+from owid.repack import repack_frame
+
+from etl.data_helpers.geo import RegionAggregator
+
+
+class Size(NamedTuple):
+    rows: int
+    columns: int
+    # Number of countries, and of distinct values of categorical columns
+    cardinality: int
+
+
+SIZES = {
+    "small": Size(rows=10_000, columns=10, cardinality=50),
+    "medium": Size(rows=100_000, columns=50, cardinality=200),
+    "large": Size(rows=1_000_000, columns=100, cardinality=1_000),
+    "wide": Size(rows=1_000, columns=2_000, cardinality=100),
+}
+
+
+def _create_synthetic_table(size: Size, seed: int) -> Table:
+    """Create a table indexed by country and year with a mix of floats, integers stored as floats and categories."""
+    rng = np.random.default_rng(seed)
+    num_years = max(size.rows // size.cardinality, 1)
+    countries = [f"Country {i}" for i in range(size.cardinality)]
+    categories = [f"Category {i}" for i in range(size.cardinality)]
+    n = size.cardinality * num_years
+
+    data: dict[str, Any] = {
+        "country": pd.Categorical(np.repeat(countries, num_years)),
+        "year": np.tile(np.arange(2024 - num_years, 2024), size.cardinality),
+        "population": rng.integers(10_000, 100_000_000, n).astype(float),
+    }
+    for i in range(size.columns):
+        if i % 10 == 9:
+            values = pd.Categorical(rng.choice(categories, n), categories=categories)
+        elif i % 5 == 4:
+            # Integers stored as floats, which are shrunk by repacking
+            values = rng.integers(0, 1_000, n).astype(float)
+        else:
+            values = rng.lognormal(size=n)
+            # Leave some values missing, as in real data.
+            values[rng.random(n) < 0.2] = np.nan
+        data[f"indicator_{i}"] = values
+
+    tb = Table(data, short_name="benchmark").set_index(["country", "year"])
+    origin = Origin(producer="Producer", title="Synthetic data", date_published="2024-01-01")
+    for column in tb.columns:
+        tb[column].metadata = VariableMeta(
+            title=column.capitalize(),
+            unit="people",
+            short_unit="",
+            origins=[origin],
+            licenses=[License(name="CC BY 4.0")],
+            description_key=["First key point.", "Second key point."],
+            display={"numDecimalPlaces": 1},
+            processing_level="minor",
+        )
+    return tb
+
+
+def _create_regions_dataset(
+    path: Path, countries: list[str], num_regions: int, seed: int
+) -> tuple[Dataset, dict[str, Any]]:
+    """Create a regions dataset with one row per country, and custom regions with random members of different sizes."""
+    rng = np.random.default_rng(seed)
+    n = len(countries)
+    tb_regions = Table(
+        {
+            "code": [f"C{i:04d}" for i in range(n)],
+            "name": countries,
+            "region_type": ["country"] * n,
+            "is_historical": [False] * n,
+            "members": ["[]"] * n,
+            "successors": ["[]"] * n,
+            "related": ["[]"] * n,
+            "aliases": ["[]"] * n,
+        },
+        short_name="regions",
+    ).set_index("code")
+    ds = Dataset.create_empty(path, metadata=DatasetMeta(short_name="regions", namespace="benchmark"))
+    ds.add(tb_regions)
+    ds.save()
+    regions = {
+        f"Region {i}": {"custom_members": list(rng.choice(countries, size=rng.integers(2, n // 2 + 3), replace=False))}
+        for i in range(num_regions)
+    }
+    return ds, regions
+
+
+# Benchmarks prepare their inputs (which is not timed) and return the operation to time
+def _bench_to_feather(tb: Table, path: Path) -> Callable[[], Any]:
+    return lambda: tb.to_feather(path / "benchmark.feather", repack=False)
+
+
+def _bench_read_feather(tb: Table, path: Path) -> Callable[[], Any]:
+    tb.to_feather(path / "benchmark.feather")
+    return lambda: Table.read_feather(path / "benchmark.feather")
+
+
+def _bench_to_parquet(tb: Table, path: Path) -> Callable[[], Any]:
+    return lambda: tb.to_parquet(path / "benchmark.parquet", repack=False)
+
+
+def _bench_read_parquet(tb: Table, path: Path) -> Callable[[], Any]:
+    tb.to_parquet(path / "benchmark.parquet")
+    return lambda: Table.read_parquet(path / "benchmark.parquet")
+
+
+def _bench_repack_frame(tb: Table, path: Path) -> Callable[[], Any]:
+    df = pd.DataFrame(tb).reset_index()
+    return lambda: repack_frame(df)
+
+
+def _bench_dataset_save(tb: Table, path: Path) -> Callable[[], Any]:
+    def save() -> None:
+        ds = Dataset.create_empty(
+            path / "benchmark", metadata=DatasetMeta(short_name="benchmark", namespace="benchmark")
+        )
+        ds.add(tb)
+        ds.save()
+
+    return save
+
+
+def _bench_dataset_read(tb: Table, path: Path) -> Callable[[], Any]:
+    _bench_dataset_save(tb, path)()
+    ds = Dataset(path / "benchmark")
+    return lambda: ds.read("benchmark")
+
+
+def _split_columns(tb: Table) -> tuple[Table, Table]:
+    tb = tb.reset_index()
+    columns = list(tb.columns[2:])
+    return tb[["country", "year"] + columns[: len(columns) // 2]], tb[
+        ["country", "year"] + columns[len(columns) // 2 :]
+    ]
+
+
+def _split_years(tb: Table) -> tuple[Table, Table]:
+    # Split by year, as when appending new data to old data
+    tb = tb.reset_index()
+    return tb[tb["year"] < tb["year"].median()], tb[tb["year"] >= tb["year"].median()]
+
+
+def _bench_merge(tb: Table, path: Path) -> Callable[[], Any]:
+    tb_left, tb_right = _split_columns(tb)
+    return lambda: tables.merge(tb_left, tb_right, on=["country", "year"], how="outer")
+
+
+def _bench_merge_pandas(tb: Table, path: Path) -> Callable[[], Any]:
+    df_left, df_right = (pd.DataFrame(t) for t in _split_columns(tb))
+    return lambda: pd.merge(df_left, df_right, on=["country", "year"], how="outer")
+
+
+def _bench_concat(tb: Table, path: Path) -> Callable[[], Any]:
+    tb_old, tb_new = _split_years(tb)
+    return lambda: tables.concat([tb_old, tb_new], ignore_index=True)
+
+
+def _bench_concat_pandas(tb: Table, path: Path) -> Callable[[], Any]:
+    df_old, df_new = (pd.DataFrame(t) for t in _split_years(tb))
+    return lambda: pd.concat([df_old, df_new], ignore_index=True)
+
+
+def _bench_arithmetic(tb: Table, path: Path) -> Callable[[], Any]:
+    columns = [column for column in tb.columns if pd.api.types.is_numeric_dtype(tb[column])]
+
+    def add_columns() -> None:
+        # Each sum combines the metadata of both indicators
+        for column, next_column in pairwise(columns):
+            tb[column] + tb[next_column]
+
+    return add_columns
+
+
+def _bench_region_aggregator(tb: Table, path: Path) -> Callable[[], Any]:
+    tb = tb.reset_index()
+    tb["country"] = tb["country"].astype(str)
+    ds_regions, regions = _create_regions_dataset(
+        path / "regions", countries=list(tb["country"].unique()), num_regions=40, seed=0
+    )
+    numeric_columns = [column for column in tb.columns[2:] if pd.api.types.is_numeric_dtype(tb[column])]
+    # Alternate sums and population-weighted means.
+    aggregations = {
+        column: "sum" if i % 2 == 0 else "mean_weighted_by_population" for i, column in enumerate(numeric_columns)
+    }
+    aggregations["population"] = "sum"
+    aggregator = RegionAggregator(
+        ds_regions=ds_regions,
+        regions_all=list(regions),
+        aggregations=aggregations,
+        regions=regions,
+        # Income groups are not used, but passing a dataset avoids loading it.
+        ds_income_groups=ds_regions,
+    )
+    tb = tb[["country", "year"] + numeric_columns]
+    return lambda: aggregator.add_aggregates(tb, check_for_region_overlaps=False)
+
+
+BENCHMARKS: dict[str, Callable[[Table, Path], Callable[[], Any]]] = {
+    "to_feather": _bench_to_feather,
+    "read_feather": _bench_read_feather,
+    "to_parquet": _bench_to_parquet,
+    "read_parquet": _bench_read_parquet,
+    "repack_frame": _bench_repack_frame,
+    "dataset_save": _bench_dataset_save,
+    "dataset_read": _bench_dataset_read,
+    "merge": _bench_merge,
+    "merge_pandas": _bench_merge_pandas,
+    "concat": _bench_concat,
+    "concat_pandas": _bench_concat_pandas,
+    "arithmetic": _bench_arithmetic,
+    "region_aggregator": _bench_region_aggregator,
+}
+
+
+def _max_rss_mb() -> float:
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return max_rss / 1024**2 if sys.platform == "darwin" else max_rss / 1024
+
+
+def _run_benchmark(name: str, size_name: str, repeat: int, seed: int) -> dict[str, Any]:
+    """Run a benchmark and return its timings and peak memory. Meant to be run in a fresh process."""
+    size = SIZES[size_name]
+    with tempfile.TemporaryDirectory() as tmp:
+        tb = _create_synthetic_table(size, seed=seed)
+        func = BENCHMARKS[name](tb, Path(tmp))
+        setup_rss_mb = _max_rss_mb()
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    return {
+        "benchmark": name,
+        "size": size_name,
+        **size._asdict(),
+        "seconds": min(timings),
+        "timings": timings,
+        "setup_rss_mb": round(setup_rss_mb, 1),
+        "peak_rss_mb": round(_max_rss_mb(), 1),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@click.group()
+def cli() -> None:
+    """Benchmark catalog I/O and table operations on synthetic datasets."""
+
+
+@cli.command()
+@click.option(
+    "--size",
+    "sizes",
+    multiple=True,
+    type=click.Choice(list(SIZES)),
+    default=["small", "medium", "wide"],
+    show_default=True,
+    help="Sizes of synthetic tables (can be repeated).",
+)
+@click.option(
+    "--benchmark",
+    "benchmarks",
+    multiple=True,
+    type=click.Choice(list(BENCHMARKS)),
+    help="Benchmarks to run (can be repeated). All by default.",
+)
+@click.option("--repeat", default=3, show_default=True, help="Number of repetitions (the fastest one is reported).")
+@click.option("--seed", default=0, show_default=True, help="Seed for the synthetic data.")
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default="benchmark.json",
+    show_default=True,
+    help="JSON file to save results to.",
+)
+def run(sizes: tuple[str, ...], benchmarks: tuple[str, ...], repeat: int, seed: int, output: Path) -> None:
+    """Run benchmarks and save their results."""
+    # Processes are spawned rather than forked, so that they don't inherit memory of this one
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for size_name in sizes:
+        for name in benchmarks or BENCHMARKS:
+            with context.Pool(1) as pool:
+                result = pool.apply(_run_benchmark, (name, size_name, repeat, seed))
+            click.echo(
+                f"{name} ({size_name}): {result['seconds']:.3f}s, peak RSS {result['peak_rss_mb']:.0f} MB "
+                f"({result['peak_rss_mb'] - result['setup_rss_mb']:+.0f} MB over setup)"
+            )
+            results.append(result)
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "packages": {"numpy": np.__version__, "pandas": pd.__version__, "pyarrow": pyarrow.__version__},
+        "repeat": repeat,
+        "seed": seed,
+        "results": results,
+    }
+    output.write_text(json.dumps(report, indent=2))
+    click.echo(f"Results saved to {output}")
+
+
+@cli.command()
+@click.argument("baseline", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.argument("current", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--threshold", default=0.2, show_default=True, help="Maximum allowed relative increase of time (0.2 is 20%)."
+)
+@click.option(
+    "--min-seconds",
+    default=0.01,
+    show_default=True,
+    help="Increases of time smaller than this are considered noise.",
+)
+@click.option(
+    "--memory-threshold",
+    default=0.2,
+    show_default=True,
+    help="Maximum allowed relative increase of peak RSS over setup (0.2 is 20%).",
+)
+@click.option(
+    "--min-memory-mb",
+    default=10.0,
+    show_default=True,
+    help="Increases of peak RSS smaller than this are considered noise.",
+)
+def compare(
+    baseline: Path, current: Path, threshold: float, min_seconds: float, memory_threshold: float, min_memory_mb: float
+) -> None:
+    """Compare results of CURRENT against BASELINE and fail if there are regressions."""
+    results_baseline = {(r["benchmark"], r["size"]): r for r in json.loads(baseline.read_text())["results"]}
+    results_current = {(r["benchmark"], r["size"]): r for r in json.loads(current.read_text())["results"]}
+
+    regressions = []
+    for key, result in results_current.items():
+        name = f"{key[0]} ({key[1]})"
+        if key not in results_baseline:
+            click.echo(f"  {name}: {result['seconds']:.3f}s (not in baseline)")
+            continue
+        result_baseline = results_baseline[key]
+
+        seconds, seconds_baseline = result["seconds"], result_baseline["seconds"]
+        # Memory used by the operation itself, excluding its inputs
+        memory = result["peak_rss_mb"] - result["setup_rss_mb"]
+        memory_baseline = result_baseline["peak_rss_mb"] - result_baseline["setup_rss_mb"]
+
+        problems = []
+        if seconds > seconds_baseline * (1 + threshold) and seconds - seconds_baseline > min_seconds:
+            problems.append("slower")
+        if memory > memory_baseline * (1 + memory_threshold) and memory - memory_baseline > min_memory_mb:
+            problems.append("more memory")
+        if problems:
+            regressions.append(name)
+
+        click.echo(
+            f"{'!' if problems else ' '} {name}: {seconds_baseline:.3f}s -> {seconds:.3f}s "
+            f"({seconds / seconds_baseline:.2f}x), {memory_baseline:.0f} MB -> {memory:.0f} MB"
+            + (f"  REGRESSION: {', '.join(problems)}" if problems else "")
+        )
+
+    for key in results_baseline.keys() - results_current.keys():
+        click.echo(f"  {key[0]} ({key[1]}): missing in current results")
+
+    if regressions:
+        click.echo(f"{len(regressions)} regressions: {', '.join(regressions)}")
+        sys.exit(1)
+    click.echo("No regressions")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import shutil
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import torch
+
+from api_search import artifact, semantic_search
+from apps.wizard.app_pages.indicator_search.data import Indicator
+from apps.wizard.utils import embeddings as emb
+
+
+class StubEncoder:
+    """Stand-in for SentenceTransformer, encoding each text as a random vector seeded by the text."""
+
+    tokenizer = SimpleNamespace(name_or_path="stub/stub-encoder")
+
+    def encode(self, sentences, convert_to_tensor=False, **kwargs):
+        texts = [sentences] if isinstance(sentences, str) else sentences
+        vectors = np.stack(
+            [np.random.default_rng(int(hashlib.md5(t.encode()).hexdigest()[:8], 16)).normal(size=16) for t in texts]
+        ).astype(np.float32)
+        if isinstance(sentences, str):
+            vectors = vectors[0]
+        return torch.from_numpy(vectors) if convert_to_tensor else vectors
+
+
+INDICATORS = [
+    Indicator(
+        variableId=i,
+        name=name,
+        description=f"Description of {name}",
+        n_charts=i % 3,
+        catalogPath=f"grapher/ns/2024-01-01/ds/tb#indicator_{i}",
+        dataset="Dataset" if i % 2 else None,
+        popularity=i / 10,
+    )
+    for i, name in enumerate(["Population", "GDP per capita", "CO2 emissions", "Life expectancy", "Literacy rate"])
+]
+
+
+@pytest.fixture
+def stub_model(tmp_path, monkeypatch) -> StubEncoder:
+    model = StubEncoder()
+    monkeypatch.setattr(emb, "CACHE_DIR", tmp_path / "cache")
+    (tmp_path / "cache").mkdir()
+    # Build the ANN index too, if hnswlib is installed
+    monkeypatch.setattr(emb, "ANN_MIN_DOCS", 1)
+    monkeypatch.setattr(artifact, "_get_data_indicators_from_db", lambda: INDICATORS)
+    monkeypatch.setattr(artifact, "get_model", lambda: model)
+    monkeypatch.setattr(artifact, "_get_model", lambda model_name: model)
+    return model
+
+
+def _fake_artifact(path, format=artifact.FORMAT_VERSION):
+    path.mkdir(parents=True)
+    (path / "manifest.json").write_text(json.dumps({"format": format}))
+
+
+def test_build_and_load_artifact(tmp_path, stub_model):
+    artifact_dir = tmp_path / "artifacts"
+
+    path = artifact.build_artifact(artifact_dir)
+    loaded = artifact.load_artifact(path)
+
+    assert (path / "index.hnsw").exists() == (emb.hnswlib is not None)
+    assert (loaded.ann_index is not None) == (emb.hnswlib is not None)
+    assert loaded.docs == INDICATORS
+
+    # Search results are the same as those of the model fitted in memory
+    model = emb.EmbeddingsModel(stub_model).fit(INDICATORS)
+    for query in ["population", "emissions", "health"]:
+        expected = model.search(query, k=3)
+        results = loaded.search(query, k=3)
+        assert [doc.variableId for doc, _ in results] == [doc.variableId for doc, _ in expected]
+        assert [score for _, score in results] == pytest.approx([score for _, score in expected], abs=1e-6)
+
+
+def test_build_artifact_keeps_latest_versions(tmp_path, stub_model):
+    artifact_dir = tmp_path / "artifacts"
+    for version in ["20240101T000000", "20240201T000000", "20240301T000000"]:
+        _fake_artifact(artifact_dir / version)
+
+    path = artifact.build_artifact(artifact_dir)
+
+    versions = sorted(p.name for p in artifact_dir.iterdir() if not p.name.startswith("."))
+    assert len(versions) == artifact.KEEP_VERSIONS
+    assert versions == ["20240201T000000", "20240301T000000", path.name]
+
+
+def test_latest_version_ignores_incomplete_artifacts(tmp_path):
+    artifact_dir = tmp_path / "artifacts"
+    assert artifact.latest_version(artifact_dir) is None
+
+    _fake_artifact(artifact_dir / "20240101T000000")
+    # Hidden staging directory of an artifact being built, even with its manifest already written
+    _fake_artifact(artifact_dir / ".29990101T000000.tmp")
+    # Artifact without manifest, or of another format
+    (artifact_dir / "29990101T000000").mkdir()
+    _fake_artifact(artifact_dir / "29990201T000000", format=artifact.FORMAT_VERSION + 1)
+
+    assert artifact.latest_version(artifact_dir) == artifact_dir / "20240101T000000"
+
+
+def test_reload_latest_artifact(tmp_path, stub_model, monkeypatch):
+    artifact_dir = tmp_path / "artifacts"
+    monkeypatch.setattr(semantic_search, "latest_version", lambda: artifact.latest_version(artifact_dir))
+    for name in ["_indicators", "_embeddings_model", "_artifact_path", "_initialization_error"]:
+        monkeypatch.setattr(semantic_search, name, None)
+
+    path = artifact.build_artifact(artifact_dir)
+    semantic_search._reload_latest_artifact()
+    assert semantic_search._artifact_path == path
+    assert semantic_search._indicators == INDICATORS
+
+    # Switches to a newer artifact, but not to one that is still being built
+    newer_path = artifact_dir / "29990101T000000"
+    shutil.copytree(path, newer_path)
+    shutil.copytree(path, artifact_dir / ".29990201T000000.tmp")
+    semantic_search._reload_latest_artifact()
+    assert semantic_search._artifact_path == newer_path
+
+    # Older artifacts are ignored
+    shutil.rmtree(newer_path)
+    semantic_search._reload_latest_artifact()
+    assert semantic_search._artifact_path == newer_path
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+from sklearn.impute import SimpleImputer
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import OneClassSVM
+
+from apps.anomalist.detectors import AnomalyOneClassSVM, get_series_by_length, standard_scale_rows
+
+
+def _df() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "entity_name": ["France"] * 6 + ["Spain"] * 4 + ["Italy"] * 6,
+            "year": list(range(2000, 2006)) + list(range(2000, 2004)) + list(range(2000, 2006)),
+            1: rng.normal(size=16),
+            2: rng.normal(size=16),
+        }
+    )
+    df.loc[[1, 12], 1] = np.nan
+    # Series of zeros are skipped.
+    df.loc[df["entity_name"] == "Spain", 2] = 0
+    return df
+
+
+def test_get_series_by_length():
+    df = _df()
+    series = get_series_by_length(df, [1, 2])
+
+    assert sorted(series) == [4, 6]
+    rows, columns = series[6]
+    assert rows.tolist() == [list(range(6))] * 2 + [list(range(10, 16))] * 2
+    assert columns.tolist() == [0, 1, 0, 1]
+
+
+def test_standard_scale_rows_is_like_sklearn():
+    X = np.array([[1.0, np.nan, 3.0, 10.0], [0.1, 0.1, 0.1, np.nan], [-5.0, 2.0, 2.0, 2.5]])
+    expected = [StandardScaler().fit_transform(SimpleImputer().fit_transform(x.reshape(-1, 1))).ravel() for x in X]
+
+    np.testing.assert_allclose(standard_scale_rows(X), expected, atol=1e-12)
+
+
+def test_one_class_svm_scores_each_series():
+    df = _df()
+    df_score = AnomalyOneClassSVM(n_jobs=1).get_score_df(df, [1, 2], {})
+
+    for _, group in df.groupby("entity_name"):
+        for variable_id in [1, 2]:
+            series = group[[variable_id]]
+            if (series == 0).all().all():
+                assert (df_score.loc[group.index, variable_id] == 0).all()
+                continue
+            series_scaled = StandardScaler().fit_transform(SimpleImputer().fit_transform(series))
+            expected = (
+                OneClassSVM(kernel="rbf", gamma="scale", nu=0.05).fit(series_scaled).decision_function(series_scaled)
+            )
+            np.testing.assert_allclose(df_score.loc[group.index, variable_id], expected)
@@ -0,0 +1,80 @@
+import hashlib
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import torch
+
+from apps.wizard.utils import embeddings as emb
+
+
+class StubEncoder:
+    """Stand-in for SentenceTransformer, encoding each text as a random vector seeded by the text."""
+
+    tokenizer = SimpleNamespace(name_or_path="stub/stub-encoder")
+
+    def encode(self, sentences, convert_to_tensor=False, **kwargs):
+        texts = [sentences] if isinstance(sentences, str) else sentences
+        vectors = np.stack(
+            [np.random.default_rng(int(hashlib.md5(t.encode()).hexdigest()[:8], 16)).normal(size=16) for t in texts]
+        ).astype(np.float32)
+        if isinstance(sentences, str):
+            vectors = vectors[0]
+        return torch.from_numpy(vectors) if convert_to_tensor else vectors
+
+
+@dataclass
+class Document(emb.Doc):
+    name: str
+
+    def text(self) -> str:
+        return self.name
+
+
+QUERIES = ["population", "gdp per capita", "co2 emissions"]
+
+
+@pytest.fixture(params=[False, True], ids=["exact", "ann"])
+def model(request, tmp_path, monkeypatch) -> emb.EmbeddingsModel[Document]:
+    if request.param:
+        pytest.importorskip("hnswlib")
+    monkeypatch.setattr(emb, "CACHE_DIR", tmp_path)
+    # Use the ANN index for any number of documents, or never
+    monkeypatch.setattr(emb, "ANN_MIN_DOCS", 1 if request.param else 10**9)
+
+    model = emb.EmbeddingsModel(StubEncoder()).fit([Document(f"indicator {i}") for i in range(50)])
+    assert (model.ann_index is not None) == request.param
+    return model
+
+
+def _assert_search_is_like_sorted_documents(model: emb.EmbeddingsModel[Document], k: int) -> None:
+    for query in QUERIES:
+        expected = model.get_sorted_documents_by_similarity(query)[:k]
+        expected_scores = [doc.similarity for doc in expected]
+
+        results = model.search(query, k=k)
+
+        assert [doc.name for doc, _ in results] == [doc.name for doc in expected]
+        assert [score for _, score in results] == pytest.approx(expected_scores, abs=1e-5)
+
+
+@pytest.mark.parametrize("k", [1, 10, 50, 100])
+def test_search_is_like_sorted_documents(model, k):
+    # k larger than the number of documents returns all of them
+    _assert_search_is_like_sorted_documents(model, k)
+    assert len(model.search(QUERIES[0], k=k)) == min(k, len(model.docs))
+
+
+def test_search_k_zero(model):
+    assert model.search(QUERIES[0], k=0) == []
+
+
+def test_search_from_matrix(model):
+    # Rebuild the index, as when loading precomputed embeddings
+    index = emb.build_ann_index(model.matrix) if model.ann_index is not None else None
+    model_from_matrix = emb.EmbeddingsModel.from_matrix(model.model, model.docs, model.matrix.copy(), index=index)
+    # get_sorted_documents_by_similarity needs the embeddings, which precomputed models don't have
+    model_from_matrix.embeddings = model.embeddings
+
+    _assert_search_is_like_sorted_documents(model_from_matrix, k=10)
@@ -9,6 +9,7 @@ from apps.backport.datasync.data_metadata import (
     _convert_strings_to_numeric,
     variable_data,
     variable_metadata,
+    variables_metadata,
 )
 from etl.db import get_engine
 from etl.grapher.io import variable_data_df_from_s3
@@ -154,6 +155,47 @@ def test_variable_metadata():
     }
 
 
+def test_variables_metadata():
+    variable_df = pd.DataFrame(
+        {
+            "value": ["0.008", "0.038"],
+            "year": [2020, 2021],
+            "entityId": [273, 275],
+            "entityName": ["Africa", "Asia"],
+            "entityCode": [None, None],
+        }
+    )
+    other_variable_meta = {**_variable_meta(), "id": 525716, "shortName": "other"}
+    origins_df = pd.DataFrame({"descriptionSnapshot": ["Origin A", "Origin B"]})
+    faqs = [{"gdocId": "1", "fragmentId": "test"}]
+
+    with (
+        mock.patch(
+            "apps.backport.datasync.data_metadata._load_variables",
+            return_value={525715: _variable_meta(), 525716: other_variable_meta},
+        ),
+        mock.patch(
+            "apps.backport.datasync.data_metadata._load_origins_df_of_variables",
+            return_value={525715: origins_df, 525716: origins_df.iloc[:0]},
+        ),
+        mock.patch(
+            "apps.backport.datasync.data_metadata._load_faqs_of_variables",
+            return_value={525715: faqs, 525716: []},
+        ),
+        mock.patch(
+            "apps.backport.datasync.data_metadata._load_topic_tags_of_variables",
+            return_value={525715: ["Population"], 525716: []},
+        ),
+    ):
+        metas = variables_metadata(mock.Mock(), {525715: variable_df, 525716: variable_df})
+
+    # Same metadata as when loading variables one by one.
+    assert metas[525715] == _call_variable_metadata(525715, variable_df, _variable_meta())
+    assert metas[525716]["shortName"] == "other"
+    assert metas[525716]["origins"] == []
+    assert "faqs" not in metas[525716]["presentation"]
+
+
 def test_variable_data():
     data_df = pd.DataFrame(
         {
@@ -172,6 +214,29 @@ def test_variable_data():
     }
 
 
+@pytest.mark.parametrize(
+    "values",
+    [
+        pd.Series([-2.0, 2.1, 9.8e09, 1e20, 0.1 + 0.2]),
+        pd.Series([-2, 1, 2, 2**62 + 1, 0]),
+        pd.Series([1.5, 2.0, 3.25, 4.0, 5.0], dtype="Float64"),
+        pd.Series([0.1, 0.2, 0.3, 0.4, 0.5], dtype="float32"),
+        pd.Series(["-2", "1", "2.1", "UK", "nan"]),
+    ],
+)
+def test_variable_data_from_original_values(values):
+    data_df = pd.DataFrame(
+        {
+            "value": values.astype("string"),
+            "year": [2020, 2020, 2020, 2021, 2021],
+            "entityId": [273, 275, 276, 277, 294],
+        }
+    )
+
+    # Serializing the original values gives the same result as serializing their string representation
+    assert json.dumps(variable_data(data_df, values=values)) == json.dumps(variable_data(data_df))
+
+
 def test_variable_metadata_ordinal():
     variable_df = pd.DataFrame(
         {
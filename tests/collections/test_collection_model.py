@@ -8,13 +8,13 @@ It also tests the CollectionSet class for managing multiple collections.
 
 import warnings
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 from etl.collection.core.collection_set import CollectionSet
 from etl.collection.exceptions import DuplicateCollectionViews, DuplicateValuesError
-from etl.collection.model.core import Collection, Definitions
+from etl.collection.model.core import Collection, Definitions, replace_catalog_paths_with_ids
 from etl.collection.model.dimension import Dimension, DimensionChoice
 from etl.collection.model.view import Indicator, View, ViewIndicators
 
@@ -2452,3 +2452,86 @@ def test_warn_if_grapher_schema_unpinned(capsys):
 
     Collection.from_dict(_make_minimal_config(grapher_schema="011")).warn_if_grapher_schema_unpinned()
     assert capsys.readouterr().out == ""
+
+
+def test_replace_catalog_paths_with_ids_resolves_in_bulk():
+    """
+    Test replace_catalog_paths_with_ids - catalog paths not already known are resolved in a single lookup.
+    """
+    config = {
+        "views": [
+            {
+                "config": {
+                    "sortColumnSlug": "grapher/ns/2024-01-01/ds/tb#a",
+                    "map": {"columnSlug": "grapher/ns/2024-01-01/ds/tb#b"},
+                }
+            },
+            {
+                "config": {
+                    "sortColumnSlug": "grapher/ns/2024-01-01/ds/tb#a",
+                    "colorVariableId": "grapher/ns/2024-01-01/ds/tb#c",
+                }
+            },
+            {"config": {"xVariableId": "123"}},
+            {"dimensions": {}},
+        ]
+    }
+
+    with patch("etl.collection.model.core.map_indicator_paths_to_ids") as mock_map:
+        mock_map.return_value = {"grapher/ns/2024-01-01/ds/tb#c": 3, "123": 123}
+        config = replace_catalog_paths_with_ids(
+            config, indicator_ids={"grapher/ns/2024-01-01/ds/tb#a": 1, "grapher/ns/2024-01-01/ds/tb#b": 2}
+        )
+
+    mock_map.assert_called_once()
+    assert mock_map.call_args.args[0] == {"grapher/ns/2024-01-01/ds/tb#c", "123"}
+    assert config["views"][0]["config"] == {"sortColumnSlug": "1", "map": {"columnSlug": "2"}}
+    assert config["views"][1]["config"] == {"sortColumnSlug": "1", "colorVariableId": 3}
+    assert config["views"][2]["config"] == {"xVariableId": 123}
+
+
+def test_upsert_to_db_skips_unchanged_config(tmp_path: Path, monkeypatch):
+    """
+    Test Collection.upsert_to_db - a config is uploaded again only if it changed since the last upload.
+    """
+    monkeypatch.setattr("etl.collection.model.core.EXPORT_DIR", tmp_path)
+    monkeypatch.setattr("etl.config.FORCE_UPLOAD", False)
+    owid_env = MagicMock(admin_api="http://staging/admin/api")
+    collection = Collection.from_dict(_make_minimal_config())
+    collection._collection_type = "multidim"
+
+    with (
+        patch("etl.collection.model.core.AdminAPI") as mock_api,
+        patch("etl.collection.model.core.get_config_updated_at", return_value="2024-01-01 00:00:00") as mock_updated_at,
+    ):
+        collection.upsert_to_db(owid_env)
+        collection.upsert_to_db(owid_env)
+        assert mock_api.return_value.put_mdim_config.call_count == 1
+
+        # Changed config is uploaded
+        collection.title["title"] = "New title"
+        collection.upsert_to_db(owid_env)
+        assert mock_api.return_value.put_mdim_config.call_count == 2
+
+        # Same config is uploaded to a different environment
+        collection.upsert_to_db(MagicMock(admin_api="http://production/admin/api"))
+        assert mock_api.return_value.put_mdim_config.call_count == 3
+
+        # Same config is uploaded again if it was edited in the admin since the last upload
+        mock_updated_at.return_value = "2024-02-01 00:00:00"
+        collection.upsert_to_db(owid_env)
+        assert mock_api.return_value.put_mdim_config.call_count == 4
+
+        # ... or if it is missing on the server (deleted, or the server was rebuilt)
+        mock_updated_at.side_effect = [None, "2024-03-01 00:00:00"]
+        collection.upsert_to_db(owid_env)
+        assert mock_api.return_value.put_mdim_config.call_count == 5
+
+        # --force-upload sets the flag at runtime, after etl.collection was imported
+        mock_updated_at.side_effect = None
+        mock_updated_at.return_value = "2024-03-01 00:00:00"
+        collection.upsert_to_db(owid_env)
+        assert mock_api.return_value.put_mdim_config.call_count == 5
+        monkeypatch.setattr("etl.config.FORCE_UPLOAD", True)
+        collection.upsert_to_db(owid_env)
+        assert mock_api.return_value.put_mdim_config.call_count == 6
@@ -5,6 +5,8 @@ This module tests utility functions from etl.collection.utils that handle
 data manipulation, view processing, and configuration management.
 """
 
+from unittest.mock import patch
+
 import pytest
 
 
@@ -218,3 +220,29 @@ def test_resolve_grapher_schema_rejects_malformed_values():
     for value in ("latest", "0.11", "grapher-schema.011.json", "https://example.com/schema.json", ""):
         with pytest.raises(ValueError, match="Invalid `grapher_schema` value"):
             resolve_grapher_schema(value)
+
+
+def test_get_tables_by_name_mapping(tmp_path, monkeypatch):
+    import pandas as pd
+    from owid.catalog import Dataset, DatasetMeta, Table
+
+    from etl.collection import utils
+
+    monkeypatch.setattr(utils, "DATA_DIR", tmp_path)
+    ds = Dataset.create_empty(
+        tmp_path / "grapher/ns/2024-01-01/ds",
+        DatasetMeta(channel="grapher", namespace="ns", version="2024-01-01", short_name="ds"),
+    )
+    ds.add(Table(pd.DataFrame({"country": ["France"], "a": [1]}), short_name="tb").format(["country"]))
+
+    dependencies = {"data://grapher/ns/2024-01-01/ds", "data://garden/ns/2024-01-01/ds"}
+    expected = {"tb": ["grapher/ns/2024-01-01/ds/tb"], "ds/tb": ["grapher/ns/2024-01-01/ds/tb"]}
+    assert utils.get_tables_by_name_mapping(dependencies) == expected
+
+    # Table names are cached until the dataset changes
+    with patch.object(utils, "load_dataset_from_step") as mock_load:
+        assert utils.get_tables_by_name_mapping(dependencies) == expected
+    mock_load.assert_not_called()
+
+    ds.add(Table(pd.DataFrame({"country": ["France"], "b": [1]}), short_name="tb2").format(["country"]))
+    assert utils.get_tables_by_name_mapping(dependencies)["tb2"] == ["grapher/ns/2024-01-01/ds/tb2"]
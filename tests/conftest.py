@@ -1,6 +1,15 @@
 import httpx
 import pytest
 
+from etl import dag_helpers, files
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """Persist caches of ETL runs to a temporary folder instead of `data/`."""
+    monkeypatch.setattr(files.CHECKSUM_CACHE, "path", tmp_path / ".checksum_cache.json")
+    monkeypatch.setattr(dag_helpers.DAG_FILE_CACHE, "path", tmp_path / ".dag_cache.pkl")
+
 
 @pytest.fixture
 def mock_dag():
@@ -385,7 +385,7 @@ class TestListCountriesInRegions(unittest.TestCase):
 
 class TestListCountriesInRegionsThatMustHaveData(unittest.TestCase):
     def test_having_too_strict_condition_on_minimum_individual_contribution(self):
-        with self.assertWarns(UserWarning):
+        with warns(UserWarning):
             assert geo.list_countries_in_region_that_must_have_data(
                 region="Region 1",
                 reference_year=2020,
@@ -397,7 +397,7 @@ class TestListCountriesInRegionsThatMustHaveData(unittest.TestCase):
             ) == ["Country 2", "Country 1"]
 
     def test_having_too_strict_condition_on_minimum_cumulative_contribution(self):
-        with self.assertWarns(UserWarning):
+        with warns(UserWarning):
             assert geo.list_countries_in_region_that_must_have_data(
                 region="Region 1",
                 reference_year=2020,
@@ -411,7 +411,7 @@ class TestListCountriesInRegionsThatMustHaveData(unittest.TestCase):
     def test_having_too_strict_condition_on_both_minimum_individual_and_cumulative_contributions(
         self,
     ):
-        with self.assertWarns(UserWarning):
+        with warns(UserWarning):
             assert geo.list_countries_in_region_that_must_have_data(
                 region="Region 1",
                 reference_year=2020,
@@ -2872,6 +2872,36 @@ class TestRegionAggregator(unittest.TestCase):
         self.assertEqual(high_income_data["population"].iloc[0], expected_population)
         self.assertEqual(high_income_data["gdp"].iloc[0], expected_gdp)
 
+    def test_add_aggregates_of_overlapping_regions(self):
+        """Test that countries belonging to several regions contribute to all their aggregates."""
+        tb = Table(
+            {
+                "country": ["France", "Italy", "Russia", "France", "Italy", "Russia"],
+                "year": [2020, 2020, 2020, 2021, 2021, 2021],
+                "population": [67, 60, 146, 68, 59, 145],
+                "gdp_per_capita": [40.0, 30.0, 10.0, 42.0, np.nan, 12.0],
+            }
+        )
+        aggregator = geo.RegionAggregator(
+            ds_regions=self.ds_regions,
+            regions_all=self.regions_all,
+            regions=["Europe", "High-income countries"],
+            aggregations={"population": "sum", "gdp_per_capita": "mean_weighted_by_population"},
+            ds_income_groups=self.ds_income_groups,
+        )
+
+        result = aggregator.add_aggregates(tb, check_for_region_overlaps=False).set_index(["country", "year"])
+
+        self.assertEqual(result.loc[("Europe", 2020), "population"], 67 + 60 + 146)
+        self.assertEqual(result.loc[("High-income countries", 2020), "population"], 67 + 60)
+        self.assertEqual(result.loc[("High-income countries", 2021), "population"], 68 + 59)
+        self.assertAlmostEqual(result.loc[("Europe", 2021), "gdp_per_capita"], (42.0 * 68 + 12.0 * 145) / (68 + 145))
+        self.assertAlmostEqual(
+            result.loc[("High-income countries", 2020), "gdp_per_capita"], (40.0 * 67 + 30.0 * 60) / (67 + 60)
+        )
+        # Data for countries is kept unchanged.
+        self.assertEqual(result.loc[("Italy", 2021), "population"], 59)
+
     def test_add_aggregates_with_nans(self):
         """Test add_aggregates behavior with NaN values."""
         # Create data with some NaN values
@@ -0,0 +1,103 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from owid_mcp import http_client
+from owid_mcp.http_client import AsyncTTLCache
+from owid_mcp.indicators import IndicatorEntities
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    async def fetch(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return self.calls
+
+
+def test_cache_coalesces_concurrent_requests():
+    cache = AsyncTTLCache(maxsize=10, ttl=60)
+    counter = Counter()
+
+    async def main():
+        results = await asyncio.gather(*[cache.get("a", counter.fetch) for _ in range(5)])
+        return results + [await cache.get("a", counter.fetch)]
+
+    assert asyncio.run(main()) == [1] * 6
+    assert counter.calls == 1
+
+
+def test_cache_expires_and_evicts():
+    counter = Counter()
+
+    async def main(cache):
+        return [await cache.get(key, counter.fetch) for key in ["a", "b", "a"]]
+
+    # entries expire immediately
+    assert asyncio.run(main(AsyncTTLCache(maxsize=10, ttl=0))) == [1, 2, 3]
+    # "a" is evicted by "b"
+    assert asyncio.run(main(AsyncTTLCache(maxsize=1, ttl=60))) == [4, 5, 6]
+
+
+def test_cache_does_not_cache_errors():
+    cache = AsyncTTLCache(maxsize=10, ttl=60)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ValueError("error")
+        return "ok"
+
+    with pytest.raises(ValueError):
+        asyncio.run(cache.get("a", fetch))
+    assert asyncio.run(cache.get("a", fetch)) == "ok"
+
+
+def test_fetch_json_cached_only_caches_expected_errors():
+    responses = {
+        "http://example.test/ok": [200, 200],
+        "http://example.test/sql-error": [400, 200],
+        "http://example.test/rate-limited": [429, 200],
+    }
+
+    async def get(url, raise_for_status):
+        status = responses[url].pop(0)
+        return httpx.Response(status, json={"status": status})
+
+    async def main():
+        # each URL is requested twice
+        return [
+            (await http_client.fetch_json_cached(url, raise_for_status=False, cache_error_statuses={400}))["status"]
+            for url in responses
+            for _ in range(2)
+        ]
+
+    http_client.clear_cache()
+    with patch.object(http_client, "_get", side_effect=get):
+        assert asyncio.run(main()) == [200, 200, 400, 400, 429, 200]
+    http_client.clear_cache()
+
+
+def test_indicator_entities_filter_by_name_or_code():
+    metadata = {
+        "dimensions": {
+            "entities": {
+                "values": [
+                    {"id": 1, "name": "France", "code": "FRA"},
+                    {"id": 2, "name": "Spain", "code": "ESP"},
+                    {"id": 3, "name": "Africa (FAO)", "code": None},
+                ]
+            }
+        }
+    }
+    entities = IndicatorEntities(metadata)
+
+    assert entities.filter("france") == {1: {"name": "France", "code": "FRA"}}
+    assert entities.filter("esp") == {2: {"name": "Spain", "code": "ESP"}}
+    assert list(entities.filter("Africa (FAO)")) == [3]
+    assert entities.filter("Germany") == {}
@@ -71,6 +71,47 @@ def test_exec_graph_parallel():
     assert all(task in done for task in exec_graph.keys())
 
 
+def test_critical_path_lengths():
+    exec_graph = {
+        "a": set(),
+        "b": {"a"},
+        "c": {"a"},
+        "d": {"b"},
+    }
+    durations = {"a": 1.0, "b": 2.0, "c": 10.0, "d": 3.0}
+
+    lengths = cmd._critical_path_lengths(exec_graph, durations)
+
+    # each task plus its longest chain of dependent tasks
+    assert lengths == {"a": 11.0, "b": 5.0, "c": 10.0, "d": 3.0}
+    # bounded below by both the critical path and the total work split among workers
+    assert cmd._ideal_makespan(exec_graph, durations, workers=1) == 16.0
+    assert cmd._ideal_makespan(exec_graph, durations, workers=4) == 11.0
+
+
+def test_exec_graph_parallel_with_priorities():
+    started = []
+
+    exec_graph = {
+        "short": set(),
+        "long": set(),
+        "medium": set(),
+        "after_long": {"long"},
+    }
+
+    def mock_func(task: str, **kwargs):
+        started.append(task)
+
+    priorities = {"short": 1.0, "long": 10.0, "medium": 5.0, "after_long": 2.0}
+    cmd.exec_graph_parallel(
+        exec_graph, mock_func, continue_on_failure=False, workers=1, use_threads=True, priorities=priorities
+    )
+
+    # with a single worker, ready tasks start in order of priority, and a task that becomes ready
+    # later overtakes waiting tasks with lower priority
+    assert started == ["long", "medium", "after_long", "short"]
+
+
 def test_exec_graph_parallel_prints_traceback(capsys):
     def failing_func(task: str, **kwargs):
         raise ValueError(f"boom in {task}")
@@ -4,6 +4,7 @@ from pathlib import Path
 import pytest
 
 from etl.dag_helpers import (
+    DagFileCache,
     _parse_dag_yaml,
     flatten_dag_file,
     get_comments_above_step_in_dag,
@@ -1206,3 +1207,27 @@ steps:
         assert "data://garden/un/2022-07-11/un_wpp" in graph
         assert "data://meadow/un/2022-07-11/un_wpp" in graph
         assert graph["data://meadow/un/2022-07-11/un_wpp"] == {"snapshot://un/2022-07-11/un_wpp.zip"}
+
+
+def test_dag_file_cache_is_invalidated_when_file_changes(tmp_path):
+    dag_file = tmp_path / "dag.yml"
+    dag_file.write_text("steps:\n  data://garden/a/2024/a:\n    - snapshot://a/2024/a.csv\n")
+
+    cache = DagFileCache(tmp_path / "cache.pkl")
+    graph, includes = cache.load(dag_file)
+    assert graph == {"data://garden/a/2024/a": {"snapshot://a/2024/a.csv"}}
+    assert includes == []
+
+    # returned graphs can be modified without affecting the cache
+    graph["data://garden/a/2024/a"].add("data://meadow/a/2024/a")
+    assert cache.load(dag_file)[0] == {"data://garden/a/2024/a": {"snapshot://a/2024/a.csv"}}
+
+    # persisted entries are read by a new cache
+    cache.RACY_SECONDS = -1
+    cache.save()
+    assert DagFileCache(tmp_path / "cache.pkl").load(dag_file)[0] == {
+        "data://garden/a/2024/a": {"snapshot://a/2024/a.csv"}
+    }
+
+    dag_file.write_text("steps:\n  data://garden/b/2024/b:\n")
+    assert DagFileCache(tmp_path / "cache.pkl").load(dag_file)[0] == {"data://garden/b/2024/b": set()}
@@ -12,7 +12,9 @@ from owid.catalog.core.meta import Origin
 
 from etl.datadiff import (
     DatasetDiff,
+    DatasetError,
     RemoteDataset,
+    _align_tables,
     _changed_include_regex,
     _changed_records,
     _dataset_files_match,
@@ -224,6 +226,44 @@ def test_changed_records_all_appeared_disappeared_score_zero_median():
     assert all(r["anomaly score"] == "appeared" for r in records)
 
 
+def test_align_tables():
+    tb_a = Table(
+        pd.DataFrame(
+            {
+                "country": pd.Categorical(["Spain", "France", "France"], categories=["Spain", "France"]),
+                "year": [2020, 2021, np.nan],
+                "value": [1, 2, 3],
+            }
+        )
+    ).set_index(["country", "year"])
+    tb_a["value"].metadata.unit = "people"
+    tb_b = Table(
+        pd.DataFrame(
+            {
+                "country": pd.Categorical(["Brazil", "France", "Spain"]),
+                "year": [2020, 2021, 2020],
+                "value": [4, 5, 6],
+            }
+        )
+    ).set_index(["country", "year"])
+
+    tb_a, tb_b, eq_index, new_index, removed_index = _align_tables(tb_a, tb_b)
+
+    # union of rows sorted by category names with missing values last
+    assert tb_a.index.get_level_values("country").tolist() == ["Brazil", "France", "France", "Spain"]
+    assert tb_a.index.get_level_values("year").fillna(-1).tolist() == [2020, 2021, -1, 2020]
+    assert tb_b.index.equals(tb_a.index)
+    assert tb_a["value"].fillna(-1).tolist() == [-1, 2, 3, 1]
+    assert tb_b["value"].fillna(-1).tolist() == [4, 5, -1, 6]
+    assert tb_a["value"].metadata.unit == "people"
+    assert eq_index.tolist() == [False, True, False, True]
+    assert new_index.tolist() == [True, False, False, False]
+    assert removed_index.tolist() == [False, False, True, False]
+
+    with pytest.raises(DatasetError):
+        _align_tables(pd.concat([tb_a, tb_a]), tb_b)
+
+
 @pytest.mark.filterwarnings("ignore:Table `tab` does not have a primary_key")
 @patch.dict(os.environ, {"OWID_STRICT": ""})
 def test_new_year_data_not_scored_as_anomaly(tmp_path):
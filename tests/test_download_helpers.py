@@ -1,7 +1,11 @@
-"""Tests for etl.download_helpers, focused on the bot-challenge (Anubis) fallback."""
+"""Tests for etl.download_helpers, focused on the bot-challenge (Anubis) fallback and resumable downloads."""
 
+import hashlib
+import os
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from etl import download_helpers
 
 
@@ -82,3 +86,102 @@ def test_download_raises_when_both_user_agents_are_walled(tmp_path):
         else:
             raise AssertionError("expected DownloadCorrupted when both UAs are challenged")
     assert not out.exists()
+
+
+class _RangeServer:
+    """Serves `data` at any URL like R2, answering HEAD and range requests."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.ranges: list[str | None] = []
+
+    def head(self, url, **kwargs):
+        resp = MagicMock()
+        resp.headers = {"content-length": str(len(self.data)), "accept-ranges": "bytes"}
+        return resp
+
+    def get(self, url, headers=None, **kwargs):
+        range_header = (headers or {}).get("Range")
+        self.ranges.append(range_header)
+        data = self.data
+        if range_header:
+            start, _, end = range_header.removeprefix("bytes=").partition("-")
+            data = data[int(start) : int(end) + 1 if end else None]
+        resp = _file_response(data, content_type="application/octet-stream")
+        resp.status_code = 206 if range_header else 200
+        return resp
+
+
+@pytest.fixture
+def range_server():
+    server = _RangeServer(os.urandom(1000))
+    with (
+        patch.object(download_helpers.requests, "head", side_effect=server.head),
+        patch.object(download_helpers.requests, "get", side_effect=server.get),
+    ):
+        yield server
+
+
+def test_download_resumable_in_parts(tmp_path, range_server):
+    out = tmp_path / "f.bin"
+    md5 = download_helpers.download_resumable("http://example.test/f.bin", str(out), part_size=300, quiet=True)
+
+    assert out.read_bytes() == range_server.data
+    assert md5 == hashlib.md5(range_server.data).hexdigest()
+    assert sorted(range_server.ranges) == ["bytes=0-299", "bytes=300-599", "bytes=600-899", "bytes=900-999"]
+    assert os.listdir(tmp_path) == ["f.bin"]
+
+
+def test_download_resumable_resumes_partial_file(tmp_path, range_server):
+    out = tmp_path / "f.bin"
+    url = "http://example.test/f.bin"
+    partial = f"{out}.{hashlib.md5(url.encode()).hexdigest()[:8]}.part"
+    with open(partial, "wb") as f:
+        f.write(range_server.data[:400])
+    # partial download of another URL is discarded
+    (tmp_path / "f.bin.00000000.part").write_bytes(b"stale")
+
+    md5 = download_helpers.download_resumable(url, str(out), workers=1, quiet=True)
+
+    assert out.read_bytes() == range_server.data
+    assert md5 == hashlib.md5(range_server.data).hexdigest()
+    assert range_server.ranges == ["bytes=400-"]
+    assert os.listdir(tmp_path) == ["f.bin"]
+
+
+def test_download_resumable_skips_completed_parts(tmp_path, range_server):
+    out = tmp_path / "f.bin"
+    url = "http://example.test/f.bin"
+    partial = f"{out}.{hashlib.md5(url.encode()).hexdigest()[:8]}.part"
+    with open(f"{partial}1", "wb") as f:
+        f.write(range_server.data[500:])
+
+    download_helpers.download_resumable(url, str(out), part_size=500, quiet=True)
+
+    assert out.read_bytes() == range_server.data
+    assert range_server.ranges == ["bytes=0-499"]
+
+
+def test_download_resumable_keeps_parts_if_assembly_is_interrupted(tmp_path, range_server):
+    out = tmp_path / "f.bin"
+    url = "http://example.test/f.bin"
+    hash_file = download_helpers._hash_file
+
+    def interrupted_hash_file(filename, md5, out=None):
+        if filename.endswith("part2"):
+            raise KeyboardInterrupt
+        hash_file(filename, md5, out=out)
+
+    with (
+        patch.object(download_helpers, "_hash_file", side_effect=interrupted_hash_file),
+        pytest.raises(KeyboardInterrupt),
+    ):
+        download_helpers.download_resumable(url, str(out), part_size=300, quiet=True)
+
+    # parts are resumed from disk, including those already appended to the partial file
+    range_server.ranges.clear()
+    download_helpers.download_resumable(url, str(out), part_size=300, quiet=True)
+
+    assert out.read_bytes() == range_server.data
+    assert range_server.ranges == []
+    assert os.listdir(tmp_path) == ["f.bin"]
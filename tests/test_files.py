@@ -1,3 +1,5 @@
+import os
+
 import numpy as np
 import pandas as pd
 
@@ -84,3 +86,63 @@ def test_checksum_dict():
 def test_checksum_df():
     df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "x", "y"]})
     assert files.checksum_df(df) == "34c7a3a435e4a0703b37904f09f967f1"
+
+
+def test_checksum_cache(tmp_path):
+    cache = files.ChecksumCache(tmp_path / "checksums.json")
+    f = tmp_path / "step.py"
+    f.write_text("a = 1")
+
+    calls = []
+
+    def compute(filename):
+        calls.append(filename)
+        return files.checksum_file_nocache(filename)
+
+    checksum = cache.get(f, compute)
+    assert cache.get(f, compute) == checksum
+    assert len(calls) == 1
+
+    # modifying the file invalidates its entry
+    f.write_text("a = 2")
+    assert cache.get(f, compute) != checksum
+    assert len(calls) == 2
+
+
+def test_checksum_cache_persists(tmp_path):
+    cache_path = tmp_path / "checksums.json"
+    f = tmp_path / "step.py"
+    f.write_text("a = 1")
+    # files modified just now are not persisted, pretend it was modified a while ago
+    mtime = f.stat().st_mtime - 60
+    os.utime(f, (mtime, mtime))
+
+    files.ChecksumCache(cache_path).get(f, files.checksum_file_nocache)
+    cache = files.ChecksumCache(cache_path)
+    # nothing saved yet
+    assert cache.get(f, lambda _: "recomputed") == "recomputed"
+
+    cache = files.ChecksumCache(cache_path)
+    cache.get(f, files.checksum_file_nocache)
+    cache.save()
+    assert files.ChecksumCache(cache_path).get(f, lambda _: "recomputed") == files.checksum_file_nocache(f)
+
+    # clearing the cache removes it from disk
+    cache.clear()
+    assert not cache_path.exists()
+    assert files.ChecksumCache(cache_path).get(f, lambda _: "recomputed") == "recomputed"
+
+
+def test_checksum_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(files, "CHECKSUM_CACHE", files.ChecksumCache(tmp_path / "cache.json"))
+    paths = []
+    for i in range(3):
+        paths.append(tmp_path / f"file{i}.txt")
+        paths[-1].write_text(f"content {i}")
+
+    checksums = files.checksum_files(paths, workers=2)
+    assert checksums == {p.as_posix(): files.checksum_file_nocache(p) for p in paths}
+
+    # checksums are cached and reused by checksum_file
+    monkeypatch.setattr(files, "_checksum_file_contents", None)
+    assert files.checksum_file(paths[0]) == checksums[paths[0].as_posix()]
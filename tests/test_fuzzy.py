@@ -0,0 +1,32 @@
+import numpy as np
+from rapidfuzz import fuzz, process, utils
+
+from etl.fuzzy import FuzzyIndex, top_k
+
+
+def test_top_k():
+    scores = np.array([[1.0, 3.0, 2.0, 3.0, 0.0], [2.0, 2.0, 2.0, 5.0, 2.0]])
+
+    positions, top_scores = top_k(scores, 3)
+    assert positions.tolist() == [[1, 3, 2], [3, 0, 1]]
+    assert top_scores.tolist() == [[3.0, 3.0, 2.0], [5.0, 2.0, 2.0]]
+
+    # all scores are sorted if k is larger than the number of columns
+    positions, _ = top_k(scores, 10)
+    assert positions.tolist() == [[1, 3, 2, 0, 4], [3, 0, 1, 2, 4]]
+
+    positions, top_scores = top_k(scores, 0)
+    assert positions.shape == top_scores.shape == (2, 0)
+
+
+def test_fuzzy_index_top_k_is_like_rapidfuzz():
+    choices = ["United States", "United Kingdom", "united states of america", "Kingdom of Spain", "Spain", "USA"]
+    queries = ["united states", "Spain ", "UK", "kingdom"]
+    index = FuzzyIndex(choices, scorer=fuzz.WRatio, processor=utils.default_process)
+
+    positions, scores = top_k(index.scores(queries), 4)
+
+    for query, query_positions, query_scores in zip(queries, positions, scores):
+        expected = process.extract(query, choices, scorer=fuzz.WRatio, processor=utils.default_process, limit=4)
+        assert [index.choices[i] for i in query_positions] == [choice for choice, _, _ in expected]
+        assert query_scores.tolist() == [score for _, score, _ in expected]
@@ -73,6 +73,37 @@ def test_yield_wide_table_with_dimensions():
     assert t[t.columns[0]].metadata.title == "Deaths"
 
 
+def test_yield_wide_table_with_unsorted_dimensions():
+    df = pd.DataFrame(
+        {
+            "year": [2020, 2019, 2019, 2021, 2020, 2019],
+            "entityId": [1, 2, 1, 1, 2, 1],
+            "sex": ["male", "female", np.nan, "male", "female", "male"],
+            "age": pd.Categorical(["old", "young", "old", "old", "old", "young"], categories=["young", "old"]),
+            "deaths": [1.0, 2.0, 3.0, np.nan, 5.0, 6.0],
+        }
+    )
+    table = Table(df.set_index(["entityId", "year", "sex", "age"]))
+    table.deaths.metadata.unit = "people"
+    table.deaths.metadata.title = "Deaths"
+    index = table.index.copy()
+
+    grapher_tables = list(gh._yield_wide_table(table, na_action="drop"))
+
+    # Groups are sorted by dimensions (categories in their order, missing values last), rows keep their order
+    assert [(t.columns[0], t.reset_index().values.tolist()) for t in grapher_tables] == [
+        ("deaths__sex_female__age_young", [[2, 2019, 2.0]]),
+        ("deaths__sex_female__age_old", [[2, 2020, 5.0]]),
+        ("deaths__sex_male__age_young", [[1, 2019, 6.0]]),
+        ("deaths__sex_male__age_old", [[1, 2020, 1.0]]),
+        ("deaths__age_old", [[1, 2019, 3.0]]),
+    ]
+    assert grapher_tables[0]["deaths__sex_female__age_young"].metadata.dimensions == {"sex": "female", "age": "young"}
+    # Input table is not modified
+    assert table.index.equals(index)
+    assert table.deaths.metadata.dimensions is None
+
+
 def test_long_to_wide_tables():
     deaths_meta = VariableMeta(title="Deaths", unit="people")
     births_meta = VariableMeta(title="Births", unit="people")
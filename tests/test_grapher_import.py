@@ -1,5 +1,7 @@
+from unittest.mock import MagicMock, patch
+
 import pandas as pd
-from owid.catalog import Origin, VariableMeta, VariablePresentationMeta
+from owid.catalog import Origin, Table, VariableMeta, VariablePresentationMeta
 
 import etl.grapher.to_db as db
 
@@ -104,3 +106,28 @@ def test_get_timespan_subyearly_is_empty():
     df = pd.DataFrame({"year": [0, 28, 59]})
     for interval in ("day", "week", "month", "quarter"):
         assert db._get_timespan(df, VariableMeta(display={"timeInterval": interval})) == ""
+
+
+def test_upsert_table_keeps_data_only_if_metadata_changed():
+    table = Table(_get_data().astype({"value": int}).set_index(["entityId", "year"]))
+    table["value"].metadata = _get_metadata()
+    dataset_upsert_result = db.DatasetUpsertResult(dataset_id=1, metadata_fields=_get_dataset_metadata())
+
+    def upsert(checksums):
+        return db.upsert_table(
+            MagicMock(), MagicMock(), table, dataset_upsert_result, "grapher/ns/2024/ds/tb#value", checksums, []
+        )
+
+    with (
+        patch.object(db, "Session"),
+        patch.object(db, "upsert_metadata", return_value=MagicMock(id=7)),
+        patch.object(db, "upload_data"),
+    ):
+        result = upsert({})
+        assert result is not None and result.metadata_changed
+        assert result.df is not None
+
+        # Only data changed, so the data isn't needed for uploading metadata
+        result = upsert({"id": 7, "dataChecksum": "stale", "metadataChecksum": result.checksum_metadata})
+        assert result is not None and not result.metadata_changed
+        assert result.df is None
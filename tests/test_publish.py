@@ -0,0 +1,20 @@
+from owid.catalog import Dataset, DatasetMeta, Table
+
+from etl import publish
+
+
+def test_dataset_checksum(tmp_path):
+    ds = Dataset.create_empty(tmp_path / "garden/ns/2024-01-01/ds", DatasetMeta(short_name="ds"))
+    tb = Table({"country": ["France", "Spain"], "value": [1, 2]}, short_name="tb").set_index("country")
+    ds.add(tb)
+
+    assert publish.dataset_checksum(ds) == ds.checksum()
+
+
+def test_s3_listing_with_prefix():
+    keys = ["garden/a/1/ds/a.feather", "garden/a/1/ds/index.json", "garden/a/1/ds2/a.feather", "meadow/a/1/ds/x"]
+    listing = publish.S3Listing({"Key": k} for k in reversed(keys))
+
+    assert [o["Key"] for o in listing.with_prefix("garden/a/1/ds/")] == keys[:2]
+    assert [o["Key"] for o in listing.with_prefix("garden/")] == keys[:3]
+    assert listing.with_prefix("grapher/") == []
@@ -1,14 +1,25 @@
+import hashlib
+import tarfile
 import tempfile
 import zipfile
+from contextlib import ExitStack
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, PropertyMock, patch
 
 import pytest
 from owid.catalog import Origin, s3_utils
 
-from etl import config, paths
-from etl.files import checksum_file, ruamel_load
-from etl.snapshot import Snapshot, SnapshotArchive, SnapshotMeta, _parse_snapshot_path
+from etl import config, download_helpers, paths
+from etl.files import CHECKSUM_CACHE, checksum_file, ruamel_load
+from etl.snapshot import (
+    Snapshot,
+    SnapshotArchive,
+    SnapshotArchiveLazy,
+    SnapshotMeta,
+    _evict_extracted_archives,
+    _parse_snapshot_path,
+    pull_snapshots,
+)
 
 
 @pytest.fixture
@@ -43,15 +54,18 @@ def mock_snapshot():
     return snapshot
 
 
-@pytest.fixture
-def extracted_archive(test_archive_path, mock_snapshot):
-    """Create a SnapshotArchive from the test archive."""
-    with tempfile.TemporaryDirectory() as extract_dir:
+@pytest.fixture(params=["extracted", "lazy"])
+def extracted_archive(request, test_archive_path, mock_snapshot):
+    """Create a SnapshotArchive from the test archive, both extracted and read lazily."""
+    with tempfile.TemporaryDirectory() as extract_dir, ExitStack() as stack:
         import zipfile
 
         with zipfile.ZipFile(test_archive_path, "r") as zf:
             zf.extractall(extract_dir)
-        yield SnapshotArchive(mock_snapshot, Path(extract_dir))
+        if request.param == "lazy":
+            yield SnapshotArchiveLazy(mock_snapshot, test_archive_path, extract=lambda: Path(extract_dir), stack=stack)
+        else:
+            yield SnapshotArchive(mock_snapshot, Path(extract_dir))
 
 
 class TestSnapshotArchive:
@@ -136,6 +150,75 @@ class TestSnapshotArchive:
         assert "root_file.csv" in error_message
 
 
+def _snapshot_of_archive() -> Snapshot:
+    snap = Snapshot.__new__(Snapshot)
+    snap.uri = "test/2024-01-01/test_archive.zip"
+    snap.metadata = MagicMock()
+    snap.metadata.origin = None
+    return snap
+
+
+def test_extracted_reuses_extracted_archive(test_archive_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(paths, "SNAPSHOTS_EXTRACTED_DIR", tmp_path / "extracted")
+    monkeypatch.setattr(config, "SNAPSHOT_EXTRACTED_CACHE_GB", 1)
+    snap = _snapshot_of_archive()
+
+    with patch.object(Snapshot, "path", new_callable=PropertyMock, return_value=test_archive_path):
+        with snap.extracted() as archive:
+            path = archive.path
+            assert "data/2020.csv" in archive.files
+
+        # the same folder is reused, without extracting the archive again
+        with patch("etl.snapshot.decompress_file") as decompress:
+            with snap.extracted() as archive:
+                assert archive.path == path
+                assert archive.read("data/2020.csv", safe_types=False)["value"].tolist() == [100]
+            decompress.assert_not_called()
+
+        # archives over the size limit are deleted when another archive is extracted
+        monkeypatch.setattr(config, "SNAPSHOT_EXTRACTED_CACHE_GB", 500 / 2**30)
+        (tmp_path / "extracted" / f"{'0' * 32}.size").write_text("1000")
+        (tmp_path / "extracted" / ("0" * 32)).mkdir()
+        with snap.extracted() as archive:
+            pass
+        assert not (tmp_path / "extracted" / ("0" * 32)).exists()
+        assert path.exists()
+
+
+def test_extracted_archive_in_use_is_not_evicted(test_archive_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(paths, "SNAPSHOTS_EXTRACTED_DIR", tmp_path / "extracted")
+    monkeypatch.setattr(config, "SNAPSHOT_EXTRACTED_CACHE_GB", 1)
+    snap = _snapshot_of_archive()
+
+    with patch.object(Snapshot, "path", new_callable=PropertyMock, return_value=test_archive_path):
+        with snap.extracted() as archive:
+            # eviction (e.g. by another worker) skips archives that are being read
+            monkeypatch.setattr(config, "SNAPSHOT_EXTRACTED_CACHE_GB", 1e-12)
+            _evict_extracted_archives()
+            assert archive.read("data/2020.csv", safe_types=False)["value"].tolist() == [100]
+
+        _evict_extracted_archives()
+        assert not archive.path.exists()
+
+
+def test_extracted_lazy_tar(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SNAPSHOT_EXTRACTED_CACHE_GB", 0.0)
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "2020.csv").write_text("year,value\n2020,100")
+    archive_path = tmp_path / "test_archive.tar.gz"
+    with tarfile.open(archive_path, "w:gz") as tar:
+        tar.add(tmp_path / "data", arcname="./data")
+    snap = _snapshot_of_archive()
+
+    with patch.object(Snapshot, "path", new_callable=PropertyMock, return_value=archive_path):
+        with patch("etl.snapshot.decompress_file") as decompress:
+            with snap.extracted(lazy=True) as archive:
+                assert archive.files == ["data/2020.csv"]
+                assert archive.glob("**/*.csv") == ["data/2020.csv"]
+                assert archive.read("data/2020.csv", safe_types=False)["value"].tolist() == [100]
+            decompress.assert_not_called()
+
+
 def test_parse_snapshot_path():
     path = Path("etl/snapshots/aviation_safety_network/2023-04-18/aviation_statistics_by_period.csv.dvc")
     assert _parse_snapshot_path(path) == (
@@ -306,3 +389,36 @@ def test_snapshot_to_yaml():
         "version": "2023-04-18",
         "origin": {"title": "Aviation Statistics by Period", "producer": "Producer"},
     }
+
+
+def test_pull_snapshots_downloads_only_dirty_snapshots(tmp_path, monkeypatch):
+    monkeypatch.setattr(paths, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(CHECKSUM_CACHE, "save", lambda: None)
+    contents = {f"test/2024-01-01/snap_{i}.csv": f"a,b\n{i},{i}\n".encode() for i in range(3)}
+
+    snapshots = []
+    for uri, data in contents.items():
+        snap = Snapshot.__new__(Snapshot)
+        snap.uri = uri
+        snap.metadata = MagicMock(is_public=True, outs=[{"md5": hashlib.md5(data).hexdigest(), "size": len(data)}])
+        snapshots.append(snap)
+    # the first snapshot is up to date
+    snapshots[0].path.parent.mkdir(parents=True)
+    snapshots[0].path.write_bytes(contents[snapshots[0].uri])
+
+    def download_resumable(url, filename, **kwargs):
+        data = next(data for uri, data in contents.items() if filename.endswith(uri))
+        Path(filename).write_bytes(data)
+        return hashlib.md5(data).hexdigest()
+
+    with patch.object(download_helpers, "download_resumable", side_effect=download_resumable) as download:
+        pulled = pull_snapshots(snapshots, workers=2)
+
+    assert pulled == snapshots[1:]
+    assert download.call_count == 2
+    for snap in snapshots:
+        assert snap.path.read_bytes() == contents[snap.uri]
+    # checksums computed during the download are reused
+    with patch("etl.files._checksum_file_contents") as compute:
+        assert CHECKSUM_CACHE.get(snapshots[1].path, compute) == snapshots[1].metadata.outs[0]["md5"]
+        compute.assert_not_called()